@@ -10,6 +10,7 @@ from app.chain.storage import StorageChain
 from app.core.security import verify_token, verify_apitoken
 from app.db import get_db
 from app.db.models.transferhistory import TransferHistory
+from app.helper.dashboard import DashboardHelper
 from app.helper.directory import DirectoryHelper
 from app.scheduler import Scheduler
 from app.utils.system import SystemUtils
@@ -22,18 +23,19 @@ def statistic(name: Optional[str] = None, _: schemas.TokenPayload = Depends(veri
     """
     查询媒体数量统计信息
     """
-    media_statistics: Optional[List[schemas.Statistic]] = DashboardChain().media_statistic(name)
-    if media_statistics:
+
+    def __load() -> schemas.Statistic:
+        media_statistics: Optional[List[schemas.Statistic]] = DashboardChain().media_statistic(name)
         # 汇总各媒体库统计信息
         ret_statistic = schemas.Statistic()
-        for media_statistic in media_statistics:
+        for media_statistic in media_statistics or []:
             ret_statistic.movie_count += media_statistic.movie_count
             ret_statistic.tv_count += media_statistic.tv_count
             ret_statistic.episode_count += media_statistic.episode_count
             ret_statistic.user_count += media_statistic.user_count
         return ret_statistic
-    else:
-        return schemas.Statistic()
+
+    return DashboardHelper().get(f"statistic:{name or ''}", __load)
 
 
 @router.get("/statistic2", summary="媒体数量统计（API_TOKEN）", response_model=schemas.Statistic)
@@ -49,20 +51,24 @@ def storage(_: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     查询本地存储空间信息
     """
-    total, available = 0, 0
-    dirs = DirectoryHelper().get_dirs()
-    if not dirs:
-        return schemas.Storage(total_storage=total, used_storage=total - available)
-    storages = set([d.library_storage for d in dirs if d.library_storage])
-    for _storage in storages:
-        _usage = StorageChain().storage_usage(_storage)
-        if _usage:
-            total += _usage.total
-            available += _usage.available
-    return schemas.Storage(
-        total_storage=total,
-        used_storage=total - available
-    )
+
+    def __load() -> schemas.Storage:
+        total, available = 0, 0
+        dirs = DirectoryHelper().get_dirs()
+        if not dirs:
+            return schemas.Storage(total_storage=total, used_storage=total - available)
+        storages = set([d.library_storage for d in dirs if d.library_storage])
+        for _storage in storages:
+            _usage = StorageChain().storage_usage(_storage)
+            if _usage:
+                total += _usage.total
+                available += _usage.available
+        return schemas.Storage(
+            total_storage=total,
+            used_storage=total - available
+        )
+
+    return DashboardHelper().get("storage", __load)
 
 
 @router.get("/storage2", summary="本地存储空间（API_TOKEN）", response_model=schemas.Storage)
@@ -86,20 +92,24 @@ def downloader(name: Optional[str] = None, _: schemas.TokenPayload = Depends(ver
     """
     查询下载器信息
     """
-    # 下载目录空间
-    download_dirs = DirectoryHelper().get_local_download_dirs()
-    _, free_space = SystemUtils.space_usage([Path(d.download_path) for d in download_dirs])
-    # 下载器信息
-    downloader_info = schemas.DownloaderInfo()
-    transfer_infos = DashboardChain().downloader_info(name)
-    if transfer_infos:
-        for transfer_info in transfer_infos:
-            downloader_info.download_speed += transfer_info.download_speed
-            downloader_info.upload_speed += transfer_info.upload_speed
-            downloader_info.download_size += transfer_info.download_size
-            downloader_info.upload_size += transfer_info.upload_size
-        downloader_info.free_space = free_space
-    return downloader_info
+
+    def __load() -> schemas.DownloaderInfo:
+        # 下载目录空间
+        download_dirs = DirectoryHelper().get_local_download_dirs()
+        _, free_space = SystemUtils.space_usage([Path(d.download_path) for d in download_dirs])
+        # 下载器信息
+        downloader_info = schemas.DownloaderInfo()
+        transfer_infos = DashboardChain().downloader_info(name)
+        if transfer_infos:
+            for transfer_info in transfer_infos:
+                downloader_info.download_speed += transfer_info.download_speed
+                downloader_info.upload_speed += transfer_info.upload_speed
+                downloader_info.download_size += transfer_info.download_size
+                downloader_info.upload_size += transfer_info.upload_size
+            downloader_info.free_space = free_space
+        return downloader_info
+
+    return DashboardHelper().get(f"downloader:{name or ''}", __load)
 
 
 @router.get("/downloader2", summary="下载器信息（API_TOKEN）", response_model=schemas.DownloaderInfo)
@@ -132,8 +142,7 @@ def transfer(days: Optional[int] = 7, db: Session = Depends(get_db),
     """
     查询文件整理统计信息
     """
-    transfer_stat = TransferHistory.statistic(db, days)
-    return [stat[1] for stat in transfer_stat]
+    return DashboardHelper().transfer_statistic(days, lambda d: TransferHistory.statistic(db, d))
 
 
 @router.get("/cpu", summary="获取当前CPU使用率", response_model=int)
@@ -12,6 +12,8 @@ from app.db.models import User
 from app.db.models.downloadhistory import DownloadHistory
 from app.db.models.transferhistory import TransferHistory
 from app.db.user_oper import get_current_active_superuser
+from app.helper.dashboard import DashboardHelper
+from app.helper.library import LibraryHelper
 from app.schemas.types import EventType, MediaType
 
 router = APIRouter()
@@ -44,10 +46,11 @@ def transfer_history(title: Optional[str] = None,
                      page: Optional[int] = 1,
                      count: Optional[int] = 30,
                      status: Optional[bool] = None,
+                     last_id: Optional[int] = None,
                      db: Session = Depends(get_db),
                      _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
-    查询整理记录
+    查询整理记录，传入上一页最后一条记录的last_id时按游标分页
     """
     if title == "失败":
         title = None
@@ -59,9 +62,9 @@ def transfer_history(title: Optional[str] = None,
     if title:
         total = TransferHistory.count_by_title(db, title=title, status=status)
         result = TransferHistory.list_by_title(db, title=title, page=page,
-                                               count=count, status=status)
+                                               count=count, status=status, last_id=last_id)
     else:
-        result = TransferHistory.list_by_page(db, page=page, count=count, status=status)
+        result = TransferHistory.list_by_page(db, page=page, count=count, status=status, last_id=last_id)
         total = TransferHistory.count(db, status=status)
 
     return schemas.Response(success=True,
@@ -87,6 +90,8 @@ def delete_transfer_history(history_in: schemas.TransferHistory,
     if deletedest and history.dest_fileitem:
         dest_fileitem = schemas.FileItem(**history.dest_fileitem)
         StorageChain().delete_media_file(fileitem=dest_fileitem, mtype=MediaType(history.type))
+        # 媒体库文件已删除，移除媒体库存在索引中的记录
+        LibraryHelper().invalidate(mtype=MediaType(history.type), tmdbid=history.tmdbid)
 
     # 删除源文件
     if deletesrc and history.src_fileitem:
@@ -104,6 +109,7 @@ def delete_transfer_history(history_in: schemas.TransferHistory,
         )
     # 删除记录
     TransferHistory.delete(db, history_in.id)
+    DashboardHelper().reset_transfer()
     return schemas.Response(success=True)
 
 
@@ -114,4 +120,5 @@ def delete_transfer_history(db: Session = Depends(get_db),
     清空整理记录
     """
     TransferHistory.truncate(db)
+    DashboardHelper().reset_transfer()
     return schemas.Response(success=True)
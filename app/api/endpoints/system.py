@@ -38,6 +38,7 @@ from app.schemas import ConfigChangeEventData
 from app.schemas.types import SystemConfigKey, EventType
 from app.utils.crypto import HashUtils
 from app.utils.http import RequestUtils
+from app.utils.limit import DomainRateLimitRegistry
 from app.utils.security import SecurityUtils
 from app.utils.url import UrlUtils
 from version import APP_VERSION
@@ -252,22 +253,37 @@ def set_env_setting(env: dict,
 
 
 @router.get("/progress/{process_type}", summary="实时进度")
-async def get_progress(request: Request, process_type: str, _: schemas.TokenPayload = Depends(verify_resource_token)):
+async def get_progress(request: Request, process_type: str, delta: bool = False,
+                       _: schemas.TokenPayload = Depends(verify_resource_token)):
     """
-    实时获取处理进度，返回格式为SSE
+    实时获取处理进度，返回格式为SSE，仅在进度变化时推送
+    :param delta: 是否只推送变化的字段，首次推送始终为完整数据
     """
     progress = ProgressHelper()
 
     async def event_generator():
+        subscriber = progress.subscribe(process_type)
+        last = None
+        sent = False
         try:
             while not global_vars.is_system_stopped:
                 if await request.is_disconnected():
                     break
                 detail = progress.get(process_type)
-                yield f"data: {json.dumps(detail)}\n\n"
-                await asyncio.sleep(0.2)
+                if not sent or detail != last:
+                    data = ProgressHelper.delta(last, detail) if delta and sent and detail else detail
+                    yield f"data: {json.dumps(data)}\n\n"
+                    last = dict(detail) if detail else None
+                    sent = True
+                    # 限制推送频率，期间的多次变化合并为一次推送
+                    await asyncio.sleep(progress.min_interval)
+                if not await subscriber.wait(timeout=10):
+                    # 心跳
+                    yield ": ping\n\n"
         except asyncio.CancelledError:
             return
+        finally:
+            progress.unsubscribe(subscriber)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -521,6 +537,22 @@ def moduletest(moduleid: str, _: schemas.TokenPayload = Depends(verify_token)):
     return schemas.Response(success=state, message=errmsg)
 
 
+@router.get("/ratelimit", summary="查询各域名请求限流状态", response_model=schemas.Response)
+def ratelimit(_: schemas.TokenPayload = Depends(verify_token)):
+    """
+    查询各域名请求限流状态，包括排队中的请求数及限流计数
+    """
+    return schemas.Response(success=True, data=DomainRateLimitRegistry().stats())
+
+
+@router.get("/eventstats", summary="查询事件队列统计", response_model=schemas.Response)
+def eventstats(_: schemas.TokenPayload = Depends(verify_token)):
+    """
+    查询各广播事件类型的队列深度、排队延迟及处理耗时
+    """
+    return schemas.Response(success=True, data=eventmanager.get_statistics())
+
+
 @router.get("/restart", summary="重启系统", response_model=schemas.Response)
 def restart_system(_: User = Depends(get_current_active_superuser)):
     """
@@ -13,6 +13,7 @@ from app.core.security import verify_token, verify_apitoken
 from app.db import get_db
 from app.db.models.transferhistory import TransferHistory
 from app.db.user_oper import get_current_active_superuser
+from app.helper.library import LibraryHelper
 from app.schemas import MediaType, FileItem, ManualTransferItem
 
 router = APIRouter()
@@ -101,6 +102,8 @@ def manual_transfer(transer_item: ManualTransferItem,
                 state = StorageChain().delete_media_file(dest_fileitem, mtype=MediaType(history.type))
                 if not state:
                     return schemas.Response(success=False, message=f"{dest_fileitem.path} 删除失败")
+                # 媒体库文件已删除，移除媒体库存在索引中的记录
+                LibraryHelper().invalidate(mtype=MediaType(history.type), tmdbid=history.tmdbid)
 
         # 从历史数据获取信息
         if transer_item.from_history:
@@ -17,6 +17,7 @@ from app.core.module import ModuleManager
 from app.core.plugin import PluginManager
 from app.db.message_oper import MessageOper
 from app.db.user_oper import UserOper
+from app.helper.library import LibraryHelper
 from app.helper.message import MessageHelper, MessageQueueManager, MessageTemplateHelper
 from app.helper.service import ServiceConfigHelper
 from app.log import logger
@@ -526,7 +527,17 @@ class ChainBase(metaclass=ABCMeta):
         :param server:  媒体服务器
         :return: 如不存在返回None，存在时返回信息，包括每季已存在所有集{type: movie/tv, seasons: {season: [episodes]}}
         """
-        return self.run_module("media_exists", mediainfo=mediainfo, itemid=itemid, server=server)
+        if settings.MEDIA_EXISTS_INDEX:
+            # 优先从媒体库存在索引中查询
+            exists = LibraryHelper().get(mediainfo=mediainfo, server=server)
+            if exists:
+                return exists
+            if not settings.MEDIA_EXISTS_VERIFY_ON_MISS:
+                return None
+        exists = self.run_module("media_exists", mediainfo=mediainfo, itemid=itemid, server=server)
+        if settings.MEDIA_EXISTS_INDEX and exists:
+            LibraryHelper().update(mediainfo=mediainfo, exists=exists)
+        return exists
 
     def media_files(self, mediainfo: MediaInfo) -> Optional[List[FileItem]]:
         """
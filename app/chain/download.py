@@ -957,7 +957,7 @@ class DownloadChain(ChainBase):
         """
         return self.remove_torrents(hashs=[hash_str], downloader=name)
 
-    @eventmanager.register(EventType.DownloadFileDeleted)
+    @eventmanager.register(EventType.DownloadFileDeleted, readonly=True)
     def download_file_deleted(self, event: Event):
         """
         下载文件删除时，同步删除下载任务
@@ -4,6 +4,7 @@ from typing import List, Union, Optional, Generator, Any
 from app.chain import ChainBase
 from app.core.config import global_vars
 from app.db.mediaserver_oper import MediaServerOper
+from app.helper.library import LibraryHelper
 from app.helper.service import ServiceConfigHelper
 from app.log import logger
 from app.schemas import MediaServerLibrary, MediaServerItem, MediaServerSeasonInfo, MediaServerPlayItem
@@ -175,3 +176,5 @@ class MediaServerChain(ChainBase):
                     # 总数累加
                     total_count += library_count
                 logger.info(f"媒体服务器 {server_name} 数据同步完成，总同步数量：{total_count}")
+            # 重建媒体库存在索引
+            LibraryHelper().rebuild()
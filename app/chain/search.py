@@ -1,3 +1,4 @@
+import copy
 import pickle
 import traceback
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -104,7 +105,8 @@ class SearchChain(ChainBase):
                 rule_groups: List[str] = None,
                 area: Optional[str] = "title",
                 custom_words: List[str] = None,
-                filter_params: Dict[str, str] = None) -> List[Context]:
+                filter_params: Dict[str, str] = None,
+                search_cache: Optional[dict] = None) -> List[Context]:
         """
         根据媒体信息搜索种子资源，精确匹配，应用过滤规则，同时根据no_exists过滤本地已存在的资源
         :param mediainfo: 媒体信息
@@ -115,6 +117,7 @@ class SearchChain(ChainBase):
         :param area: 搜索范围，title or imdbid
         :param custom_words: 自定义识别词列表
         :param filter_params: 过滤参数
+        :param search_cache: 站点搜索结果缓存，多次搜索传入同一字典时，相同关键词和站点范围的搜索只请求一次站点
         """
 
         def __do_filter(torrent_list: List[TorrentInfo]) -> List[TorrentInfo]:
@@ -166,12 +169,22 @@ class SearchChain(ChainBase):
                                                        mediainfo.sg_title] if k]))
 
         # 执行搜索
-        torrents: List[TorrentInfo] = self.__search_all_sites(
-            mediainfo=mediainfo,
-            keywords=keywords,
-            sites=sites,
-            area=area
-        )
+        cache_key = (tuple(keywords), area, mediainfo.type,
+                     mediainfo.imdb_id if area == "imdbid" else None,
+                     tuple(sorted(sites)) if sites else None)
+        if search_cache is not None and cache_key in search_cache:
+            logger.info(f'{keyword or mediainfo.title} 使用本轮已有的站点搜索结果')
+            # 过滤时会修改资源属性，使用副本
+            torrents: List[TorrentInfo] = [copy.copy(torrent) for torrent in search_cache[cache_key]]
+        else:
+            torrents: List[TorrentInfo] = self.__search_all_sites(
+                mediainfo=mediainfo,
+                keywords=keywords,
+                sites=sites,
+                area=area
+            )
+            if search_cache is not None:
+                search_cache[cache_key] = [copy.copy(torrent) for torrent in torrents or []]
         if not torrents:
             logger.warn(f'{keyword or mediainfo.title} 未搜索到资源')
             return []
@@ -190,7 +203,7 @@ class SearchChain(ChainBase):
         # 开始过滤规则过滤
         if rule_groups is None:
             # 取搜索过滤规则
-            rule_groups: List[str] = SystemConfigOper().get(SystemConfigKey.SearchFilterRuleGroups)
+            rule_groups: List[str] = SystemConfigOper().get_snapshot(SystemConfigKey.SearchFilterRuleGroups)
         if rule_groups:
             logger.info(f'开始过滤规则/剧集过滤，使用规则组：{rule_groups} ...')
             torrents = __do_filter(torrents)
@@ -302,7 +315,7 @@ class SearchChain(ChainBase):
 
         # 配置的索引站点
         if not sites:
-            sites = SystemConfigOper().get(SystemConfigKey.IndexerSites) or []
+            sites = SystemConfigOper().get_snapshot(SystemConfigKey.IndexerSites) or []
 
         for indexer in SitesHelper().get_indexers():
             # 检查站点索引开关
@@ -367,7 +380,7 @@ class SearchChain(ChainBase):
         # 返回
         return results
 
-    @eventmanager.register(EventType.SiteDeleted)
+    @eventmanager.register(EventType.SiteDeleted, readonly=True)
     def remove_site(self, event: Event):
         """
         从搜索站点中移除与已删除站点相关的设置
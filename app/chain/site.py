@@ -1,5 +1,7 @@
 import base64
+import math
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime
 from typing import Optional, Tuple, Union, Dict
 from urllib.parse import urljoin
@@ -31,6 +33,11 @@ class SiteChain(ChainBase):
     站点管理处理链
     """
 
+    # 并发刷新站点数据的最大线程数
+    _refresh_workers = 8
+    # 单个站点刷新数据的时限（秒）
+    _refresh_timeout = 300
+
     def __init__(self):
         super().__init__()
 
@@ -46,13 +53,14 @@ class SiteChain(ChainBase):
             "hddolby.com": self.__hddolby_test,
         }
 
-    def refresh_userdata(self, site: dict = None) -> Optional[SiteUserData]:
+    def refresh_userdata(self, site: dict = None, timeout: Optional[int] = None) -> Optional[SiteUserData]:
         """
         刷新站点的用户数据
         :param site:  站点
+        :param timeout:  站点刷新时限（秒）
         :return: 用户数据
         """
-        userdata: SiteUserData = self.run_module("refresh_userdata", site=site)
+        userdata: SiteUserData = self.run_module("refresh_userdata", site=site, timeout=timeout)
         if userdata:
             SiteOper().update_userdata(domain=StringUtils.get_url_domain(site.get("domain")),
                                        name=site.get("name"),
@@ -92,17 +100,42 @@ class SiteChain(ChainBase):
         """
         刷新所有站点的用户数据
         """
-        sites = SitesHelper().get_indexers()
+        sites = [site for site in SitesHelper().get_indexers() if site.get("is_active")]
+        if not sites:
+            return {}
         any_site_updated = False
         result = {}
-        for site in sites:
-            if global_vars.is_system_stopped:
-                return None
-            if site.get("is_active"):
-                userdata = self.refresh_userdata(site)
+        # 多站点并发刷新，每个站点有独立时限，刷新完成的站点数据即时入库
+        workers = min(len(sites), self._refresh_workers)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {}
+        try:
+            futures = {
+                executor.submit(self.refresh_userdata, site, self._refresh_timeout): site
+                for site in sites
+            }
+            # 总时限按分批刷新所需的时间计算，站点未按时限返回时不再无限等待
+            total_timeout = self._refresh_timeout * math.ceil(len(sites) / workers)
+            for future in as_completed(futures, timeout=total_timeout):
+                if global_vars.is_system_stopped:
+                    return None
+                site = futures[future]
+                try:
+                    userdata = future.result()
+                except Exception as err:
+                    logger.error(f"站点 {site.get('name')} 刷新数据出错：{str(err)}")
+                    continue
                 if userdata:
                     any_site_updated = True
                     result[site.get("name")] = userdata
+        except FuturesTimeoutError:
+            names = [site.get("name") for future, site in futures.items() if not future.done()]
+            logger.warn(f"刷新站点数据超时，未完成的站点：{'、'.join(names)}")
+        finally:
+            # 取消未开始的刷新，正在进行的刷新无法中断，完成后自行结束
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
         if any_site_updated:
             EventManager().send_event(EventType.SiteRefreshed, {
                 "site_id": "*"
@@ -422,7 +455,7 @@ class SiteChain(ChainBase):
         logger.info(f"CookieCloud同步成功：{ret_msg}")
         return True, ret_msg
 
-    @eventmanager.register(EventType.SiteUpdated)
+    @eventmanager.register(EventType.SiteUpdated, readonly=True)
     def cache_site_icon(self, event: Event):
         """
         缓存站点图标
@@ -466,7 +499,7 @@ class SiteChain(ChainBase):
             else:
                 logger.warn(f"缓存站点 {indexer.get('name')} 图标失败")
 
-    @eventmanager.register(EventType.SiteUpdated)
+    @eventmanager.register(EventType.SiteUpdated, readonly=True)
     def clear_site_data(self, event: Event):
         """
         清理站点数据
@@ -488,7 +521,7 @@ class SiteChain(ChainBase):
                 logger.info(f"清理站点配置：{key}")
                 systemconfig.delete(key)
 
-    @eventmanager.register(EventType.SiteUpdated)
+    @eventmanager.register(EventType.SiteUpdated, readonly=True)
     def cache_site_userdata(self, event: Event):
         """
         缓存站点用户数据
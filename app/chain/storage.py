@@ -110,11 +110,12 @@ class StorageChain(ChainBase):
         """
         return self.run_module("get_parent_item", fileitem=fileitem)
 
-    def snapshot_storage(self, storage: str, path: Path) -> Optional[Dict[str, float]]:
+    def snapshot_storage(self, storage: str, path: Path,
+                         last_snapshot: Optional[Dict[str, dict]] = None) -> Optional[Dict[str, dict]]:
         """
         快照存储
         """
-        return self.run_module("snapshot_storage", storage=storage, path=path)
+        return self.run_module("snapshot_storage", storage=storage, path=path, last_snapshot=last_snapshot)
 
     def storage_usage(self, storage: str) -> Optional[schemas.StorageUsage]:
         """
@@ -24,6 +24,7 @@ from app.db.models.subscribe import Subscribe
 from app.db.site_oper import SiteOper
 from app.db.subscribe_oper import SubscribeOper
 from app.db.systemconfig_oper import SystemConfigOper
+from app.helper.sites import SitesHelper
 from app.helper.subscribe import SubscribeHelper
 from app.helper.torrent import TorrentHelper
 from app.log import logger
@@ -38,6 +39,10 @@ class SubscribeChain(ChainBase):
     """
 
     _rlock = threading.RLock()
+    # 各站点上次订阅搜索请求时间，跨轮次共用
+    _site_last_used: Dict[int, float] = {}
+    # 订阅上次成功搜索时间缓存文件
+    _search_time_cache_file = "__subscribe_search_time__"
 
     def add(self, title: str, year: str,
             mtype: MediaType = None,
@@ -286,6 +291,19 @@ class SubscribeChain(ChainBase):
                 subscribes = [subscribe] if subscribe else []
             else:
                 subscribes = subscribeoper.list(self.get_states_for_search(state))
+            # 定时搜索订阅时按站点请求预算排程
+            planned = not sid and state in ['R', 'P']
+            # 上次成功搜索时间
+            search_times: Dict[int, float] = self.load_cache(self._search_time_cache_file) or {}
+            if planned:
+                subscribes = self.__sort_by_priority(subscribes, search_times)
+            # 本轮的识别结果、站点搜索结果以及各站点请求情况
+            media_cache: Dict[tuple, MediaInfo] = {}
+            search_cache = {}
+            searched_sites: Dict[tuple, List[int]] = {}
+            site_counts: Dict[int, int] = {}
+            # 本轮搜索到资源的订阅
+            found_times: Dict[int, float] = {}
             # 遍历订阅
             for subscribe in subscribes:
                 if global_vars.is_system_stopped:
@@ -299,11 +317,6 @@ class SubscribeChain(ChainBase):
                     if (now - subscribe_time).total_seconds() < 60:
                         logger.debug(f"订阅标题：{subscribe.name} 新增小于1分钟，暂不搜索...")
                         continue
-                # 随机休眠1-5分钟
-                if not sid and state in ['R', 'P']:
-                    sleep_time = random.randint(60, 300)
-                    logger.info(f'订阅搜索随机休眠 {sleep_time} 秒 ...')
-                    time.sleep(sleep_time)
                 try:
                     logger.info(f'开始搜索订阅，标题：{subscribe.name} ...')
                     # 生成元数据
@@ -315,12 +328,15 @@ class SubscribeChain(ChainBase):
                     except ValueError:
                         logger.error(f'订阅 {subscribe.name} 类型错误：{subscribe.type}')
                         continue
-                    # 识别媒体信息
-                    mediainfo: MediaInfo = self.recognize_media(meta=meta, mtype=meta.type,
-                                                                tmdbid=subscribe.tmdbid,
-                                                                doubanid=subscribe.doubanid,
-                                                                episode_group=subscribe.episode_group,
-                                                                cache=False)
+                    # 识别媒体信息，本轮内相同媒体只识别一次
+                    media_key = (subscribe.type, subscribe.tmdbid, subscribe.doubanid, subscribe.episode_group)
+                    if media_key not in media_cache:
+                        media_cache[media_key] = self.recognize_media(meta=meta, mtype=meta.type,
+                                                                      tmdbid=subscribe.tmdbid,
+                                                                      doubanid=subscribe.doubanid,
+                                                                      episode_group=subscribe.episode_group,
+                                                                      cache=False)
+                    mediainfo: MediaInfo = copy.deepcopy(media_cache[media_key])
                     if not mediainfo:
                         logger.warn(
                             f'未识别到媒体信息，标题：{subscribe.name}，tmdbid：{subscribe.tmdbid}，doubanid：{subscribe.doubanid}')
@@ -340,10 +356,24 @@ class SubscribeChain(ChainBase):
                     # 优先级过滤规则
                     if subscribe.best_version:
                         rule_groups = subscribe.filter_groups \
-                                      or SystemConfigOper().get(SystemConfigKey.BestVersionFilterRuleGroups) or []
+                                      or SystemConfigOper().get_snapshot(SystemConfigKey.BestVersionFilterRuleGroups) or []
                     else:
                         rule_groups = subscribe.filter_groups \
-                                      or SystemConfigOper().get(SystemConfigKey.SubscribeFilterRuleGroups) or []
+                                      or SystemConfigOper().get_snapshot(SystemConfigKey.SubscribeFilterRuleGroups) or []
+
+                    area = "imdbid" if subscribe.search_imdbid else "title"
+                    # 按站点请求预算控制频率，本轮已搜索过的相同关键词和站点不再请求
+                    if planned:
+                        search_key = (subscribe.keyword, media_key[:3], area, tuple(sorted(sites or [])))
+                        if search_key in searched_sites:
+                            sites = searched_sites[search_key]
+                        else:
+                            sites = self.__acquire_site_budget(sites=sites,
+                                                               site_counts=site_counts)
+                            if not sites:
+                                logger.info(f'订阅 {subscribe.name} 涉及站点本轮请求次数已用完，顺延到下一轮搜索')
+                                continue
+                            searched_sites[search_key] = sites
 
                     # 搜索，同时电视剧会过滤掉不需要的剧集
                     contexts = SearchChain().process(mediainfo=mediainfo,
@@ -351,15 +381,19 @@ class SubscribeChain(ChainBase):
                                                      no_exists=no_exists,
                                                      sites=sites,
                                                      rule_groups=rule_groups,
-                                                     area="imdbid" if subscribe.search_imdbid else "title",
+                                                     area=area,
                                                      custom_words=custom_word_list,
-                                                     filter_params=self.get_params(subscribe))
+                                                     filter_params=self.get_params(subscribe),
+                                                     search_cache=search_cache)
                     if not contexts:
                         logger.warn(f'订阅 {subscribe.keyword or subscribe.name} 未搜索到资源')
                         self.finish_subscribe_or_not(subscribe=subscribe, meta=meta,
                                                      mediainfo=mediainfo, lefts=no_exists)
                         continue
 
+                    # 只记录搜索到资源的时间，未搜索到的订阅下一轮仍优先搜索
+                    found_times[subscribe.id] = time.time()
+
                     # 过滤搜索结果
                     matched_contexts = []
                     for context in contexts:
@@ -418,6 +452,11 @@ class SubscribeChain(ChainBase):
                     if subscribe and subscribe.state == 'N':
                         subscribeoper.update(subscribe.id, {'state': 'R'})
 
+            # 保存搜索时间
+            if found_times:
+                search_times.update(found_times)
+                self.save_cache(search_times, self._search_time_cache_file)
+
             # 手动触发时发送系统消息
             if manual:
                 if subscribes:
@@ -429,6 +468,52 @@ class SubscribeChain(ChainBase):
                     self.messagehelper.put('没有找到订阅！', title="订阅搜索", role="system")
             logger.debug(f"search Lock released at {datetime.now()}")
 
+    @staticmethod
+    def __sort_by_priority(subscribes: List[Subscribe], search_times: Dict[int, float]) -> List[Subscribe]:
+        """
+        订阅搜索排序：连载中的电视剧优先，其次按距上次成功搜索的时间由长到短
+        """
+
+        def __priority(subscribe: Subscribe):
+            airing = subscribe.type == MediaType.TV.value and (subscribe.lack_episode or 0) > 0
+            return 0 if airing else 1, search_times.get(subscribe.id, 0)
+
+        return sorted(subscribes, key=__priority)
+
+    def __acquire_site_budget(self, sites: List[int], site_counts: Dict[int, int]) -> List[int]:
+        """
+        申请站点请求预算，返回本次可搜索的站点，必要时等待至满足站点请求间隔
+        各站点的请求时间跨轮次保存，下一轮开始时同样遵守请求间隔
+        :param sites: 订阅的站点范围，为空时为所有搜索站点
+        :param site_counts: 各站点本轮已请求次数
+        :return: 可搜索的站点，为空时表示本轮预算已用完
+        """
+        if not sites:
+            indexer_sites = SystemConfigOper().get_snapshot(SystemConfigKey.IndexerSites) or []
+            sites = [indexer.get("id") for indexer in SitesHelper().get_indexers()
+                     if not indexer_sites or indexer.get("id") in indexer_sites]
+        budget = settings.SUBSCRIBE_SEARCH_SITE_BUDGET
+        sites = [site for site in sites if not budget or site_counts.get(site, 0) < budget]
+        if not sites:
+            return []
+        # 等待所有站点满足最小请求间隔，附加少量随机时间避免请求过于规律
+        # 等待期间保持订阅锁，避免其它搜索或匹配在此期间下载同一资源
+        interval = settings.SUBSCRIBE_SEARCH_SITE_INTERVAL or 0
+        wait_time = max(self._site_last_used.get(site, 0) + interval - time.time() for site in sites)
+        if wait_time > 0:
+            wait_time += random.uniform(0, interval * 0.2)
+            logger.info(f'等待站点请求间隔 {round(wait_time)} 秒 ...')
+            end_time = time.time() + wait_time
+            while time.time() < end_time:
+                if global_vars.is_system_stopped:
+                    return []
+                time.sleep(min(1.0, end_time - time.time()))
+        now = time.time()
+        for site in sites:
+            self._site_last_used[site] = now
+            site_counts[site] = site_counts.get(site, 0) + 1
+        return sites
+
     def update_subscribe_priority(self, subscribe: Subscribe, meta: MetaBase,
                                   mediainfo: MediaInfo, downloads: Optional[List[Context]]):
         """
@@ -748,10 +833,10 @@ class SubscribeChain(ChainBase):
                         # 优先级过滤规则
                         if subscribe.best_version:
                             rule_groups = subscribe.filter_groups \
-                                          or systemconfig.get(SystemConfigKey.BestVersionFilterRuleGroups)
+                                          or systemconfig.get_snapshot(SystemConfigKey.BestVersionFilterRuleGroups)
                         else:
                             rule_groups = subscribe.filter_groups \
-                                          or systemconfig.get(SystemConfigKey.SubscribeFilterRuleGroups)
+                                          or systemconfig.get_snapshot(SystemConfigKey.SubscribeFilterRuleGroups)
                         result: List[TorrentInfo] = self.filter_torrents(
                             rule_groups=rule_groups,
                             torrent_list=[torrent_info],
@@ -1242,7 +1327,7 @@ class SubscribeChain(ChainBase):
         logger.info(f'订阅 {subscribe_name} 缺失剧集数更新为：{no_exists}')
         return False, no_exists
 
-    @eventmanager.register(EventType.SiteDeleted)
+    @eventmanager.register(EventType.SiteDeleted, readonly=True)
     def remove_site(self, event: Event):
         """
         从订阅中移除与站点相关的设置
@@ -1,10 +1,9 @@
 import base64
+import hashlib
 import pickle
 import threading
 from collections import defaultdict, deque
-from concurrent.futures import ThreadPoolExecutor
-from time import sleep
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Set, Dict
 
 from pydantic.fields import Callable
 
@@ -13,6 +12,7 @@ from app.core.config import global_vars
 from app.core.workflow import WorkFlowManager
 from app.db.models import Workflow
 from app.db.workflow_oper import WorkflowOper
+from app.helper.thread import ThreadHelper
 from app.log import logger
 from app.schemas import ActionContext, ActionFlow, Action, ActionExecution
 
@@ -26,7 +26,7 @@ class WorkflowExecutor:
         """
         初始化工作流执行器
         :param workflow: 工作流对象
-        :param step_callback: 步骤回调函数
+        :param step_callback: 步骤回调函数，参数为：动作、上下文、自上次回调以来变更的上下文字段
         """
         # 工作流数据
         self.workflow = workflow
@@ -41,14 +41,16 @@ class WorkflowExecutor:
 
         # 工作流管理器
         self.workflowmanager = WorkFlowManager()
-        # 线程安全队列
+        # 待执行队列
         self.queue = deque()
-        # 锁用于保证线程安全
-        self.lock = threading.Lock()
-        # 线程池
-        self.executor = ThreadPoolExecutor()
+        # 条件变量，动作完成时通知主循环，同时用于保证线程安全
+        self.condition = threading.Condition()
         # 跟踪运行中的任务数
         self.running_tasks = 0
+        # 自上次保存以来发生变更的上下文字段
+        self.dirty_fields: Set[str] = set()
+        # 上次保存时各上下文字段的摘要，动作会直接修改共享的上下文对象，需比较摘要判断是否变更
+        self.field_digests: Dict[str, str] = {}
 
         # 构建邻接表、入度表
         self.adjacency = defaultdict(list)
@@ -64,15 +66,21 @@ class WorkflowExecutor:
             if action_id not in self.indegree:
                 self.indegree[action_id] = 0
 
+        # 已执行的动作
+        self.executed_actions = set(workflow.current_action.split(',')) if workflow.current_action else set()
+
         # 初始上下文
-        if workflow.current_action and workflow.context:
+        self.context = None
+        if self.executed_actions and workflow.context:
             logger.info(f"工作流已执行动作：{workflow.current_action}")
-            # Base64解码
-            decoded_data = base64.b64decode(workflow.context["content"])
-            # 反序列化数据
-            self.context = pickle.loads(decoded_data)
-        else:
+            self.context = self.load_context(workflow.context)
+        if not self.context or not workflow.context.get("fields"):
+            # 全新执行或从旧格式恢复时，首次保存需要写入全部字段
+            self.dirty_fields = set(ActionContext.__fields__)
+        if not self.context:
             self.context = ActionContext()
+        if not self.dirty_fields:
+            self.field_digests = self.__digest_fields(self.context)
 
         # 恢复工作流
         global_vars.workflow_resume(self.workflow.id)
@@ -81,38 +89,72 @@ class WorkflowExecutor:
             if self.indegree[action_id] == 0:
                 self.queue.append(action_id)
 
+    @staticmethod
+    def dump_context(context: ActionContext, fields: Optional[Set[str]] = None) -> Dict[str, str]:
+        """
+        序列化上下文，按字段分别编码，以便只保存发生变更的字段
+        :param context: 上下文
+        :param fields: 需要序列化的字段，为空时序列化全部字段
+        """
+        fields = fields if fields is not None else set(ActionContext.__fields__)
+        return {
+            key: base64.b64encode(pickle.dumps(getattr(context, key, None))).decode('utf-8')
+            for key in fields
+        }
+
+    @staticmethod
+    def load_context(data: dict) -> Optional[ActionContext]:
+        """
+        反序列化上下文，兼容整体序列化的旧格式
+        """
+        try:
+            fields = data.get("fields")
+            if fields:
+                return ActionContext(**{
+                    key: pickle.loads(base64.b64decode(value))
+                    for key, value in fields.items() if key in ActionContext.__fields__
+                })
+            if data.get("content"):
+                return pickle.loads(base64.b64decode(data["content"]))
+        except Exception as err:
+            logger.error(f"工作流上下文恢复失败：{err}")
+        return None
+
     def execute(self):
         """
-        执行工作流
+        执行工作流，由动作完成通知驱动
         """
         while True:
-            with self.lock:
-                # 退出条件：队列为空且无运行任务
-                if not self.queue and self.running_tasks == 0:
-                    break
+            with self.condition:
+                # 等待可执行的节点或全部任务结束
+                while self.success and not self.queue and self.running_tasks > 0:
+                    self.condition.wait()
                 # 退出条件：出现了错误
                 if not self.success:
                     break
+                # 退出条件：队列为空且无运行任务
                 if not self.queue:
-                    sleep(0.1)
-                    continue
+                    break
                 # 取出队首节点
                 node_id = self.queue.popleft()
-                # 标记任务开始
-                self.running_tasks += 1
 
             # 已停机
             if global_vars.is_workflow_stopped(self.workflow.id):
                 global_vars.workflow_resume(self.workflow.id)
                 break
 
-            # 已执行的跳过
-            if (self.workflow.current_action
-                    and node_id in self.workflow.current_action.split(',')):
+            # 已执行的跳过，直接释放后继节点
+            if node_id in self.executed_actions:
+                with self.condition:
+                    self.finished_actions += 1
+                    self.__release_successors(node_id)
                 continue
 
-            # 提交任务到线程池
-            future = self.executor.submit(
+            with self.condition:
+                # 标记任务开始
+                self.running_tasks += 1
+            # 提交任务到共享线程池
+            future = ThreadHelper().submit(
                 self.execute_node,
                 self.workflow.id,
                 node_id,
@@ -133,54 +175,94 @@ class WorkflowExecutor:
         """
         节点完成回调：更新上下文、处理后继节点
         """
-        action, state, message, result_ctx = future.result()
-
-        try:
-            self.finished_actions += 1
-            # 更新当前进度
-            self.context.progress = round(self.finished_actions / self.total_actions) * 100
-
-            # 补充执行历史
-            self.context.execute_history.append(
-                ActionExecution(
-                    action=action.name,
-                    result=state,
-                    message=message
+        with self.condition:
+            try:
+                try:
+                    action, state, message, result_ctx = future.result()
+                except Exception as err:
+                    logger.error(f"工作流动作执行异常：{err}")
+                    self.success = False
+                    self.errmsg = f"{err}"
+                    return
+
+                self.finished_actions += 1
+                # 更新当前进度
+                self.context.progress = round(self.finished_actions / self.total_actions * 100)
+
+                # 补充执行历史
+                self.context.execute_history.append(
+                    ActionExecution(
+                        action=action.name,
+                        result=state,
+                        message=message
+                    )
                 )
-            )
+                self.dirty_fields.update({"progress", "execute_history"})
 
-            # 节点执行失败
-            if not state:
-                self.success = False
-                self.errmsg = f"{action.name} 失败"
-                return
+                # 节点执行失败
+                if not state:
+                    self.success = False
+                    self.errmsg = f"{action.name} 失败"
+                    return
 
-            with self.lock:
                 # 更新主上下文
                 self.merge_context(result_ctx)
+                # 动作可能直接修改了上下文中的字段
+                self.__detect_changes()
                 # 回调
                 if self.step_callback:
-                    self.step_callback(action, self.context)
-
-            # 处理后继节点
-            successors = self.adjacency.get(action.id, [])
-            for succ_id in successors:
-                with self.lock:
-                    self.indegree[succ_id] -= 1
-                    if self.indegree[succ_id] == 0:
-                        self.queue.append(succ_id)
-        finally:
-            # 标记任务完成
-            with self.lock:
+                    self.step_callback(action, self.context, self.dirty_fields)
+                    self.dirty_fields = set()
+
+                # 处理后继节点
+                self.__release_successors(action.id)
+            finally:
+                # 标记任务完成，唤醒主循环
                 self.running_tasks -= 1
+                self.condition.notify_all()
+
+    def __release_successors(self, node_id: str):
+        """
+        节点完成后递减后继节点入度，入度为0的加入待执行队列，需在锁内调用
+        """
+        for succ_id in self.adjacency.get(node_id, []):
+            self.indegree[succ_id] -= 1
+            if self.indegree[succ_id] == 0:
+                self.queue.append(succ_id)
+
+    @staticmethod
+    def __digest_fields(context: ActionContext) -> Dict[str, str]:
+        """
+        计算各上下文字段的摘要
+        """
+        digests = {}
+        for key in ActionContext.__fields__:
+            try:
+                digests[key] = hashlib.md5(pickle.dumps(getattr(context, key, None))).hexdigest()
+            except Exception as err:
+                logger.debug(f"工作流上下文字段 {key} 摘要计算失败：{err}")
+                digests[key] = ""
+        return digests
+
+    def __detect_changes(self):
+        """
+        比较字段摘要，记录自上次保存以来发生变更的字段，需在锁内调用
+        """
+        digests = self.__digest_fields(self.context)
+        for key, digest in digests.items():
+            if not digest or digest != self.field_digests.get(key):
+                self.dirty_fields.add(key)
+        self.field_digests = digests
 
     def merge_context(self, context: ActionContext):
         """
-        合并上下文
+        合并上下文，记录发生变更的字段
         """
-        for key, value in context.dict().items():
-            if not getattr(self.context, key, None):
+        for key in context.__fields__:
+            value = getattr(context, key, None)
+            if not getattr(self.context, key, None) and value:
                 setattr(self.context, key, value)
+                self.dirty_fields.add(key)
 
 
 class WorkflowChain(ChainBase):
@@ -197,17 +279,12 @@ class WorkflowChain(ChainBase):
         """
         workflowoper = WorkflowOper()
 
-        def save_step(action: Action, context: ActionContext):
+        def save_step(action: Action, context: ActionContext, fields: Set[str]):
             """
-            保存上下文到数据库
+            保存上下文到数据库，只写入发生变更的字段
             """
-            # 序列化数据
-            serialized_data = pickle.dumps(context)
-            # 使用Base64编码字节流
-            encoded_data = base64.b64encode(serialized_data).decode('utf-8')
-            workflowoper.step(workflow_id, action_id=action.id, context={
-                "content": encoded_data
-            })
+            workflowoper.step(workflow_id, action_id=action.id,
+                              context=WorkflowExecutor.dump_context(context, fields))
 
         # 重置工作流
         if from_begin:
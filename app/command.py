@@ -387,7 +387,7 @@ class Command(metaclass=Singleton):
         """
         eventmanager.send_event(etype, data)
 
-    @eventmanager.register(EventType.CommandExcute)
+    @eventmanager.register(EventType.CommandExcute, readonly=True)
     def command_event(self, event: ManagerEvent) -> None:
         """
         注册命令执行事件
@@ -410,7 +410,7 @@ class Command(metaclass=Singleton):
                 self.execute(cmd=cmd, data_str=args,
                              channel=event_channel, source=event_source, userid=event_user)
 
-    @eventmanager.register(EventType.ModuleReload)
+    @eventmanager.register(EventType.ModuleReload, readonly=True)
     def module_reload_event(self, _: ManagerEvent) -> None:
         """
         注册模块重载事件
@@ -169,6 +169,8 @@ class ConfigModel(BaseModel):
     DOWNLOAD_TMPEXT: list = Field(default_factory=lambda: ['.!qb', '.part'])
     # 媒体服务器同步间隔（小时）
     MEDIASERVER_SYNC_INTERVAL: int = 6
+    # 仪表板统计数据缓存时间（秒），0为不缓存
+    DASHBOARD_STATISTIC_TTL: int = 60
     # 订阅模式
     SUBSCRIBE_MODE: str = "spider"
     # RSS订阅模式刷新时间间隔（分钟）
@@ -177,8 +179,16 @@ class ConfigModel(BaseModel):
     SUBSCRIBE_STATISTIC_SHARE: bool = True
     # 订阅搜索开关
     SUBSCRIBE_SEARCH: bool = False
+    # 订阅搜索同一站点的最小请求间隔（秒）
+    SUBSCRIBE_SEARCH_SITE_INTERVAL: int = 60
+    # 每轮订阅搜索单个站点的最大请求次数，超出的订阅顺延到下一轮
+    SUBSCRIBE_SEARCH_SITE_BUDGET: int = 200
     # 检查本地媒体库是否存在资源开关
     LOCAL_EXISTS_SEARCH: bool = False
+    # 使用媒体库存在索引判断媒体是否存在，减少查询媒体服务器，媒体服务器中的变更在下次同步后才会反映到索引中
+    MEDIA_EXISTS_INDEX: bool = False
+    # 媒体库存在索引未命中时是否再查询媒体服务器确认
+    MEDIA_EXISTS_VERIFY_ON_MISS: bool = True
     # 搜索多个名称
     SEARCH_MULTIPLE_NAME: bool = False
     # 站点数据刷新间隔（小时）
@@ -246,6 +256,16 @@ class ConfigModel(BaseModel):
     PIP_PROXY: Optional[str] = ''
     # 指定的仓库Github token，多个仓库使用,分隔，格式：{user1}/{repo1}:ghp_****,{user2}/{repo2}:github_pat_****
     REPO_GITHUB_TOKEN: Optional[str] = None
+    # 通知消息合并窗口（秒），窗口内发给同一用户的同类通知合并为一条摘要，0为不合并
+    MESSAGE_DIGEST_WINDOW: int = 0
+    # 单个域名每秒请求数，0为不限制
+    REQUEST_DOMAIN_RATE: float = 0
+    # 单个域名允许的突发请求数
+    REQUEST_DOMAIN_BURST: int = 20
+    # 单个域名最大并发请求数，0为不限制
+    REQUEST_DOMAIN_CONCURRENCY: int = 0
+    # 启动时并发执行初始化的线程数，为1时按顺序启动
+    STARTUP_PARALLEL_WORKERS: int = 4
     # 大内存模式
     BIG_MEMORY_MODE: bool = False
     # 是否启用内存监控
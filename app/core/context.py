@@ -1,4 +1,6 @@
 import re
+import threading
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Tuple, Optional
@@ -10,82 +12,211 @@ from app.schemas.types import MediaType
 from app.utils.string import StringUtils
 
 
-@dataclass
+class TorrentSite:
+    """
+    种子的站点信息，同一站点的种子共用同一个对象
+    """
+    __slots__ = ("site", "site_name", "site_cookie", "site_ua", "site_proxy", "site_order", "site_downloader",
+                 "__weakref__")
+
+    # 站点信息字段
+    FIELDS = ("site", "site_name", "site_cookie", "site_ua", "site_proxy", "site_order", "site_downloader")
+
+    # 已创建的站点信息 {字段值: 站点信息}
+    _registry: "weakref.WeakValueDictionary[tuple, TorrentSite]" = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, values: tuple):
+        for name, value in zip(self.FIELDS, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("TorrentSite is read-only")
+
+    @classmethod
+    def get(cls, values: tuple) -> "TorrentSite":
+        """
+        获取站点信息，相同字段值返回同一个对象
+        """
+        try:
+            with cls._lock:
+                site = cls._registry.get(values)
+                if site is None:
+                    site = cls(values)
+                    cls._registry[values] = site
+                return site
+        except TypeError:
+            # 字段值不可哈希时不共用
+            return cls(values)
+
+    def values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def replace(self, name: str, value: Any) -> "TorrentSite":
+        """
+        返回修改了一个字段后的站点信息
+        """
+        return self.get(tuple(value if field_name == name else getattr(self, field_name)
+                              for field_name in self.FIELDS))
+
+
+class _SiteField:
+    """
+    站点字段描述符，读写TorrentInfo上的站点字段时转到共用的站点信息
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return getattr(instance._site, self.name)
+
+    def __set__(self, instance, value):
+        instance._site = instance._site.replace(self.name, value)
+
+
 class TorrentInfo:
     # 站点ID
-    site: int = None
+    site: int = _SiteField("site")
     # 站点名称
-    site_name: str = None
+    site_name: str = _SiteField("site_name")
     # 站点Cookie
-    site_cookie: str = None
+    site_cookie: str = _SiteField("site_cookie")
     # 站点UA
-    site_ua: str = None
+    site_ua: str = _SiteField("site_ua")
     # 站点是否使用代理
-    site_proxy: bool = False
+    site_proxy: bool = _SiteField("site_proxy")
     # 站点优先级
-    site_order: int = 0
+    site_order: int = _SiteField("site_order")
     # 站点下载器
-    site_downloader: str = None
-    # 种子名称
-    title: str = None
-    # 种子副标题
-    description: str = None
-    # IMDB ID
-    imdbid: str = None
-    # 种子链接
-    enclosure: str = None
-    # 详情页面
-    page_url: str = None
-    # 种子大小
-    size: float = 0.0
-    # 做种者
-    seeders: int = 0
-    # 下载者
-    peers: int = 0
-    # 完成者
-    grabs: int = 0
-    # 发布时间
-    pubdate: str = None
-    # 已过时间
-    date_elapsed: str = None
-    # 免费截止时间
-    freedate: str = None
-    # 上传因子
-    uploadvolumefactor: float = None
-    # 下载因子
-    downloadvolumefactor: float = None
-    # HR
-    hit_and_run: bool = False
-    # 种子标签
-    labels: list = field(default_factory=list)
-    # 种子优先级
-    pri_order: int = 0
-    # 种子分类 电影/电视剧
-    category: str = None
-
-    def __setattr__(self, name: str, value: Any):
-        self.__dict__[name] = value
-
-    def __get_properties(self):
-        """
-        获取属性列表
-        """
-        property_names = []
-        for member_name in dir(self.__class__):
-            member = getattr(self.__class__, member_name)
-            if isinstance(member, property):
-                property_names.append(member_name)
-        return property_names
+    site_downloader: str = _SiteField("site_downloader")
+
+    # 种子字段及默认值
+    FIELDS = {
+        # 种子名称
+        "title": None,
+        # 种子副标题
+        "description": None,
+        # IMDB ID
+        "imdbid": None,
+        # 种子链接
+        "enclosure": None,
+        # 详情页面
+        "page_url": None,
+        # 种子大小
+        "size": 0.0,
+        # 做种者
+        "seeders": 0,
+        # 下载者
+        "peers": 0,
+        # 完成者
+        "grabs": 0,
+        # 发布时间
+        "pubdate": None,
+        # 已过时间
+        "date_elapsed": None,
+        # 免费截止时间
+        "freedate": None,
+        # 上传因子
+        "uploadvolumefactor": None,
+        # 下载因子
+        "downloadvolumefactor": None,
+        # HR
+        "hit_and_run": False,
+        # 种子标签
+        "labels": None,
+        # 种子优先级
+        "pri_order": 0,
+        # 种子分类 电影/电视剧
+        "category": None,
+    }
+
+    # 未定义的字段仍可通过__dict__设置
+    __slots__ = ("_site", "__dict__") + tuple(FIELDS)
+
+    def __init__(self, site: int = None, site_name: str = None, site_cookie: str = None, site_ua: str = None,
+                 site_proxy: bool = False, site_order: int = 0, site_downloader: str = None,
+                 title: str = None, description: str = None, imdbid: str = None, enclosure: str = None,
+                 page_url: str = None, size: float = 0.0, seeders: int = 0, peers: int = 0, grabs: int = 0,
+                 pubdate: str = None, date_elapsed: str = None, freedate: str = None,
+                 uploadvolumefactor: float = None, downloadvolumefactor: float = None,
+                 hit_and_run: bool = False, labels: list = None, pri_order: int = 0, category: str = None):
+        self._site = TorrentSite.get((site, site_name, site_cookie, site_ua, site_proxy, site_order,
+                                      site_downloader))
+        self.title = title
+        self.description = description
+        self.imdbid = imdbid
+        self.enclosure = enclosure
+        self.page_url = page_url
+        self.size = size
+        self.seeders = seeders
+        self.peers = peers
+        self.grabs = grabs
+        self.pubdate = pubdate
+        self.date_elapsed = date_elapsed
+        self.freedate = freedate
+        self.uploadvolumefactor = uploadvolumefactor
+        self.downloadvolumefactor = downloadvolumefactor
+        self.hit_and_run = hit_and_run
+        self.labels = labels if labels is not None else []
+        self.pri_order = pri_order
+        self.category = category
+
+    def __fields(self) -> Dict[str, Any]:
+        """
+        获取所有字段及值
+        """
+        fields = dict(zip(TorrentSite.FIELDS, self._site.values()))
+        for name in self.FIELDS:
+            fields[name] = getattr(self, name)
+        return fields
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.__fields() == other.__fields()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.__fields().items())
+        return f"{self.__class__.__name__}({fields})"
+
+    def __getstate__(self):
+        state = self.__fields()
+        state.update(self.__dict__)
+        return state
+
+    def __setstate__(self, state: dict):
+        # 兼容旧版本缓存中未共用站点信息的数据
+        self._site = TorrentSite.get(tuple(state.get(name) for name in TorrentSite.FIELDS))
+        for name, default in self.FIELDS.items():
+            setattr(self, name, state.get(name, default))
+        if self.labels is None:
+            self.labels = []
+        for key, value in state.items():
+            if key not in self.FIELDS and key not in TorrentSite.FIELDS:
+                self.__dict__[key] = value
 
     def from_dict(self, data: dict):
         """
         从字典中初始化
         """
-        properties = self.__get_properties()
+        site_values = None
         for key, value in data.items():
-            if key in properties:
+            if key in _TORRENT_PROPERTIES:
+                continue
+            if key in TorrentSite.FIELDS:
+                # 站点字段合并后一次性更新
+                if site_values is None:
+                    site_values = dict(zip(TorrentSite.FIELDS, self._site.values()))
+                site_values[key] = value
                 continue
             setattr(self, key, value)
+        if site_values is not None:
+            self._site = TorrentSite.get(tuple(site_values.values()))
 
     @staticmethod
     def get_free_string(upload_volume_factor: float, download_volume_factor: float) -> str:
@@ -142,12 +273,17 @@ class TorrentInfo:
         """
         返回字典
         """
-        dicts = vars(self).copy()
+        dicts = self.__fields()
+        dicts.update(self.__dict__)
         dicts["volume_factor"] = self.volume_factor
         dicts["freedate_diff"] = self.freedate_diff
         return dicts
 
 
+# TorrentInfo的只读属性，从字典初始化时跳过
+_TORRENT_PROPERTIES = frozenset(name for name, member in vars(TorrentInfo).items() if isinstance(member, property))
+
+
 @dataclass
 class MediaInfo:
     # 来源：themoviedb、douban、bangumi
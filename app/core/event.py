@@ -8,7 +8,7 @@ import traceback
 import uuid
 from functools import lru_cache
 from queue import Empty, PriorityQueue
-from typing import Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from app.helper.thread import ThreadHelper
 from app.log import logger
@@ -40,6 +40,7 @@ class Event:
         self.event_type = event_type  # 事件类型
         self.event_data = event_data or {}  # 事件数据
         self.priority = priority  # 事件优先级
+        self.timestamp = time.time()  # 事件发送时间
 
     def __repr__(self) -> str:
         """
@@ -81,6 +82,14 @@ class EventManager(metaclass=Singleton):
         self.__chain_subscribers: Dict[ChainEventType, Dict[str, tuple[int, Callable]]] = {}  # 链式事件的订阅者
         self.__disabled_handlers = set()  # 禁用的事件处理器集合
         self.__disabled_classes = set()  # 禁用的事件处理器类集合
+        self.__readonly_handlers = set()  # 只读事件处理器集合，共享同一事件对象而不深复制
+        self.__class_instances: Dict[str, Any] = {}  # 事件处理器所属类的实例缓存，多个处理线程共享同一实例
+        self.__batch_handlers: Dict[str, Tuple[float, Optional[Callable]]] = {}  # 合并处理器的窗口期和合并键
+        self.__batches: Dict[tuple, List[Event]] = {}  # 窗口期内待合并的事件
+        self.__batch_timers: Dict[tuple, threading.Timer] = {}  # 合并批次的定时器
+        self.__batch_lock = threading.Lock()  # 合并批次锁
+        self.__statistics: Dict[EventType, Dict[str, Union[int, float]]] = {}  # 各事件类型的队列与耗时统计
+        self.__statistics_lock = threading.Lock()  # 统计锁
         self.__lock = threading.Lock()  # 线程锁
 
     def start(self):
@@ -100,6 +109,7 @@ class EventManager(metaclass=Singleton):
         """
         logger.info("正在停止事件处理...")
         self.__event.clear()  # 停止广播事件处理
+        self.__flush_all_batches()  # 立即处理所有未到期的合并批次
         try:
             # 通过遍历保存的线程来等待它们完成
             for consumer_thread in self.__consumer_threads:
@@ -146,21 +156,24 @@ class EventManager(metaclass=Singleton):
         return None
 
     def add_event_listener(self, event_type: Union[EventType, ChainEventType], handler: Callable,
-                           priority: Optional[int] = DEFAULT_EVENT_PRIORITY):
+                           priority: Optional[int] = DEFAULT_EVENT_PRIORITY, readonly: Optional[bool] = False,
+                           batch_window: Optional[float] = None, batch_key: Optional[Callable[[Event], Any]] = None):
         """
         注册事件处理器，将处理器添加到对应的事件订阅列表中
+        订阅列表采用写时复制，调度事件时无需加锁
         :param event_type: 事件类型 (EventType 或 ChainEventType)
         :param handler: 处理器
         :param priority: 可选，链式事件的优先级，默认为 10；广播事件不需要优先级
+        :param readonly: 可选，广播事件处理器是否只读取事件数据，只读处理器共享同一事件对象，不再深复制
+        :param batch_window: 可选，广播事件合并窗口期（秒），设置后处理器接收的是窗口期内的事件列表
+        :param batch_key: 可选，合并键函数，参数为事件，返回值相同的事件合并为一批，为空时同类型事件合并为一批
         """
         with self.__lock:
             handler_identifier = self.__get_handler_identifier(handler)
 
             if isinstance(event_type, ChainEventType):
                 # 链式事件，按优先级排序
-                if event_type not in self.__chain_subscribers:
-                    self.__chain_subscribers[event_type] = {}
-                handlers = self.__chain_subscribers[event_type]
+                handlers = dict(self.__chain_subscribers.get(event_type, {}))
                 if handler_identifier in handlers:
                     handlers.pop(handler_identifier)
                 else:
@@ -170,18 +183,25 @@ class EventManager(metaclass=Singleton):
                 handlers[handler_identifier] = (priority, handler)
                 # 根据优先级排序
                 self.__chain_subscribers[event_type] = dict(
-                    sorted(self.__chain_subscribers[event_type].items(), key=lambda x: x[1][0])
+                    sorted(handlers.items(), key=lambda x: x[1][0])
                 )
             else:
                 # 广播事件
-                if event_type not in self.__broadcast_subscribers:
-                    self.__broadcast_subscribers[event_type] = {}
-                handlers = self.__broadcast_subscribers[event_type]
+                handlers = dict(self.__broadcast_subscribers.get(event_type, {}))
                 if handler_identifier in handlers:
                     handlers.pop(handler_identifier)
                 else:
                     logger.debug(f"Subscribed to broadcast event: {event_type.value} - {handler_identifier}")
                 handlers[handler_identifier] = handler
+                self.__broadcast_subscribers[event_type] = handlers
+                if readonly:
+                    self.__readonly_handlers.add(handler_identifier)
+                else:
+                    self.__readonly_handlers.discard(handler_identifier)
+                if batch_window and batch_window > 0:
+                    self.__batch_handlers[handler_identifier] = (batch_window, batch_key)
+                else:
+                    self.__batch_handlers.pop(handler_identifier, None)
 
     def remove_event_listener(self, event_type: Union[EventType, ChainEventType], handler: Callable):
         """
@@ -193,10 +213,14 @@ class EventManager(metaclass=Singleton):
             handler_identifier = self.__get_handler_identifier(handler)
 
             if isinstance(event_type, ChainEventType) and event_type in self.__chain_subscribers:
-                self.__chain_subscribers[event_type].pop(handler_identifier, None)
+                handlers = dict(self.__chain_subscribers[event_type])
+                handlers.pop(handler_identifier, None)
+                self.__chain_subscribers[event_type] = handlers
                 logger.debug(f"Unsubscribed from chain event: {event_type.value} - {handler_identifier}")
             elif event_type in self.__broadcast_subscribers:
-                self.__broadcast_subscribers[event_type].pop(handler_identifier, None)
+                handlers = dict(self.__broadcast_subscribers[event_type])
+                handlers.pop(handler_identifier, None)
+                self.__broadcast_subscribers[event_type] = handlers
                 logger.debug(f"Unsubscribed from broadcast event: {event_type.value} - {handler_identifier}")
 
     def disable_event_handler(self, target: Union[Callable, type]):
@@ -336,6 +360,10 @@ class EventManager(metaclass=Singleton):
         :param event: 要处理的事件对象
         """
         logger.debug(f"Triggering broadcast event: {event}")
+        with self.__statistics_lock:
+            statistic = self.__get_statistic(event.event_type)
+            statistic["enqueued"] += 1
+            statistic["queue_depth"] += 1
         self.__event_queue.put((event.priority, event))
 
     def __dispatch_chain_event(self, event: Event) -> bool:
@@ -377,60 +405,135 @@ class EventManager(metaclass=Singleton):
             logger.debug(f"No handlers found for broadcast event: {event}")
             return
         for handler_id, handler in handlers.items():
-            self.__executor.submit(self.__safe_invoke_handler, handler, event)
+            if handler_id in self.__batch_handlers:
+                # 合并处理器，加入窗口期批次
+                self.__add_to_batch(handler_id, handler, event)
+                continue
+            # 只读处理器共享同一事件对象，其余处理器在线程中各自深复制
+            readonly = handler_id in self.__readonly_handlers
+            self.__executor.submit(self.__safe_invoke_handler, handler, event, not readonly)
+
+    def __add_to_batch(self, handler_id: str, handler: Callable, event: Event):
+        """
+        将广播事件加入合并批次，批次内第一个事件到达时开始计时，窗口期结束后一次性交给处理器
+        :param handler_id: 处理器标识符
+        :param handler: 处理器
+        :param event: 事件对象
+        """
+        window, key_func = self.__batch_handlers[handler_id]
+        try:
+            key = key_func(event) if key_func else None
+        except Exception as e:
+            logger.error(f"获取事件合并键出错：{str(e)} - {event}")
+            key = None
+        batch_id = (handler_id, event.event_type, key)
+        with self.__batch_lock:
+            if batch_id in self.__batches:
+                self.__batches[batch_id].append(event)
+                with self.__statistics_lock:
+                    self.__get_statistic(event.event_type)["coalesced"] += 1
+                return
+            self.__batches[batch_id] = [event]
+            timer = threading.Timer(window, self.__flush_batch, args=(batch_id, handler))
+            timer.daemon = True
+            self.__batch_timers[batch_id] = timer
+            timer.start()
+
+    def __flush_batch(self, batch_id: tuple, handler: Callable):
+        """
+        窗口期结束，将批次内的事件列表提交给处理器
+        :param batch_id: 批次标识
+        :param handler: 处理器
+        """
+        with self.__batch_lock:
+            events = self.__batches.pop(batch_id, None)
+            self.__batch_timers.pop(batch_id, None)
+        if not events:
+            return
+        handler_id = batch_id[0]
+        logger.debug(f"Flushing {len(events)} coalesced events to {handler_id}")
+        self.__executor.submit(self.__safe_invoke_handler, handler, events,
+                               handler_id not in self.__readonly_handlers)
 
-    def __safe_invoke_handler(self, handler: Callable, event: Event):
+    def __flush_all_batches(self):
         """
-        调用处理器，处理链式或广播事件
+        立即处理所有未到期的合并批次
+        """
+        with self.__batch_lock:
+            pending = list(self.__batch_timers.items())
+        for batch_id, timer in pending:
+            timer.cancel()
+            self.__flush_batch(batch_id, timer.args[1])
+
+    def __safe_invoke_handler(self, handler: Callable, event: Union[Event, List[Event]],
+                              deepcopy: Optional[bool] = False):
+        """
+        调用处理器，处理链式或广播事件，广播事件已在线程池中执行，直接调用处理器
         :param handler: 处理器
-        :param event: 事件对象
+        :param event: 事件对象，合并处理器为事件列表
+        :param deepcopy: 是否深复制事件后再交给处理器
         """
         if not self.__is_handler_enabled(handler):
             logger.debug(f"Handler {self.__get_handler_identifier(handler)} is disabled. Skipping execution")
             return
 
-        # 根据事件类型判断是否需要深复制
-        is_broadcast_event = isinstance(event.event_type, EventType)
-        event_to_process = copy.deepcopy(event) if is_broadcast_event else event
-
-        names = handler.__qualname__.split(".")
-        class_name, method_name = names[0], names[1]
+        event_to_process = copy.deepcopy(event) if deepcopy else event
+        # 合并批次以第一个事件作为统计和错误处理的依据
+        source_event = event[0] if isinstance(event, list) else event
+        class_name, method_name = self.__get_handler_names(handler)
+        start_time = time.time()
 
         try:
             from app.core.plugin import PluginManager
             from app.core.module import ModuleManager
 
             if class_name in PluginManager().get_plugin_ids():
-                def plugin_callable():
-                    """
-                    插件调用函数
-                    """
-                    PluginManager().run_plugin_method(class_name, method_name, event_to_process)
-
-                if is_broadcast_event:
-                    self.__executor.submit(plugin_callable)
-                else:
-                    plugin_callable()
+                PluginManager().run_plugin_method(class_name, method_name, event_to_process)
             elif class_name in ModuleManager().get_module_ids():
                 module = ModuleManager().get_running_module(class_name)
                 if module:
                     method = getattr(module, method_name, None)
                     if method:
-                        if is_broadcast_event:
-                            self.__executor.submit(method, event_to_process)
-                        else:
-                            method(event_to_process)
+                        method(event_to_process)
             else:
                 # 获取全局对象或模块类的实例
-                class_obj = self.__get_class_instance(class_name)
+                class_obj = self.__get_cached_class_instance(class_name)
                 if class_obj and hasattr(class_obj, method_name):
-                    method = getattr(class_obj, method_name)
-                    if is_broadcast_event:
-                        self.__executor.submit(method, event_to_process)
-                    else:
-                        method(event_to_process)
+                    getattr(class_obj, method_name)(event_to_process)
         except Exception as e:
-            self.__handle_event_error(event, handler, e)
+            self.__handle_event_error(source_event, handler, e)
+        finally:
+            if isinstance(source_event.event_type, EventType):
+                with self.__statistics_lock:
+                    statistic = self.__get_statistic(source_event.event_type)
+                    statistic["handled"] += 1
+                    statistic["handler_time"] += time.time() - start_time
+
+    @staticmethod
+    @lru_cache(maxsize=1000)
+    def __get_handler_names(handler: Callable) -> Tuple[str, str]:
+        """
+        获取处理器所属的类名和方法名
+        :param handler: 处理器
+        :return: (类名, 方法名)
+        """
+        names = handler.__qualname__.split(".")
+        return names[0], names[1]
+
+    def __get_cached_class_instance(self, class_name: str):
+        """
+        获取处理器所属类的实例，同一类只导入和实例化一次
+        缓存的实例会被多个事件处理线程同时使用，处理器不能在实例属性中保存单次事件的状态，
+        需要保存时使用局部变量或自行加锁
+        :param class_name: 类的名称
+        :return: 类的实例
+        """
+        class_obj = self.__class_instances.get(class_name)
+        if class_obj is None:
+            class_obj = self.__get_class_instance(class_name)
+            if class_obj is not None:
+                class_obj = self.__class_instances.setdefault(class_name, class_obj)
+        return class_obj
 
     @staticmethod
     def __get_class_instance(class_name: str):
@@ -485,11 +588,60 @@ class EventManager(metaclass=Singleton):
             try:
                 priority, event = self.__event_queue.get(timeout=rate_limiter.current_wait)
                 rate_limiter.reset()
+                with self.__statistics_lock:
+                    statistic = self.__get_statistic(event.event_type)
+                    latency = time.time() - event.timestamp
+                    statistic["queue_depth"] -= 1
+                    statistic["dispatched"] += 1
+                    statistic["queue_latency"] += latency
+                    statistic["max_queue_latency"] = max(statistic["max_queue_latency"], latency)
                 self.__dispatch_broadcast_event(event)
             except Empty:
                 rate_limiter.current_wait = rate_limiter.current_wait * random.uniform(1, 1 + jitter_factor)
                 rate_limiter.trigger_limit()
 
+    def __get_statistic(self, event_type: EventType) -> Dict[str, Union[int, float]]:
+        """
+        获取事件类型的统计数据，不存在时初始化，需在统计锁内调用
+        """
+        statistic = self.__statistics.get(event_type)
+        if statistic is None:
+            statistic = {
+                "enqueued": 0,
+                "queue_depth": 0,
+                "dispatched": 0,
+                "coalesced": 0,
+                "handled": 0,
+                "queue_latency": 0.0,
+                "max_queue_latency": 0.0,
+                "handler_time": 0.0
+            }
+            self.__statistics[event_type] = statistic
+        return statistic
+
+    def get_statistics(self) -> List[Dict]:
+        """
+        获取各广播事件类型的队列深度、排队延迟和处理耗时统计
+        :return: 统计列表，包含事件类型、入队数、当前队列深度、已调度数、合并数、处理次数、平均/最大排队延迟和平均处理耗时
+        """
+        with self.__statistics_lock:
+            statistics = {event_type: dict(statistic) for event_type, statistic in self.__statistics.items()}
+        return [
+            {
+                "event_type": event_type.value,
+                "enqueued": statistic["enqueued"],
+                "queue_depth": statistic["queue_depth"],
+                "dispatched": statistic["dispatched"],
+                "coalesced": statistic["coalesced"],
+                "handled": statistic["handled"],
+                "avg_queue_latency": round(statistic["queue_latency"] / statistic["dispatched"], 6)
+                if statistic["dispatched"] else 0,
+                "max_queue_latency": round(statistic["max_queue_latency"], 6),
+                "avg_handler_time": round(statistic["handler_time"] / statistic["handled"], 6)
+                if statistic["handled"] else 0
+            } for event_type, statistic in statistics.items()
+        ]
+
     @staticmethod
     def __log_event_lifecycle(event: Event, stage: str):
         """
@@ -503,8 +655,7 @@ class EventManager(metaclass=Singleton):
         """
         logger.error(f"事件处理出错：{str(e)} - {traceback.format_exc()}")
 
-        names = handler.__qualname__.split(".")
-        class_name, method_name = names[0], names[1]
+        class_name, method_name = self.__get_handler_names(handler)
 
         # 发送系统错误通知
         from app.helper.message import MessageHelper
@@ -523,7 +674,8 @@ class EventManager(metaclass=Singleton):
         )
 
     def register(self, etype: Union[EventType, ChainEventType, List[Union[EventType, ChainEventType]], type],
-                 priority: Optional[int] = DEFAULT_EVENT_PRIORITY):
+                 priority: Optional[int] = DEFAULT_EVENT_PRIORITY, readonly: Optional[bool] = False,
+                 batch_window: Optional[float] = None, batch_key: Optional[Callable[[Event], Any]] = None):
         """
         事件注册装饰器，用于将函数注册为事件的处理器
         :param etype:
@@ -531,6 +683,11 @@ class EventManager(metaclass=Singleton):
             - 事件类型类 (EventType, ChainEventType)
             - 或事件类型成员的列表
         :param priority: 可选，链式事件的优先级，默认为 DEFAULT_EVENT_PRIORITY
+        :param readonly: 可选，处理器不修改事件数据时设为 True，广播事件将不再为其深复制，
+            只读处理器之间及与发送方共享同一事件对象，处理器内不能修改 event.event_data 及其中的对象
+        :param batch_window: 可选，广播事件合并窗口期（秒），设置后处理器接收的是窗口期内的事件列表
+        :param batch_key: 可选，合并键函数，参数为事件，返回值相同的事件合并为一批
+        注意：非插件、非模块的处理器所属类只实例化一次，多个事件处理线程共享同一实例
         """
 
         def decorator(f: Callable):
@@ -545,11 +702,11 @@ class EventManager(metaclass=Singleton):
             # 遍历列表，处理每个事件类型
             for event in event_list:
                 if isinstance(event, (EventType, ChainEventType)):
-                    self.add_event_listener(event, f, priority)
+                    self.add_event_listener(event, f, priority, readonly, batch_window, batch_key)
                 elif isinstance(event, type) and issubclass(event, (EventType, ChainEventType)):
                     # 如果是 EventType 或 ChainEventType 类，提取该类中的所有成员
                     for et in event.__members__.values():
-                        self.add_event_listener(et, f, priority)
+                        self.add_event_listener(et, f, priority, readonly, batch_window, batch_key)
                 else:
                     raise ValueError(f"无效的事件类型: {event}")
 
@@ -26,7 +26,7 @@ class CustomizationMatcher(metaclass=Singleton):
             return ""
         if not self.customization:
             # 自定义占位符
-            customization = self.systemconfig.get(SystemConfigKey.Customization)
+            customization = self.systemconfig.get_snapshot(SystemConfigKey.Customization)
             if not customization:
                 return ""
             if isinstance(customization, str):
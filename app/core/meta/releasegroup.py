@@ -97,8 +97,8 @@ class ReleaseGroupsMatcher(metaclass=Singleton):
             return ""
         if not groups:
             # 自定义组
-            custom_release_groups = SystemConfigOper().get(SystemConfigKey.CustomReleaseGroups)
-            if isinstance(custom_release_groups, list):
+            custom_release_groups = SystemConfigOper().get_snapshot(SystemConfigKey.CustomReleaseGroups)
+            if isinstance(custom_release_groups, (list, tuple)):
                 custom_release_groups = list(filter(None, custom_release_groups))
             if custom_release_groups:
                 custom_release_groups_str = '|'.join(custom_release_groups)
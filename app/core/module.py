@@ -1,4 +1,5 @@
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator, Optional, Tuple, Any, Union, List
 
 from app.core.config import settings
@@ -26,31 +27,53 @@ class ModuleManager(metaclass=Singleton):
     def __init__(self):
         self.load_modules()
 
-    def load_modules(self):
+    def load_modules(self, reload: bool = False):
         """
         加载所有模块
+        :param reload: 是否重新加载模块代码
         """
         # 扫描模块目录
         modules = ModuleHelper.load(
             "app.modules",
-            filter_func=lambda _, obj: hasattr(obj, 'init_module') and hasattr(obj, 'init_setting')
+            filter_func=lambda _, obj: hasattr(obj, 'init_module') and hasattr(obj, 'init_setting'),
+            reload=reload
         )
         self._running_modules = {}
         self._modules = {}
+        instances = []
         for module in modules:
             module_id = module.__name__
             self._modules[module_id] = module
             try:
                 # 生成实例
                 _module = module()
-                # 初始化模块
+                # 通过模板开关控制加载
                 if self.check_setting(_module.init_setting()):
-                    # 通过模板开关控制加载
-                    _module.init_module()
-                    self._running_modules[module_id] = _module
-                    logger.info(f"Moudle Loaded：{module_id}")
+                    instances.append((module_id, _module))
             except Exception as err:
                 logger.error(f"Load Moudle Error：{module_id}，{str(err)} - {traceback.format_exc()}", exc_info=True)
+        # 各模块相互独立，并发初始化
+        workers = max(1, min(settings.STARTUP_PARALLEL_WORKERS or 1, len(instances) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="module-init") as executor:
+            futures = [(module_id, _module, executor.submit(self.__init_module, module_id, _module))
+                       for module_id, _module in instances]
+        # 按扫描顺序登记运行态模块
+        for module_id, _module, future in futures:
+            if future.result():
+                self._running_modules[module_id] = _module
+                logger.info(f"Moudle Loaded：{module_id}")
+
+    @staticmethod
+    def __init_module(module_id: str, module: Any) -> bool:
+        """
+        初始化模块
+        """
+        try:
+            module.init_module()
+            return True
+        except Exception as err:
+            logger.error(f"Load Moudle Error：{module_id}，{str(err)} - {traceback.format_exc()}", exc_info=True)
+            return False
 
     def stop(self):
         """
@@ -71,7 +94,7 @@ class ModuleManager(metaclass=Singleton):
         重新加载所有模块
         """
         self.stop()
-        self.load_modules()
+        self.load_modules(reload=True)
         eventmanager.send_event(etype=EventType.ModuleReload, data={})
 
     def test(self, modleid: str) -> Tuple[bool, str]:
@@ -135,7 +135,8 @@ class PluginManager(metaclass=Singleton):
             # 加载已安装插件
             plugins = ModuleHelper.load(
                 "app.plugins",
-                filter_func=lambda name, obj: check_module(obj) and name in installed_plugins
+                filter_func=lambda name, obj: check_module(obj) and name in installed_plugins,
+                reload=True
             )
         # 排序
         plugins.sort(key=lambda x: x.plugin_order if hasattr(x, "plugin_order") else 0)
@@ -232,7 +233,7 @@ class PluginManager(metaclass=Singleton):
         """
         return self._plugins
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
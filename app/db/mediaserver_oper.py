@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -26,6 +26,12 @@ class MediaServerOper(DbOper):
             return True
         return False
 
+    def list(self) -> List[MediaServerItem]:
+        """
+        获取所有媒体服务器数据
+        """
+        return MediaServerItem.list(self._db)
+
     def empty(self, server: Optional[str] = None):
         """
         清空媒体服务器数据
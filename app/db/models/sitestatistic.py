@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Dict
 
 from sqlalchemy import Column, Integer, String, Sequence, JSON
 from sqlalchemy.orm import Session
@@ -35,3 +36,31 @@ class SiteStatistic(Base):
     @db_update
     def reset(db: Session):
         db.query(SiteStatistic).delete()
+
+    @staticmethod
+    @db_update
+    def batch_update(db: Session, stats: Dict[str, dict]):
+        """
+        批量合并站点访问统计，在同一个事务中写入
+        :param stats: {domain: {"success": 成功次数, "fail": 失败次数, "samples": {时间: 耗时},
+                       "lst_state": 最后状态, "lst_mod_date": 最后访问时间}}
+        """
+        for domain, stat in stats.items():
+            samples: dict = stat.get("samples") or {}
+            sta = db.query(SiteStatistic).filter(SiteStatistic.domain == domain).first()
+            if not sta:
+                sta = SiteStatistic(domain=domain, success=0, fail=0, note={})
+                db.add(sta)
+            note: dict = dict(sta.note or {})
+            if samples:
+                note.update(samples)
+                # 只保留最近10次耗时
+                note = dict(sorted(note.items(), key=lambda x: x[0], reverse=True)[:10])
+                sta.seconds = sum(note.values()) // len(note)
+            elif sta.seconds is None and stat.get("success"):
+                sta.seconds = 1
+            sta.note = note
+            sta.success = (sta.success or 0) + stat.get("success", 0)
+            sta.fail = (sta.fail or 0) + stat.get("fail", 0)
+            sta.lst_state = stat.get("lst_state")
+            sta.lst_mod_date = stat.get("lst_mod_date")
@@ -1,7 +1,7 @@
 import time
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, Sequence, Boolean, func, or_, JSON
+from sqlalchemy import Column, Integer, String, Sequence, Boolean, func, or_, and_, JSON, text
 from sqlalchemy.orm import Session
 
 from app.db import db_query, db_update, Base
@@ -59,39 +59,91 @@ class TransferHistory(Base):
     # 剧集组
     episode_group = Column(String)
 
+    # 全文索引是否可用（None表示未检测）
+    _fts_enabled = None
+    # trigram分词的最小匹配长度
+    _fts_min_length = 3
+
+    @staticmethod
+    def __fts_available(db: Session) -> bool:
+        """
+        检查整理记录全文索引表是否存在
+        """
+        if TransferHistory._fts_enabled is None:
+            try:
+                TransferHistory._fts_enabled = db.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transferhistory_fts'"
+                )).first() is not None
+            except Exception:
+                TransferHistory._fts_enabled = False
+        return TransferHistory._fts_enabled
+
+    @staticmethod
+    def __title_filter(db: Session, title: str):
+        """
+        标题/源路径/目标路径的检索条件，优先使用全文索引，关键字过短或索引不可用时回退为LIKE
+        """
+        if len(title) >= TransferHistory._fts_min_length and TransferHistory.__fts_available(db):
+            # 按短语匹配，转义双引号避免被解析为FTS语法
+            keyword = '"%s"' % title.replace('"', '""')
+            return text(
+                "transferhistory.id IN "
+                "(SELECT rowid FROM transferhistory_fts WHERE transferhistory_fts MATCH :keyword)"
+            ).bindparams(keyword=keyword)
+        return or_(
+            TransferHistory.title.like(f'%{title}%'),
+            TransferHistory.src.like(f'%{title}%'),
+            TransferHistory.dest.like(f'%{title}%'),
+        )
+
+    @staticmethod
+    def __paginate(db: Session, query, page: int, count: int, last_id: Optional[int] = None):
+        """
+        按时间倒序分页，传入上一页最后一条记录的ID时使用游标分页，避免大偏移量扫描
+        """
+        if last_id:
+            last_date = db.query(TransferHistory.date).filter(TransferHistory.id == last_id).scalar()
+            if last_date is not None:
+                query = query.filter(or_(
+                    TransferHistory.date < last_date,
+                    and_(TransferHistory.date == last_date, TransferHistory.id < last_id)
+                ))
+            else:
+                query = query.filter(TransferHistory.id < last_id)
+            query = query.order_by(
+                TransferHistory.date.desc(), TransferHistory.id.desc()
+            )
+        else:
+            query = query.order_by(
+                TransferHistory.date.desc(), TransferHistory.id.desc()
+            ).offset((page - 1) * count)
+        return list(query.limit(count).all())
+
     @staticmethod
     @db_query
-    def list_by_title(db: Session, title: str, page: Optional[int] = 1, count: Optional[int] = 30, status: bool = None):
+    def list_by_title(db: Session, title: str, page: Optional[int] = 1, count: Optional[int] = 30, status: bool = None,
+                      last_id: Optional[int] = None):
         if status is not None:
-            result = db.query(TransferHistory).filter(
+            query = db.query(TransferHistory).filter(
                 TransferHistory.status == status
-            ).order_by(
-                TransferHistory.date.desc()
-            ).offset((page - 1) * count).limit(count).all()
+            )
         else:
-            result = db.query(TransferHistory).filter(or_(
-                TransferHistory.title.like(f'%{title}%'),
-                TransferHistory.src.like(f'%{title}%'),
-                TransferHistory.dest.like(f'%{title}%'),
-            )).order_by(
-                TransferHistory.date.desc()
-            ).offset((page - 1) * count).limit(count).all()
-        return list(result)
+            query = db.query(TransferHistory).filter(
+                TransferHistory.__title_filter(db, title)
+            )
+        return TransferHistory.__paginate(db, query, page=page, count=count, last_id=last_id)
 
     @staticmethod
     @db_query
-    def list_by_page(db: Session, page: Optional[int] = 1, count: Optional[int] = 30, status: bool = None):
+    def list_by_page(db: Session, page: Optional[int] = 1, count: Optional[int] = 30, status: bool = None,
+                     last_id: Optional[int] = None):
         if status is not None:
-            result = db.query(TransferHistory).filter(
+            query = db.query(TransferHistory).filter(
                 TransferHistory.status == status
-            ).order_by(
-                TransferHistory.date.desc()
-            ).offset((page - 1) * count).limit(count).all()
+            )
         else:
-            result = db.query(TransferHistory).order_by(
-                TransferHistory.date.desc()
-            ).offset((page - 1) * count).limit(count).all()
-        return list(result)
+            query = db.query(TransferHistory)
+        return TransferHistory.__paginate(db, query, page=page, count=count, last_id=last_id)
 
     @staticmethod
     @db_query
@@ -145,11 +197,9 @@ class TransferHistory(Base):
         if status is not None:
             return db.query(func.count(TransferHistory.id)).filter(TransferHistory.status == status).first()[0]
         else:
-            return db.query(func.count(TransferHistory.id)).filter(or_(
-                TransferHistory.title.like(f'%{title}%'),
-                TransferHistory.src.like(f'%{title}%'),
-                TransferHistory.dest.like(f'%{title}%')
-            )).first()[0]
+            return db.query(func.count(TransferHistory.id)).filter(
+                TransferHistory.__title_filter(db, title)
+            ).first()[0]
 
     @staticmethod
     @db_query
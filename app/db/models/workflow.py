@@ -1,7 +1,8 @@
+import json
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, JSON, Sequence, String, and_
+from sqlalchemy import Column, Integer, JSON, Sequence, String, and_, case, func
 
 from app.db import Base, db_query, db_update
 
@@ -96,8 +97,17 @@ class Workflow(Base):
     @staticmethod
     @db_update
     def update_current_action(db, wid: int, action_id: str, context: dict):
+        """
+        记录已执行动作，并将变更的上下文字段合并到已保存的上下文中，同时移除旧格式的整体上下文
+        """
         db.query(Workflow).filter(Workflow.id == wid).update({
-            "current_action": Workflow.current_action + f",{action_id}" if Workflow.current_action else action_id,
-            "context": context
-        })
+            "current_action": case(
+                (Workflow.current_action.is_(None), action_id),
+                else_=Workflow.current_action + f",{action_id}"
+            ),
+            "context": func.json_patch(
+                func.coalesce(Workflow.context, "{}"),
+                json.dumps({"fields": context, "content": None})
+            )
+        }, synchronize_session=False)
         return True
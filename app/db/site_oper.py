@@ -1,17 +1,30 @@
+import threading
+from collections import deque
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from app.db import DbOper
 from app.db.models import SiteIcon
 from app.db.models.site import Site
 from app.db.models.sitestatistic import SiteStatistic
 from app.db.models.siteuserdata import SiteUserData
+from app.log import logger
 
 
 class SiteOper(DbOper):
     """
     站点管理
     """
+    # 待写入数据库的站点访问统计
+    _stat_buffer: Dict[str, dict] = {}
+    # 各站点最近的访问记录 [(是否成功, 耗时)]
+    _stat_windows: Dict[str, deque] = {}
+    # 保留的最近访问记录数
+    _stat_window_size = 100
+    # 统计写入间隔（秒）
+    _stat_flush_interval = 30
+    _stat_lock = threading.RLock()
+    _stat_timer: Optional[threading.Timer] = None
 
     def add(self, **kwargs) -> Tuple[bool, str]:
         """
@@ -175,59 +188,130 @@ class SiteOper(DbOper):
 
     def success(self, domain: str, seconds: Optional[int] = None):
         """
-        站点访问成功
+        站点访问成功，先记录在内存中，定时批量写入数据库
         """
         lst_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        sta = SiteStatistic.get_by_domain(self._db, domain)
-        if sta:
-            avg_seconds, note = None, {}
+        with self._stat_lock:
+            stat = self.__stat_buffer(domain)
+            stat["success"] += 1
             if seconds is not None:
-                note: dict = sta.note or {}
-                note[lst_date] = seconds or 1
-                avg_times = len(note.keys())
-                if avg_times > 10:
-                    note = dict(sorted(note.items(), key=lambda x: x[0], reverse=True)[:10])
-                avg_seconds = sum([v for v in note.values()]) // avg_times
-            sta.update(self._db, {
-                "success": sta.success + 1,
-                "seconds": avg_seconds or sta.seconds,
-                "lst_state": 0,
-                "lst_mod_date": lst_date,
-                "note": note or sta.note
-            })
-        else:
-            note = {}
-            if seconds is not None:
-                note = {
-                    lst_date: seconds or 1
-                }
-            SiteStatistic(
-                domain=domain,
-                success=1,
-                fail=0,
-                seconds=seconds or 1,
-                lst_state=0,
-                lst_mod_date=lst_date,
-                note=note
-            ).create(self._db)
+                stat["samples"][lst_date] = seconds or 1
+            stat["lst_state"] = 0
+            stat["lst_mod_date"] = lst_date
+            self.__stat_window(domain).append((True, seconds))
+        self.__schedule_flush()
 
     def fail(self, domain: str):
         """
-        站点访问失败
+        站点访问失败，先记录在内存中，定时批量写入数据库
         """
         lst_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        sta = SiteStatistic.get_by_domain(self._db, domain)
-        if sta:
-            sta.update(self._db, {
-                "fail": sta.fail + 1,
-                "lst_state": 1,
-                "lst_mod_date": lst_date
-            })
-        else:
-            SiteStatistic(
-                domain=domain,
-                success=0,
-                fail=1,
-                lst_state=1,
-                lst_mod_date=lst_date
-            ).create(self._db)
+        with self._stat_lock:
+            stat = self.__stat_buffer(domain)
+            stat["fail"] += 1
+            stat["lst_state"] = 1
+            stat["lst_mod_date"] = lst_date
+            self.__stat_window(domain).append((False, None))
+        self.__schedule_flush()
+
+    @classmethod
+    def __stat_buffer(cls, domain: str) -> dict:
+        """
+        获取站点待写入的统计
+        """
+        stat = cls._stat_buffer.get(domain)
+        if stat is None:
+            stat = cls._stat_buffer[domain] = {
+                "success": 0,
+                "fail": 0,
+                "samples": {},
+                "lst_state": 0,
+                "lst_mod_date": None
+            }
+        return stat
+
+    @classmethod
+    def __stat_window(cls, domain: str) -> deque:
+        """
+        获取站点最近的访问记录
+        """
+        window = cls._stat_windows.get(domain)
+        if window is None:
+            window = cls._stat_windows[domain] = deque(maxlen=cls._stat_window_size)
+        return window
+
+    @classmethod
+    def __schedule_flush(cls):
+        """
+        启动定时写入
+        """
+        with cls._stat_lock:
+            if cls._stat_timer and cls._stat_timer.is_alive():
+                return
+            cls._stat_timer = threading.Timer(cls._stat_flush_interval, cls.__flush_in_background)
+            cls._stat_timer.daemon = True
+            cls._stat_timer.start()
+
+    @classmethod
+    def __flush_in_background(cls):
+        with cls._stat_lock:
+            cls._stat_timer = None
+        SiteOper().flush_statistic()
+
+    def flush_statistic(self):
+        """
+        将内存中的站点访问统计批量写入数据库
+        """
+        with self._stat_lock:
+            stats = self._stat_buffer
+            SiteOper._stat_buffer = {}
+        if not stats:
+            return
+        try:
+            SiteStatistic.batch_update(self._db, stats)
+        except Exception as e:
+            logger.error(f"写入站点访问统计失败，稍后重试：{str(e)}")
+            # 同一事务写入，失败时整体回滚，合并回缓冲区等待下次写入
+            self.__restore_statistic(stats)
+            self.__schedule_flush()
+
+    @classmethod
+    def __restore_statistic(cls, stats: Dict[str, dict]):
+        """
+        将写入失败的统计合并回缓冲区，写入期间新增的统计更新，以其最后状态为准
+        """
+        with cls._stat_lock:
+            for domain, old_stat in stats.items():
+                stat = cls._stat_buffer.get(domain)
+                if stat is None:
+                    cls._stat_buffer[domain] = old_stat
+                    continue
+                stat["success"] += old_stat.get("success", 0)
+                stat["fail"] += old_stat.get("fail", 0)
+                stat["samples"] = {**(old_stat.get("samples") or {}), **stat["samples"]}
+
+    @classmethod
+    def get_health(cls, domain: str) -> Optional[dict]:
+        """
+        获取站点最近访问情况，供搜索和排序使用
+        :param domain: 站点域名
+        :return: {"count": 访问次数, "success_rate": 成功率, "p50": 耗时中位数, "p90": 90分位耗时, "p99": 99分位耗时}，无记录时返回None
+        """
+        with cls._stat_lock:
+            window = list(cls._stat_windows.get(domain) or [])
+        if not window:
+            return None
+        seconds = sorted(s for ok, s in window if ok and s is not None)
+
+        def __percentile(p: float) -> Optional[float]:
+            if not seconds:
+                return None
+            return seconds[min(len(seconds) - 1, int(round(p * (len(seconds) - 1))))]
+
+        return {
+            "count": len(window),
+            "success_rate": sum(1 for ok, _ in window if ok) / len(window),
+            "p50": __percentile(0.5),
+            "p90": __percentile(0.9),
+            "p99": __percentile(0.99)
+        }
@@ -1,12 +1,43 @@
 import copy
-from typing import Any, Optional, Union
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from app.db import DbOper
 from app.db.models.systemconfig import SystemConfig
+from app.log import logger
 from app.schemas.types import SystemConfigKey
 from app.utils.singleton import Singleton
 
 
+def _freeze(value: Any) -> Any:
+    """
+    转换为只读快照：dict转为只读映射，list转为tuple
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """
+    从只读快照复制出可修改的值，递归转换任意层级的只读映射、tuple和frozenset
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(v) for v in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return copy.deepcopy(value)
+
+
 class SystemConfigOper(DbOper, metaclass=Singleton):
     """
     系统配置管理
@@ -17,6 +48,11 @@ class SystemConfigOper(DbOper, metaclass=Singleton):
         """
         super().__init__()
         self.__SYSTEMCONF = {}
+        # 只读快照，按需生成，配置变更时失效
+        self.__SNAPSHOTS = {}
+        # 配置变更监听
+        self.__listeners: Dict[str, List[Callable[[str, Any], None]]] = {}
+        self.__lock = threading.Lock()
         for item in SystemConfig.list(self._db):
             self.__SYSTEMCONF[item.key] = item.value
 
@@ -31,8 +67,12 @@ class SystemConfigOper(DbOper, metaclass=Singleton):
             key = key.value
         # 旧值
         old_value = self.__SYSTEMCONF.get(key)
-        # 更新内存(deepcopy避免内存共享)
-        self.__SYSTEMCONF[key] = copy.deepcopy(value)
+        # 只读快照（包括嵌套在list/dict中的）转换为普通对象再存储
+        value = _thaw(value)
+        # 更新内存(复制避免内存共享)
+        with self.__lock:
+            self.__SYSTEMCONF[key] = _thaw(value)
+            self.__SNAPSHOTS.pop(key, None)
         conf = SystemConfig.get_by_key(self._db, key)
         if conf:
             if old_value != value:
@@ -40,11 +80,13 @@ class SystemConfigOper(DbOper, metaclass=Singleton):
                     conf.update(self._db, {"value": value})
                 else:
                     conf.delete(self._db, conf.id)
+                self.__notify(key)
                 return True
             return None
         else:
             conf = SystemConfig(key=key, value=value)
             conf.create(self._db)
+            self.__notify(key)
             return True
 
     def get(self, key: Union[str, SystemConfigKey] = None) -> Any:
@@ -56,7 +98,47 @@ class SystemConfigOper(DbOper, metaclass=Singleton):
         if not key:
             return self.all()
         # 避免将__SYSTEMCONF内的值引用出去，会导致set时误判没有变动
-        return copy.deepcopy(self.__SYSTEMCONF.get(key))
+        return _thaw(self.get_snapshot(key))
+
+    def get_snapshot(self, key: Union[str, SystemConfigKey]) -> Any:
+        """
+        获取系统设置的只读快照（dict为只读映射，list为tuple），可在多处共享，无需复制；
+        需要修改时使用get获取副本，修改后再set
+        """
+        if isinstance(key, SystemConfigKey):
+            key = key.value
+        snapshot = self.__SNAPSHOTS.get(key)
+        if snapshot is None:
+            with self.__lock:
+                snapshot = self.__SNAPSHOTS.get(key)
+                if snapshot is None:
+                    snapshot = _freeze(self.__SYSTEMCONF.get(key))
+                    if snapshot is not None:
+                        self.__SNAPSHOTS[key] = snapshot
+        return snapshot
+
+    def watch(self, key: Union[str, SystemConfigKey], callback: Callable[[str, Any], None]):
+        """
+        监听配置变更，配置被设置或删除后回调 callback(key, 新值的只读快照)
+        """
+        if isinstance(key, SystemConfigKey):
+            key = key.value
+        with self.__lock:
+            self.__listeners.setdefault(key, []).append(callback)
+
+    def __notify(self, key: str):
+        """
+        通知配置变更
+        """
+        listeners = self.__listeners.get(key)
+        if not listeners:
+            return
+        snapshot = self.get_snapshot(key)
+        for callback in list(listeners):
+            try:
+                callback(key, snapshot)
+            except Exception as e:
+                logger.error(f"配置 {key} 变更通知失败：{str(e)}")
 
     def all(self):
         """
@@ -72,11 +154,14 @@ class SystemConfigOper(DbOper, metaclass=Singleton):
         if isinstance(key, SystemConfigKey):
             key = key.value
         # 更新内存
-        self.__SYSTEMCONF.pop(key, None)
+        with self.__lock:
+            self.__SYSTEMCONF.pop(key, None)
+            self.__SNAPSHOTS.pop(key, None)
         # 写入数据库
         conf = SystemConfig.get_by_key(self._db, key)
         if conf:
             conf.delete(self._db, conf.id)
+        self.__notify(key)
         return True
 
     def __del__(self):
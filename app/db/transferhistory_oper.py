@@ -5,6 +5,7 @@ from app.core.context import MediaInfo
 from app.core.meta import MetaBase
 from app.db import DbOper
 from app.db.models.transferhistory import TransferHistory
+from app.helper.dashboard import DashboardHelper
 from app.schemas import TransferInfo, FileItem
 
 
@@ -57,6 +58,7 @@ class TransferHistoryOper(DbOper):
             "date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
         })
         TransferHistory(**kwargs).create(self._db)
+        DashboardHelper().add_transfer(kwargs.get("date"))
 
     def statistic(self, days: Optional[int] = 7) -> List[Any]:
         """
@@ -92,12 +94,14 @@ class TransferHistoryOper(DbOper):
         删除转移记录
         """
         TransferHistory.delete(self._db, historyid)
+        DashboardHelper().reset_transfer()
 
     def truncate(self):
         """
         清空转移记录
         """
         TransferHistory.truncate(self._db)
+        DashboardHelper().reset_transfer()
 
     def add_force(self, **kwargs) -> TransferHistory:
         """
@@ -107,10 +111,12 @@ class TransferHistoryOper(DbOper):
             transferhistory = TransferHistory.get_by_src(self._db, kwargs.get("src"))
             if transferhistory:
                 transferhistory.delete(self._db, transferhistory.id)
+                DashboardHelper().reset_transfer()
         kwargs.update({
             "date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
         })
         TransferHistory(**kwargs).create(self._db)
+        DashboardHelper().add_transfer(kwargs.get("date"))
         return TransferHistory.get_by_src(self._db, kwargs.get("src"))
 
     def update_download_hash(self, historyid, download_hash):
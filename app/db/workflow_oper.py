@@ -58,6 +58,9 @@ class WorkflowOper(DbOper):
     def step(self, wid: int, action_id: str, context: dict) -> bool:
         """
         步进
+        :param wid: 工作流ID
+        :param action_id: 已完成的动作ID
+        :param context: 发生变更的上下文字段（已序列化），与已保存的上下文合并
         """
         return Workflow.update_current_action(self._db, wid, action_id, context)
 
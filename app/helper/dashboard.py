@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.singleton import Singleton
+
+
+class DashboardHelper(metaclass=Singleton):
+    """
+    仪表板统计数据收集，缓存各项统计快照，多个请求同时访问时只有一个请求实际查询数据源
+    """
+
+    def __init__(self):
+        # 统计快照 {key: (采集时间, 数据)}
+        self._snapshots: Dict[str, Tuple[float, Any]] = {}
+        # 各统计项的刷新锁
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # 每日整理数量 {YYYY-MM-DD: 数量}
+        self._transfer_counts: Dict[str, int] = {}
+        # 已加载的整理统计天数，0表示未加载
+        self._transfer_days = 0
+        self._transfer_lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        获取统计快照，超过缓存时间时由一个请求刷新，刷新期间其它请求返回上一次的快照
+        :param key: 统计项
+        :param loader: 实际采集数据的方法
+        """
+        ttl = settings.DASHBOARD_STATISTIC_TTL
+        if not ttl or ttl <= 0:
+            return loader()
+        snapshot = self._snapshots.get(key)
+        if snapshot and time.time() - snapshot[0] < ttl:
+            return snapshot[1]
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        # 已有快照时不等待，直接返回旧数据
+        if not key_lock.acquire(blocking=snapshot is None):
+            return snapshot[1]
+        try:
+            snapshot = self._snapshots.get(key)
+            if snapshot and time.time() - snapshot[0] < ttl:
+                return snapshot[1]
+            value = loader()
+            self._snapshots[key] = (time.time(), value)
+            return value
+        finally:
+            key_lock.release()
+
+    def clear(self, key: Optional[str] = None):
+        """
+        清除统计快照
+        """
+        if key:
+            self._snapshots.pop(key, None)
+        else:
+            self._snapshots.clear()
+
+    def transfer_statistic(self, days: int, loader: Callable[[int], List[Tuple[str, int]]]) -> List[int]:
+        """
+        最近days天每日整理数量，首次或天数扩大时从数据库加载，之后由新增记录增量累加
+        :param days: 天数
+        :param loader: 从数据库按天统计的方法，返回 [(日期, 数量)]
+        """
+        with self._transfer_lock:
+            if days > self._transfer_days:
+                self._transfer_counts = {date: count for date, count in loader(days) or []}
+                self._transfer_days = days
+            start = time.strftime("%Y-%m-%d", time.localtime(time.time() - 86400 * days))
+            return [self._transfer_counts[date] for date in sorted(self._transfer_counts) if date >= start]
+
+    def add_transfer(self, date: Optional[str] = None):
+        """
+        新增整理记录时累加当日数量
+        :param date: 记录时间 %Y-%m-%d %H:%M:%S
+        """
+        day = (date or time.strftime("%Y-%m-%d", time.localtime()))[:10]
+        with self._transfer_lock:
+            if not self._transfer_days:
+                return
+            self._transfer_counts[day] = self._transfer_counts.get(day, 0) + 1
+
+    def reset_transfer(self):
+        """
+        删除整理记录后重新从数据库加载
+        """
+        with self._transfer_lock:
+            self._transfer_counts = {}
+            self._transfer_days = 0
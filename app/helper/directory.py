@@ -18,7 +18,7 @@ class DirectoryHelper:
         """
         获取所有下载目录
         """
-        dir_confs: List[dict] = SystemConfigOper().get(SystemConfigKey.Directories)
+        dir_confs: List[dict] = SystemConfigOper().get_snapshot(SystemConfigKey.Directories)
         if not dir_confs:
             return []
         return [schemas.TransferDirectoryConf(**d) for d in dir_confs]
@@ -72,7 +72,7 @@ class DohHelper(metaclass=Singleton):
     def __init__(self):
         enable_doh(settings.DOH_ENABLE)
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         if not event:
             return
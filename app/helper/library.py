@@ -0,0 +1,189 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app import schemas
+from app.core.context import MediaInfo
+from app.core.event import eventmanager, Event
+from app.db.mediaserver_oper import MediaServerOper
+from app.helper.service import ServiceConfigHelper
+from app.log import logger
+from app.schemas.types import EventType, MediaType
+from app.utils.singleton import Singleton
+
+
+class LibraryHelper(metaclass=Singleton):
+    """
+    媒体库存在索引，按 tmdbid/tvdbid/imdbid 记录各媒体服务器中已存在的季集，
+    用于判断媒体是否存在时减少对媒体服务器的查询
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        # {(类型, ID类型, ID): {服务器名称: {"server_type": 服务器类型, "itemid": 媒体ID, "seasons": {季: {集}}}}}
+        self._index: Dict[Tuple[str, str, str], Dict[str, dict]] = {}
+
+    @staticmethod
+    def __keys(mtype: MediaType, tmdbid=None, tvdbid=None, imdbid=None) -> List[Tuple[str, str, str]]:
+        """
+        生成索引键
+        """
+        keys = []
+        for id_type, mid in (("tmdb", tmdbid), ("tvdb", tvdbid), ("imdb", imdbid)):
+            if mid:
+                keys.append((mtype.value, id_type, str(mid)))
+        return keys
+
+    def __media_keys(self, mediainfo: MediaInfo) -> List[Tuple[str, str, str]]:
+        return self.__keys(mediainfo.type, tmdbid=mediainfo.tmdb_id,
+                           tvdbid=mediainfo.tvdb_id, imdbid=mediainfo.imdb_id)
+
+    def __find(self, mediainfo: MediaInfo) -> Optional[Dict[str, dict]]:
+        """
+        按 tmdbid、tvdbid、imdbid 的顺序查找索引
+        """
+        for key in self.__media_keys(mediainfo):
+            entry = self._index.get(key)
+            if entry:
+                return entry
+        return None
+
+    def rebuild(self):
+        """
+        从媒体服务器同步数据重建索引
+        """
+        server_types = {conf.name: conf.type for conf in ServiceConfigHelper.get_mediaserver_configs()}
+        index: Dict[Tuple[str, str, str], Dict[str, dict]] = {}
+        for item in MediaServerOper().list():
+            mtype = MediaType.TV if item.item_type == "电视剧" else MediaType.MOVIE
+            seasons = {}
+            if mtype == MediaType.TV:
+                seasons = {int(season): set(episodes or [])
+                           for season, episodes in (item.seasoninfo or {}).items()}
+                # 未获取到季集信息的电视剧无法判断缺失集，不纳入索引
+                if not seasons:
+                    continue
+            info = {
+                "server_type": server_types.get(item.server),
+                "itemid": item.item_id,
+                "seasons": seasons
+            }
+            entry = None
+            keys = self.__keys(mtype, tmdbid=item.tmdbid, tvdbid=item.tvdbid, imdbid=item.imdbid)
+            for key in keys:
+                entry = index.get(key)
+                if entry is not None:
+                    break
+            if entry is None:
+                entry = {}
+            # 同一媒体在各ID下共用同一条记录
+            for key in keys:
+                index[key] = entry
+            entry.setdefault(item.server, info)
+        with self._lock:
+            self._index = index
+            self._loaded = True
+        logger.info(f"媒体库存在索引已重建，共 {len(index)} 条")
+
+    def get(self, mediainfo: MediaInfo, server: Optional[str] = None) -> Optional[schemas.ExistMediaInfo]:
+        """
+        从索引中查询媒体是否存在
+        :param mediainfo: 识别的媒体信息
+        :param server: 媒体服务器名称
+        :return: 未命中时返回None
+        """
+        if not self._loaded:
+            self.rebuild()
+        with self._lock:
+            entry = self.__find(mediainfo)
+            if not entry:
+                return None
+            for name, info in entry.items():
+                if server and name != server:
+                    continue
+                return schemas.ExistMediaInfo(
+                    type=mediainfo.type,
+                    seasons={season: sorted(episodes) for season, episodes in info["seasons"].items()}
+                    if mediainfo.type == MediaType.TV else {},
+                    server_type=info.get("server_type"),
+                    server=name,
+                    itemid=info.get("itemid")
+                )
+        return None
+
+    def update(self, mediainfo: MediaInfo, exists: schemas.ExistMediaInfo):
+        """
+        使用媒体服务器的查询结果更新索引
+        """
+        if not exists or not exists.server:
+            return
+        if mediainfo.type == MediaType.TV and not exists.seasons:
+            return
+        info = {
+            "server_type": exists.server_type,
+            "itemid": exists.itemid,
+            "seasons": {int(season): set(episodes or []) for season, episodes in (exists.seasons or {}).items()}
+        }
+        with self._lock:
+            entry = self.__find(mediainfo)
+            if entry is None:
+                entry = {}
+            for key in self.__media_keys(mediainfo):
+                self._index[key] = entry
+            entry[exists.server] = info
+
+    def invalidate(self, mtype: Optional[MediaType] = None, tmdbid=None):
+        """
+        移除索引中的媒体，下次查询时重新从媒体服务器获取
+        """
+        if not tmdbid:
+            return
+        mtypes = [mtype] if mtype else [MediaType.MOVIE, MediaType.TV]
+        with self._lock:
+            for _mtype in mtypes:
+                entry = self._index.pop((_mtype.value, "tmdb", str(tmdbid)), None)
+                if not entry:
+                    continue
+                # 移除该媒体在其它ID下的同一条记录
+                for key in [k for k, v in self._index.items() if v is entry]:
+                    self._index.pop(key, None)
+
+    @eventmanager.register(EventType.TransferComplete, readonly=True)
+    def handle_transfer_complete(self, event: Event):
+        """
+        整理完成后将新入库的剧集补充到索引中，仅补充已在索引中的媒体，避免以不完整的季集判断缺失
+        """
+        if not event or not event.event_data:
+            return
+        mediainfo: MediaInfo = event.event_data.get("mediainfo")
+        meta = event.event_data.get("meta")
+        transferinfo = event.event_data.get("transferinfo")
+        if not mediainfo or not meta or mediainfo.type != MediaType.TV:
+            return
+        if not transferinfo or not transferinfo.success:
+            return
+        episodes = meta.episode_list
+        if not episodes:
+            return
+        season = meta.begin_season or 1
+        with self._lock:
+            entry = self.__find(mediainfo)
+            if not entry:
+                return
+            for info in entry.values():
+                info["seasons"].setdefault(season, set()).update(episodes)
+
+    @eventmanager.register(EventType.WebhookMessage, readonly=True)
+    def handle_webhook(self, event: Event):
+        """
+        媒体服务器入库或删除媒体时移除索引，下次查询时重新获取
+        """
+        if not event or not event.event_data:
+            return
+        event_info: schemas.WebhookEventInfo = event.event_data
+        if not event_info.tmdb_id or not event_info.event:
+            return
+        event_name = event_info.event.lower()
+        if "library" not in event_name and "item" not in event_name:
+            return
+        self.invalidate(tmdbid=event_info.tmdb_id)
@@ -31,7 +31,7 @@ class MemoryHelper(metaclass=Singleton):
         # 保留的快照文件数量
         self._keep_count = settings.MEMORY_SNAPSHOT_KEEP_COUNT
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件，更新内存监控设置
@@ -6,14 +6,16 @@ import queue
 import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Literal, Optional, List, Dict, Union
 from typing import Callable
 
 from cachetools import TTLCache
 from jinja2 import Template
 
-from app.core.config import global_vars
+from app.core.config import global_vars, settings
 from app.core.context import MediaInfo, TorrentInfo
 from app.core.meta import MetaBase
 from app.db.systemconfig_oper import SystemConfigOper
@@ -333,7 +335,7 @@ class TemplateHelper(metaclass=SingletonClass):
         self.cache[cache_key] = context
 
     def render(self,
-               template_content: str,
+               template_content: Union[str, dict],
                template_type: Literal['string', 'dict', 'literal'] = "literal",
                **kwargs) -> Optional[Union[str, dict]]:
         """
@@ -345,25 +347,23 @@ class TemplateHelper(metaclass=SingletonClass):
         :return: 渲染后的结果
         """
         try:
-            # 解析模板字符
-            parsed = self.parse_template_content(template_content, template_type)
-            if not parsed:
+            # 获取编译后的模板
+            compiled = self.get_compiled(template_content, template_type)
+            if compiled is None:
                 raise ValueError("模板解析失败")
 
             context = self.builder.build(**kwargs)
             if not context:
                 raise ValueError("上下文构建失败")
 
-            rendered = self.render_with_context(parsed, context)
+            rendered = self.__render_compiled(compiled, context)
             if not rendered:
                 raise ValueError("模板渲染失败")
 
-            if rendered := rendered if template_type == 'string' else self.__process_formatted_string(rendered):
-                # 缓存上下文
-                self.set_cache_context(rendered, context)
-                # 返回渲染结果
-                return rendered
-            return None
+            # 缓存上下文
+            self.set_cache_context(rendered, context)
+            # 返回渲染结果
+            return rendered
         except Exception as e:
             logger.error(f"模板处理失败: {str(e)}")
             raise ValueError(f"模板处理失败: {str(e)}") from e
@@ -376,98 +376,137 @@ class TemplateHelper(metaclass=SingletonClass):
         context: 渲染用的上下文数据
         """
         # 渲染模板
-        template = Template(template_content)
+        template = TemplateHelper.compile_template(template_content)
         return template.render(context)
 
     @staticmethod
-    def parse_template_content(template_content: Union[str, dict],
-                               template_type: Literal['string', 'dict', 'literal'] = None) -> Optional[str]:
+    @lru_cache(maxsize=256)
+    def compile_template(template_content: str) -> Template:
         """
-        解析模板字符
-        :param template_content 模板格式字符
-        :param template_type 模板字符类型
+        编译 Jinja2 模板，按模板字符串缓存编译结果
+        """
+        return Template(template_content)
+
+    @staticmethod
+    def get_compiled(template_content: Union[str, dict],
+                     template_type: Literal['string', 'dict', 'literal'] = None) -> Optional[Any]:
+        """
+        获取编译后的模板，每个模板只解析和编译一次
+        字典模板按字段分别编译，渲染时直接得到字典，无需再经过字符串与字面量的转换
+        :param template_content: 模板格式字符
+        :param template_type: 模板字符类型
+        :return: 字符串模板返回Template，字典模板返回各字段为Template的字典，解析失败返回None
+        """
+        if isinstance(template_content, dict):
+            source = json.dumps(template_content, sort_keys=True, ensure_ascii=False)
+            return TemplateHelper.__compile_source(source, template_type, True)
+        return TemplateHelper.__compile_source(template_content, template_type, False)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def __compile_source(source: str, template_type: Optional[str], is_json: bool) -> Optional[Any]:
+        """
+        解析并编译模板
+        """
+        try:
+            structure = TemplateHelper.__parse_source(source, template_type, is_json)
+            return TemplateHelper.__compile_structure(structure)
+        except Exception as e:
+            logger.error(f"模板解析失败: {str(e)}")
+            return None
+
+    @staticmethod
+    def __parse_source(source: str, template_type: Optional[str], is_json: bool) -> Any:
         """
+        按模板类型解析模板字符，字典模板返回字典，其它返回字符串
+        :raises ValueError: 模板格式错误
+        """
+
+        def parse_literal(_source: str) -> dict:
+            template_dict = ast.literal_eval(_source)
+            if not isinstance(template_dict, dict):
+                raise ValueError("解析结果必须是一个字典")
+            return template_dict
 
-        def parse_literal(_template_content: str) -> str:
-            """
-            解析Python字面量
-            """
+        if is_json:
+            return json.loads(source)
+        if template_type == 'string':
+            return str(source)
+        if template_type == 'dict':
+            return json.loads(source)
+        if template_type == 'literal':
             try:
-                template_dict = ast.literal_eval(_template_content) if isinstance(_template_content,
-                                                                                  str) else _template_content
-                if not isinstance(template_dict, dict):
-                    raise ValueError("解析结果必须是一个字典")
-                return json.dumps(template_dict, ensure_ascii=False)
+                return parse_literal(source)
             except (ValueError, SyntaxError) as err:
                 raise ValueError(f"无效的Python字面量格式: {str(err)}")
+        # 自动判断模板类型
+        try:
+            structure = json.loads(source)
+            return structure if isinstance(structure, dict) else source
+        except json.JSONDecodeError:
+            try:
+                return parse_literal(source)
+            except (ValueError, SyntaxError):
+                return source
 
+    @staticmethod
+    def parse_template_content(template_content: Union[str, dict],
+                               template_type: Literal['string', 'dict', 'literal'] = None) -> Optional[str]:
+        """
+        解析模板字符，已弃用，渲染请使用 render 或 get_compiled
+        :param template_content 模板格式字符
+        :param template_type 模板字符类型
+        :return: 字典模板返回JSON字符串，其它返回原字符串，解析失败返回None
+        """
         try:
-            if template_type:
-                parse_map = {
-                    'string': lambda x: str(x),
-                    'dict': lambda x: json.dumps(x, ensure_ascii=False),
-                    'literal': parse_literal
-                }
-                return parse_map[template_type](template_content)
-
-            # 自动判断模板类型
             if isinstance(template_content, dict):
-                return json.dumps(template_content, ensure_ascii=False)
-            elif isinstance(template_content, str):
-                try:
-                    json.loads(template_content)
-                    return template_content
-                except json.JSONDecodeError:
-                    try:
-                        return parse_literal(template_content)
-                    except (ValueError, SyntaxError):
-                        return template_content
+                structure = template_content
             else:
-                raise ValueError(f"不支持的模板类型: {type(template_content)}")
-
+                structure = TemplateHelper.__parse_source(template_content, template_type, False)
+            if isinstance(structure, dict):
+                return json.dumps(structure, ensure_ascii=False)
+            return structure
         except Exception as e:
             logger.error(f"模板解析失败: {str(e)}")
             return None
 
     @staticmethod
-    def __process_formatted_string(rendered: str) -> Optional[Union[dict, str]]:
-        """
-        处理格式化字符串
-        保留转义字符
-        """
-
-        def restore_chars(obj: Any) -> Any:
-            """恢复特殊字符"""
-            if isinstance(obj, str):
-                return obj.replace('\\n', '\n').replace('\\r', '\r').replace('\\t', '\t').replace('\\b', '\b').replace(
-                    '\\f', '\f')
-            elif isinstance(obj, dict):
-                return {k: restore_chars(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [restore_chars(item) for item in obj]
-            return obj
-
-            # 定义特殊字符映射
-
-        special_chars = {
-            '\n': '\\n',  # 换行符
-            '\r': '\\r',  # 回车符
-            '\t': '\\t',  # 制表符
-            '\b': '\\b',  # 退格符
-            '\f': '\\f',  # 换页符
-        }
+    def __compile_structure(structure: Any) -> Any:
+        """
+        编译模板结构中的所有字符串
+        """
+        if isinstance(structure, str):
+            return TemplateHelper.compile_template(structure)
+        if isinstance(structure, dict):
+            # 键中包含模板语法时同样编译，与值一起渲染
+            return {TemplateHelper.__compile_key(key): TemplateHelper.__compile_structure(value)
+                    for key, value in structure.items()}
+        if isinstance(structure, list):
+            return [TemplateHelper.__compile_structure(value) for value in structure]
+        return structure
 
-        # 处理特殊字符
-        processed = rendered
-        for char, escape in special_chars.items():
-            processed = processed.replace(char, escape)
+    @staticmethod
+    def __compile_key(key: Any) -> Any:
+        """
+        编译字典键，不含模板语法的键保持原样
+        """
+        if isinstance(key, str) and ("{{" in key or "{%" in key):
+            return TemplateHelper.compile_template(key)
+        return key
 
-        # 尝试解析为JSON
-        try:
-            rendered_dict = json.loads(processed)
-            return restore_chars(rendered_dict)
-        except json.JSONDecodeError:
-            return rendered
+    @staticmethod
+    def __render_compiled(compiled: Any, context: dict) -> Any:
+        """
+        使用上下文渲染编译后的模板结构
+        """
+        if isinstance(compiled, Template):
+            return compiled.render(context)
+        if isinstance(compiled, dict):
+            return {TemplateHelper.__render_compiled(key, context): TemplateHelper.__render_compiled(value, context)
+                    for key, value in compiled.items()}
+        if isinstance(compiled, list):
+            return [TemplateHelper.__render_compiled(value, context) for value in compiled]
+        return compiled
 
 
 class MessageTemplateHelper:
@@ -540,6 +579,12 @@ class MessageQueueManager(metaclass=SingletonClass):
     """
 
     schedule_periods: List[tuple[int, int, int, int]] = []
+    # 同一通知服务两次发送的最小间隔（秒）
+    _channel_interval = 1.0
+    # 单条摘要最多合并的消息数
+    _digest_max_count = 20
+    # 停止时等待发送完成的最长时间（秒），超时后放弃未发送的消息
+    _stop_timeout = 10
 
     def __init__(
             self,
@@ -558,6 +603,16 @@ class MessageQueueManager(metaclass=SingletonClass):
         self.send_callback = send_callback
         self.check_interval = check_interval
 
+        # 各通知服务的发送线程，同一服务按顺序发送，不同服务并行
+        self._channel_workers: Dict[str, ThreadPoolExecutor] = {}
+        # 各通知服务上次发送时间
+        self._channel_last_sent: Dict[str, float] = {}
+        # 等待合并的消息 {合并键: [Notification]}
+        self._digest_groups: Dict[tuple, List[Notification]] = {}
+        self._dispatch_lock = threading.Lock()
+        # 尚未完成的发送任务
+        self._pending: set = set()
+
         self._running = True
         self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.thread.start()
@@ -646,8 +701,10 @@ class MessageQueueManager(metaclass=SingletonClass):
         发送消息（立即发送或加入队列）
         """
         immediately = kwargs.pop("immediately", False)
-        if immediately or self._is_in_scheduled_time(datetime.now()):
-            self._send(*args, **kwargs)
+        if immediately:
+            self._submit(*args, **kwargs)
+        elif self._is_in_scheduled_time(datetime.now()):
+            self._dispatch(*args, **kwargs)
         else:
             self.queue.put({
                 "args": args,
@@ -666,6 +723,142 @@ class MessageQueueManager(metaclass=SingletonClass):
             except Exception as e:
                 logger.error(f"发送消息错误：{str(e)}")
 
+    @staticmethod
+    def _resolve_services(method: str, kwargs: dict) -> List[tuple]:
+        """
+        将消息按实际发送的通知服务拆分，返回 [(发送线程键, 参数)]
+        未指定来源的广播消息按已启用的通知服务分别发送，以便各服务并行；
+        有插件接管该方法时不拆分，避免插件重复收到同一条消息
+        """
+        message = kwargs.get("message")
+        if not isinstance(message, Notification):
+            return [("default", kwargs)]
+        if message.source:
+            return [(message.source, kwargs)]
+        from app.core.plugin import PluginManager
+        from app.helper.service import ServiceConfigHelper
+        if any(method in (module_dict or {}) for module_dict in PluginManager().get_plugin_modules().values()):
+            return [(message.channel.value if message.channel else "broadcast", kwargs)]
+        services = []
+        for conf in ServiceConfigHelper.get_notification_configs():
+            if not conf.enabled or not conf.name:
+                continue
+            if message.channel and (conf.type or "").lower() != message.channel.name.lower():
+                continue
+            service_message = message.copy()
+            service_message.source = conf.name
+            services.append((conf.name, {**kwargs, "message": service_message}))
+        return services or [(message.channel.value if message.channel else "broadcast", kwargs)]
+
+    @staticmethod
+    def _digest_key(args: tuple, kwargs: dict) -> Optional[tuple]:
+        """
+        可合并消息的合并键，发给同一用户的同类通知合并为一条摘要；交互类消息不合并
+        """
+        if args != ("post_message",) or set(kwargs.keys()) != {"message"}:
+            return None
+        message = kwargs.get("message")
+        if not isinstance(message, Notification):
+            return None
+        if message.userid or message.buttons or message.original_message_id:
+            return None
+        return (message.channel, message.source, message.mtype, message.username,
+                json.dumps(message.targets, sort_keys=True, ensure_ascii=False, default=str))
+
+    def _dispatch(self, *args, **kwargs) -> None:
+        """
+        分发消息，可合并的消息在合并窗口内汇总后再发送
+        """
+        window = settings.MESSAGE_DIGEST_WINDOW
+        key = self._digest_key(args, kwargs) if window and window > 0 else None
+        if not key:
+            self._submit(*args, **kwargs)
+            return
+        with self._dispatch_lock:
+            group = self._digest_groups.get(key)
+            if group is None:
+                group = self._digest_groups[key] = []
+                timer = threading.Timer(window, self._flush_digest, args=(key,))
+                timer.daemon = True
+                timer.start()
+            group.append(kwargs["message"])
+            full = len(group) >= self._digest_max_count
+        if full:
+            self._flush_digest(key)
+
+    def _flush_digest(self, key: tuple) -> None:
+        """
+        发送合并后的消息，保留每条消息的标题、内容及链接
+        """
+        with self._dispatch_lock:
+            messages = self._digest_groups.pop(key, None)
+        if not messages:
+            return
+        if len(messages) == 1:
+            self._submit("post_message", message=messages[0])
+            return
+        first = messages[0]
+        digest = first.copy()
+        digest.title = f"{first.title or first.text} 等 {len(messages)} 条消息"
+        links = {m.link for m in messages}
+        images = {m.image for m in messages}
+        # 各消息的链接或图片不同时不使用第一条消息的，链接附在各条消息后
+        digest.link = first.link if len(links) == 1 else None
+        digest.image = first.image if len(images) == 1 else None
+        items = []
+        for i, m in enumerate(messages, start=1):
+            lines = [f"{i}. {m.title}" if m.title else f"{i}."]
+            if m.text:
+                lines.append(m.text)
+            if m.link and not digest.link:
+                lines.append(m.link)
+            items.append("\n".join(lines))
+        digest.text = "\n\n".join(items)
+        logger.info(f"已合并 {len(messages)} 条消息：{first.mtype.value if first.mtype else ''}")
+        self._submit("post_message", message=digest)
+
+    def _submit(self, *args, **kwargs) -> None:
+        """
+        提交到所属通知服务的发送线程，同一服务按顺序发送，不同服务并行
+        """
+        method = args[0] if args else ""
+        for service, service_kwargs in self._resolve_services(method, kwargs):
+            with self._dispatch_lock:
+                worker = self._channel_workers.get(service)
+                if not worker:
+                    worker = self._channel_workers[service] = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix=f"message-{service}")
+            future = worker.submit(self._send_limited, service, args, service_kwargs)
+            with self._dispatch_lock:
+                self._pending.add(future)
+            future.add_done_callback(self.__discard_pending)
+
+    def __discard_pending(self, future: Future) -> None:
+        with self._dispatch_lock:
+            self._pending.discard(future)
+
+    def _send_limited(self, service: str, args: tuple, kwargs: dict) -> None:
+        """
+        按通知服务限速发送
+        """
+        wait_time = self._channel_last_sent.get(service, 0) + self._channel_interval - time.time()
+        # 停止时不再限速，尽快发送剩余消息
+        if wait_time > 0 and self._running:
+            time.sleep(wait_time)
+        try:
+            self._send(*args, **kwargs)
+        finally:
+            self._channel_last_sent[service] = time.time()
+
+    def _flush_all(self) -> None:
+        """
+        发送所有等待合并的消息
+        """
+        with self._dispatch_lock:
+            keys = list(self._digest_groups.keys())
+        for key in keys:
+            self._flush_digest(key)
+
     def _monitor_loop(self) -> None:
         """
         后台线程循环检查时间并处理队列
@@ -680,7 +873,7 @@ class MessageQueueManager(metaclass=SingletonClass):
                         break
                     try:
                         message = self.queue.get_nowait()
-                        self._send(*message['args'], **message['kwargs'])
+                        self._dispatch(*message['args'], **message['kwargs'])
                         logger.info(f"队列剩余消息：{self.queue.qsize()}")
                     except queue.Empty:
                         break
@@ -688,10 +881,19 @@ class MessageQueueManager(metaclass=SingletonClass):
 
     def stop(self) -> None:
         """
-        停止队列管理器
+        停止队列管理器，发送等待合并的消息，并在时限内等待已提交的消息发送完成，超时后放弃剩余消息
         """
         self._running = False
-        self.thread.join()
+        self._flush_all()
+        with self._dispatch_lock:
+            pending = set(self._pending)
+            workers = list(self._channel_workers.values())
+        if pending:
+            _, not_done = wait(pending, timeout=self._stop_timeout)
+            if not_done:
+                logger.warn(f"消息发送超时，放弃 {len(not_done)} 条未发送的消息")
+        for worker in workers:
+            worker.shutdown(wait=False, cancel_futures=True)
 
 
 class MessageHelper(metaclass=Singleton):
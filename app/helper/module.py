@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import importlib
 import pkgutil
+import sys
 import traceback
 from pathlib import Path
 from typing import List, Any, Callable
@@ -23,11 +24,13 @@ class ModuleHelper:
     """
 
     @classmethod
-    def load(cls, package_path: str, filter_func: FilterFuncType = _default_filter) -> List[Any]:
+    def load(cls, package_path: str, filter_func: FilterFuncType = _default_filter,
+             reload: bool = False) -> List[Any]:
         """
         导入模块
         :param package_path: 父包名
         :param filter_func: 子模块过滤函数，入参为模块名和模块对象，返回True则导入，否则不导入
+        :param reload: 是否重新加载已导入的模块，未导入过的模块只导入一次
         :return: 导入的模块对象列表
         """
 
@@ -39,8 +42,10 @@ class ModuleHelper:
                 if package_name.startswith('_'):
                     continue
                 full_package_name = f'{package_path}.{package_name}'
-                module = importlib.import_module(full_package_name)
-                importlib.reload(module)
+                if reload and full_package_name in sys.modules:
+                    module = importlib.reload(sys.modules[full_package_name])
+                else:
+                    module = importlib.import_module(full_package_name)
                 for name, obj in module.__dict__.items():
                     if name.startswith('_'):
                         continue
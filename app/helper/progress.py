@@ -1,19 +1,99 @@
+import asyncio
+import threading
 from enum import Enum
-from typing import Union, Dict, Optional
+from typing import Union, Dict, Optional, Set
 
 from app.schemas.types import ProgressKey
 from app.utils.singleton import Singleton
 
 
+class ProgressSubscriber:
+    """
+    进度订阅者，进度变化时唤醒等待中的协程，多次变化合并为一次唤醒
+    """
+
+    def __init__(self, key: str, loop: asyncio.AbstractEventLoop):
+        self.key = key
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._pending = False
+
+    def notify(self):
+        """
+        通知进度变化，可在任意线程中调用
+        """
+        if self._pending:
+            return
+        self._pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待进度变化
+        :param timeout: 超时时间（秒）
+        :return: 是否有变化，超时返回False
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        self._pending = False
+        return True
+
+
 class ProgressHelper(metaclass=Singleton):
     _process_detail: Dict[str, dict] = {}
+    # 同一进度两次推送的最小间隔（秒）
+    min_interval = 0.2
 
     def __init__(self):
         self._process_detail = {}
+        self._subscribers: Dict[str, Set[ProgressSubscriber]] = {}
+        self._lock = threading.Lock()
 
     def init_config(self):
         pass
 
+    def subscribe(self, key: Union[ProgressKey, str]) -> ProgressSubscriber:
+        """
+        订阅进度变化，需在事件循环中调用
+        """
+        if isinstance(key, Enum):
+            key = key.value
+        subscriber = ProgressSubscriber(key, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: ProgressSubscriber):
+        """
+        取消订阅
+        """
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.key)
+            if not subscribers:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                self._subscribers.pop(subscriber.key, None)
+
+    def __publish(self, key: str):
+        """
+        通知该进度的订阅者，没有订阅者时不做任何处理
+        """
+        subscribers = self._subscribers.get(key)
+        if not subscribers:
+            return
+        with self._lock:
+            subscribers = list(subscribers)
+        for subscriber in subscribers:
+            subscriber.notify()
+
     def __reset(self, key: Union[ProgressKey, str]):
         if isinstance(key, Enum):
             key = key.value
@@ -28,6 +108,7 @@ class ProgressHelper(metaclass=Singleton):
         if isinstance(key, Enum):
             key = key.value
         self._process_detail[key]['enable'] = True
+        self.__publish(key)
 
     def end(self, key: Union[ProgressKey, str]):
         if isinstance(key, Enum):
@@ -39,18 +120,36 @@ class ProgressHelper(metaclass=Singleton):
             "value": 100,
             "text": "正在处理..."
         }
+        self.__publish(key)
 
     def update(self, key: Union[ProgressKey, str], value: Union[float, int] = None, text: Optional[str] = None):
         if isinstance(key, Enum):
             key = key.value
-        if not self._process_detail.get(key, {}).get('enable'):
+        detail = self._process_detail.get(key)
+        if not detail or not detail.get('enable'):
             return
-        if value:
-            self._process_detail[key]['value'] = value
-        if text:
-            self._process_detail[key]['text'] = text
+        changed = False
+        if value and detail['value'] != value:
+            detail['value'] = value
+            changed = True
+        if text and detail['text'] != text:
+            detail['text'] = text
+            changed = True
+        if changed:
+            self.__publish(key)
 
     def get(self, key: Union[ProgressKey, str]) -> dict:
         if isinstance(key, Enum):
             key = key.value
         return self._process_detail.get(key)
+
+    @staticmethod
+    def delta(old: Optional[dict], new: Optional[dict]) -> dict:
+        """
+        计算两次进度之间变化的字段
+        """
+        if not new:
+            return {}
+        if not old:
+            return dict(new)
+        return {k: v for k, v in new.items() if old.get(k) != v}
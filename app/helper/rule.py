@@ -16,7 +16,7 @@ class RuleHelper:
         """
         获取用户所有规则组
         """
-        rule_groups: List[dict] = SystemConfigOper().get(SystemConfigKey.UserFilterRuleGroups)
+        rule_groups: List[dict] = SystemConfigOper().get_snapshot(SystemConfigKey.UserFilterRuleGroups)
         if not rule_groups:
             return []
         return [FilterRuleGroup(**group) for group in rule_groups]
@@ -53,7 +53,7 @@ class RuleHelper:
         """
         获取用户所有自定义规则
         """
-        rules: List[dict] = SystemConfigOper().get(SystemConfigKey.CustomFilterRules)
+        rules: List[dict] = SystemConfigOper().get_snapshot(SystemConfigKey.CustomFilterRules)
         if not rules:
             return []
         return [CustomRule(**rule) for rule in rules]
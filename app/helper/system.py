@@ -20,7 +20,7 @@ class SystemHelper:
 
     __system_flag_file = "/var/log/nginx/__moviepilot__"
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件，更新日志设置
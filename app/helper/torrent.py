@@ -197,7 +197,7 @@ class TorrentHelper(metaclass=Singleton):
             return []
 
         # 下载规则
-        priority_rule: List[str] = SystemConfigOper().get(
+        priority_rule: List[str] = SystemConfigOper().get_snapshot(
             SystemConfigKey.TorrentsPriority) or ["torrent", "upload", "seeder"]
         # 站点上传量
         site_uploads = {
@@ -1,6 +1,10 @@
 from abc import abstractmethod, ABCMeta
 from typing import Generic, Tuple, Union, TypeVar, Type, Dict, Optional, Callable
 
+from cachetools import TTLCache
+
+from app.core.meta import MetaBase
+from app.core.metainfo import MetaInfo
 from app.helper.service import ServiceConfigHelper
 from app.schemas import Notification, NotificationConf, MediaServerConf, DownloaderConf
 from app.schemas.types import ModuleType, DownloaderType, MediaServerType, MessageChannel, StorageSchema, \
@@ -231,6 +235,21 @@ class _DownloaderBase(ServiceBase[TService, DownloaderConf]):
         """
         super().__init__()
         self._default_config_name: Optional[str] = None
+        # 种子名称识别缓存，按种子Hash缓存，种子名称变化时重新识别
+        self._torrent_metas = TTLCache(maxsize=2000, ttl=24 * 3600)
+
+    def get_torrent_meta(self, torrent_hash: str, title: str) -> MetaBase:
+        """
+        识别下载中种子的名称，同一种子只识别一次
+        :param torrent_hash: 种子Hash
+        :param title: 种子名称
+        """
+        cached = self._torrent_metas.get(torrent_hash)
+        if cached and cached[0] == title:
+            return cached[1]
+        meta = MetaInfo(title)
+        self._torrent_metas[torrent_hash] = (title, meta)
+        return meta
 
     def get_default_config_name(self) -> Optional[str]:
         """
@@ -18,7 +18,7 @@ class EmbyModule(_ModuleBase, _MediaServerBase[Emby]):
         super().init_service(service_name=Emby.__name__.lower(),
                              service_type=lambda conf: Emby(**conf.config, sync_libraries=conf.sync_libraries))
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
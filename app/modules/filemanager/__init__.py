@@ -1,3 +1,5 @@
+import importlib
+import threading
 from pathlib import Path
 from typing import Optional, List, Tuple, Union, Dict, Callable
 
@@ -7,13 +9,12 @@ from app.core.meta import MetaBase
 from app.core.metainfo import MetaInfo
 from app.helper.directory import DirectoryHelper
 from app.helper.message import MessageHelper
-from app.helper.module import ModuleHelper
 from app.log import logger
 from app.modules import _ModuleBase
 from app.modules.filemanager.storages import StorageBase
 from app.modules.filemanager.transhandler import TransHandler
 from app.schemas import TransferInfo, ExistMediaInfo, TmdbEpisode, TransferDirectoryConf, FileItem, StorageUsage
-from app.schemas.types import MediaType, ModuleType, OtherModulesType
+from app.schemas.types import MediaType, ModuleType, OtherModulesType, StorageSchema
 from app.utils.system import SystemUtils
 
 
@@ -29,13 +30,13 @@ class FileManagerModule(_ModuleBase):
         super().__init__()
         self.directoryhelper = DirectoryHelper()
         self.messagehelper = MessageHelper()
+        self._storage_lock = threading.Lock()
 
     def init_module(self) -> None:
-        # 加载模块
-        self._storage_schemas = ModuleHelper.load('app.modules.filemanager.storages',
-                                                  filter_func=lambda _, obj: hasattr(obj, 'schema') and obj.schema)
+        # 存储模块在首次使用时才加载
+        self._storage_schemas = []
         # 获取存储类型
-        self._support_storages = [storage.schema.value for storage in self._storage_schemas]
+        self._support_storages = [schema.value for schema in StorageSchema]
 
     @staticmethod
     def get_name() -> str:
@@ -63,7 +64,14 @@ class FileManagerModule(_ModuleBase):
         return 4
 
     def stop(self):
-        pass
+        """
+        停止各存储的后台服务
+        """
+        for storage_schema in self._storage_schemas or []:
+            try:
+                storage_schema.stop()
+            except Exception as e:
+                logger.error(f"停止存储 {storage_schema.schema.value} 出错：{str(e)}")
 
     def test(self) -> Tuple[bool, str]:
         """
@@ -107,11 +115,35 @@ class FileManagerModule(_ModuleBase):
         """
         获取存储操作对象
         """
+        storage_schema = self.__load_storage(_storage)
+        if storage_schema and (not _func or hasattr(storage_schema, _func)):
+            return storage_schema()
+        return None
+
+    def __load_storage(self, _storage: str) -> Optional[type]:
+        """
+        按存储类型加载存储模块，每个存储模块只导入一次
+        """
+        if _storage not in self._support_storages:
+            return None
         for storage_schema in self._storage_schemas:
-            if storage_schema.schema \
-                    and storage_schema.schema.value == _storage \
-                    and (not _func or hasattr(storage_schema, _func)):
-                return storage_schema()
+            if storage_schema.schema.value == _storage:
+                return storage_schema
+        with self._storage_lock:
+            for storage_schema in self._storage_schemas:
+                if storage_schema.schema.value == _storage:
+                    return storage_schema
+            try:
+                module = importlib.import_module(f"app.modules.filemanager.storages.{_storage}")
+            except Exception as err:
+                logger.error(f"加载存储模块 {_storage} 失败：{str(err)}")
+                return None
+            for name, obj in module.__dict__.items():
+                if name.startswith('_') or not isinstance(obj, type):
+                    continue
+                if issubclass(obj, StorageBase) and obj.schema and obj.schema.value == _storage:
+                    self._storage_schemas = self._storage_schemas + [obj]
+                    return obj
         return None
 
     def init_setting(self) -> Tuple[str, Union[str, bool]]:
@@ -344,9 +376,13 @@ class FileManagerModule(_ModuleBase):
             return None
         return storage_oper.get_parent(fileitem)
 
-    def snapshot_storage(self, storage: str, path: Path) -> Optional[Dict[str, float]]:
+    def snapshot_storage(self, storage: str, path: Path,
+                         last_snapshot: Optional[Dict[str, dict]] = None) -> Optional[Dict[str, dict]]:
         """
         快照存储
+        :param storage: 存储类型
+        :param path: 快照目录
+        :param last_snapshot: 上一次的快照，用于跳过未变化的目录
         """
         if storage not in self._support_storages:
             return None
@@ -354,7 +390,7 @@ class FileManagerModule(_ModuleBase):
         if not storage_oper:
             logger.error(f"不支持 {storage} 的快照处理")
             return None
-        return storage_oper.snapshot(path)
+        return storage_oper.snapshot(path, last_snapshot=last_snapshot)
 
     def storage_usage(self, storage: str) -> Optional[StorageUsage]:
         """
@@ -1,6 +1,9 @@
+import threading
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Tuple, Union
+
+from cachetools import TTLCache
 
 from app import schemas
 from app.helper.storage import StorageHelper
@@ -13,8 +16,18 @@ class StorageBase(metaclass=ABCMeta):
     schema = None
     transtype = {}
 
+    # 路径缓存有效期（秒）
+    _item_cache_ttl = 600
+    # 不存在路径的缓存有效期（秒）
+    _miss_cache_ttl = 60
+
     def __init__(self):
         self.storagehelper = StorageHelper()
+        # 路径 -> 文件项缓存
+        self._item_cache = TTLCache(maxsize=4096, ttl=self._item_cache_ttl)
+        # 不存在的路径缓存
+        self._miss_cache = TTLCache(maxsize=1024, ttl=self._miss_cache_ttl)
+        self._item_cache_lock = threading.Lock()
 
     @abstractmethod
     def init_storage(self):
@@ -23,6 +36,13 @@ class StorageBase(metaclass=ABCMeta):
         """
         pass
 
+    @classmethod
+    def stop(cls):
+        """
+        停止存储相关的后台服务，后台服务由同类存储共用，无需创建实例
+        """
+        pass
+
     def generate_qrcode(self, *args, **kwargs) -> Optional[Tuple[dict, str]]:
         pass
 
@@ -68,6 +88,62 @@ class StorageBase(metaclass=ABCMeta):
         self.storagehelper.reset_storage(self.schema.value)
         self.init_storage()
 
+    @staticmethod
+    def __cache_key(path: Union[Path, str], drive_id: Optional[str] = None) -> str:
+        """
+        生成路径缓存键
+        """
+        key = Path(path).as_posix().rstrip("/") or "/"
+        return f"{drive_id}:{key}" if drive_id else key
+
+    def _get_cached_item(self, path: Union[Path, str],
+                         drive_id: Optional[str] = None) -> Tuple[bool, Optional[schemas.FileItem]]:
+        """
+        从缓存中获取文件项
+        :return: (是否命中缓存, 文件项)，命中不存在路径的缓存时文件项为None
+        """
+        key = self.__cache_key(path, drive_id)
+        with self._item_cache_lock:
+            fileitem = self._item_cache.get(key)
+            if fileitem:
+                return True, fileitem.copy()
+            if key in self._miss_cache:
+                return True, None
+        return False, None
+
+    def _set_cached_item(self, path: Union[Path, str], fileitem: Optional[schemas.FileItem],
+                         drive_id: Optional[str] = None):
+        """
+        缓存文件项，文件项为空时记录为不存在的路径
+        """
+        key = self.__cache_key(path, drive_id)
+        with self._item_cache_lock:
+            if fileitem:
+                self._item_cache[key] = fileitem.copy()
+                self._miss_cache.pop(key, None)
+            else:
+                self._miss_cache[key] = True
+                self._item_cache.pop(key, None)
+
+    def _invalidate_cached_item(self, *paths: Union[Path, str], drive_id: Optional[str] = None):
+        """
+        失效指定路径及其所有下级路径的缓存，上级目录的修改时间也会变化，一并失效（不含其它下级）；
+        同时清空不存在路径的缓存
+        """
+        keys = [self.__cache_key(path, drive_id) for path in paths if path]
+        with self._item_cache_lock:
+            # 新建、移动等操作都可能使任意一个不存在的路径变为存在，直接全部清空
+            self._miss_cache.clear()
+            if not keys:
+                return
+            for path in paths:
+                if path:
+                    self._item_cache.pop(self.__cache_key(Path(path).parent, drive_id), None)
+            prefixes = tuple(key.rstrip("/") + "/" for key in keys)
+            for cached_key in list(self._item_cache.keys()):
+                if cached_key in keys or cached_key.startswith(prefixes):
+                    self._item_cache.pop(cached_key, None)
+
     @abstractmethod
     def check(self) -> bool:
         """
@@ -192,26 +268,77 @@ class StorageBase(metaclass=ABCMeta):
         """
         pass
 
-    def snapshot(self, path: Path) -> Dict[str, float]:
+    def refresh_snapshot_files(self, files: Dict[str, dict]) -> Dict[str, dict]:
         """
-        快照文件系统，输出所有层级文件信息（不含目录）
+        复用上次快照的文件列表时刷新文件信息，默认原样返回
+        目录修改时间只随直接子项的增删改名变化，原地覆盖写入文件不会改变，逐个获取文件信息开销较大的存储无法发现此类修改
+        :param files: 上次快照的文件信息 {文件路径: {"size": 大小, "modify_time": 修改时间}}
+        :return: 无变化时返回原对象
         """
-        files_info = {}
+        return files
 
-        def __snapshot_file(_fileitm: schemas.FileItem):
+    def snapshot(self, path: Path, last_snapshot: Optional[Dict[str, dict]] = None) -> Dict[str, dict]:
+        """
+        快照文件系统，按目录输出所有层级的文件信息
+        :param path: 快照根目录
+        :param last_snapshot: 上一次的快照，目录修改时间未变化时直接复用其文件列表，不再重新浏览该目录；
+            复用时通过 refresh_snapshot_files 刷新文件信息，未重写该方法的存储无法发现原地覆盖写入的文件
+        :return: {目录路径: {"modify_time": 目录修改时间, "files": {文件路径: {"size": 大小, "modify_time": 修改时间}}, "dirs": [子目录路径]}}
+        """
+        snapshot = {}
+        last_snapshot = last_snapshot or {}
+        # 快照需要最新的目录修改时间，不能使用路径缓存
+        self._invalidate_cached_item(path)
+
+        def __file_info(_fileitem: schemas.FileItem) -> dict:
+            return {
+                "size": _fileitem.size,
+                "modify_time": _fileitem.modify_time
+            }
+
+        def __snapshot_dir(_diritem: schemas.FileItem):
             """
-            递归获取文件信息
+            递归获取目录下的文件信息
             """
-            if _fileitm.type == "dir":
-                for sub_file in self.list(_fileitm):
-                    __snapshot_file(sub_file)
-            else:
-                files_info[_fileitm.path] = _fileitm.size
+            last_dir = last_snapshot.get(_diritem.path)
+            if last_dir and _diritem.modify_time \
+                    and last_dir.get("modify_time") == _diritem.modify_time:
+                # 目录修改时间未变化，说明直接子项未增删，复用上次的文件列表；子目录内部的变化不会反映到父目录，仍需逐个检查
+                last_files = last_dir.get("files") or {}
+                files = self.refresh_snapshot_files(last_files)
+                snapshot[_diritem.path] = last_dir if files is last_files else {**last_dir, "files": files}
+                for sub_dir in last_dir.get("dirs") or []:
+                    sub_item = self.get_item(Path(sub_dir))
+                    if sub_item and sub_item.type == "dir":
+                        __snapshot_dir(sub_item)
+                return
+            files, dirs = {}, []
+            sub_items = []
+            for sub_item in self.list(_diritem):
+                if sub_item.type == "dir":
+                    dirs.append(sub_item.path)
+                    sub_items.append(sub_item)
+                else:
+                    files[sub_item.path] = __file_info(sub_item)
+            snapshot[_diritem.path] = {
+                "modify_time": _diritem.modify_time,
+                "files": files,
+                "dirs": dirs
+            }
+            for sub_item in sub_items:
+                __snapshot_dir(sub_item)
 
         fileitem = self.get_item(path)
         if not fileitem:
             return {}
 
-        __snapshot_file(fileitem)
+        if fileitem.type == "dir":
+            __snapshot_dir(fileitem)
+        else:
+            snapshot[fileitem.path] = {
+                "modify_time": None,
+                "files": {fileitem.path: __file_info(fileitem)},
+                "dirs": []
+            }
 
-        return files_info
+        return snapshot
@@ -276,6 +276,17 @@ class AliPan(StorageBase, metaclass=Singleton):
             return ret_data.get(result_key)
         return ret_data
 
+    def __cache_drive_id(self, drive_id: Optional[str]) -> Optional[str]:
+        """
+        路径缓存使用的存储桶ID，默认存储桶不区分
+        """
+        if not drive_id:
+            return None
+        try:
+            return None if drive_id == self._default_drive_id else drive_id
+        except NoCheckInException:
+            return drive_id
+
     def __get_fileitem(self, fileinfo: dict, parent: str = "/") -> schemas.FileItem:
         """
         获取文件信息
@@ -369,7 +380,9 @@ class AliPan(StorageBase, metaclass=Singleton):
                 break
             next_marker = resp.get("next_marker")
             for item in resp.get("items", []):
-                items.append(self.__get_fileitem(item, parent=fileitem.path))
+                sub_item = self.__get_fileitem(item, parent=fileitem.path)
+                self._set_cached_item(sub_item.path, sub_item, drive_id=self.__cache_drive_id(sub_item.drive_id))
+                items.append(sub_item)
             if len(resp.get("items")) < 100:
                 break
         return items
@@ -380,6 +393,8 @@ class AliPan(StorageBase, metaclass=Singleton):
         """
         for _ in range(2):
             time.sleep(2)
+            # 刚上传或移动的文件，不使用之前的缓存结果
+            self._invalidate_cached_item(path)
             fileitem = self.get_item(path)
             if fileitem:
                 return fileitem
@@ -389,6 +404,8 @@ class AliPan(StorageBase, metaclass=Singleton):
         """
         创建目录
         """
+        new_path = Path(parent_item.path) / name
+        self._invalidate_cached_item(new_path, drive_id=self.__cache_drive_id(parent_item.drive_id))
         resp = self._request_api(
             "POST",
             "/adrive/v1.0/openFile/create",
@@ -405,7 +422,6 @@ class AliPan(StorageBase, metaclass=Singleton):
             logger.warn(f"【阿里云盘】创建目录失败: {resp.get('message')}")
             return None
         # 缓存新目录
-        new_path = Path(parent_item.path) / name
         return self._delay_get_item(new_path)
 
     @staticmethod
@@ -615,6 +631,7 @@ class AliPan(StorageBase, metaclass=Singleton):
         target_name = new_name or local_path.name
         target_path = Path(target_dir.path) / target_name
         file_size = local_path.stat().st_size
+        self._invalidate_cached_item(target_path, drive_id=self.__cache_drive_id(target_dir.drive_id))
 
         # 1. 创建文件并检查秒传
         chunk_size = 100 * 1024 * 1024  # 分片大小 100M
@@ -753,6 +770,7 @@ class AliPan(StorageBase, metaclass=Singleton):
                     "file_id": fileitem.fileid
                 }
             )
+            self._invalidate_cached_item(fileitem.path, drive_id=self.__cache_drive_id(fileitem.drive_id))
             return True
         except requests.exceptions.HTTPError:
             return False
@@ -775,6 +793,7 @@ class AliPan(StorageBase, metaclass=Singleton):
         if resp.get("code"):
             logger.warn(f"【阿里云盘】重命名失败: {resp.get('message')}")
             return False
+        self._invalidate_cached_item(fileitem.path, drive_id=self.__cache_drive_id(fileitem.drive_id))
         return True
 
     def get_item(self, path: Path, drive_id: str = None) -> Optional[schemas.FileItem]:
@@ -782,6 +801,10 @@ class AliPan(StorageBase, metaclass=Singleton):
         获取指定路径的文件/目录项
         """
         try:
+            cache_drive_id = self.__cache_drive_id(drive_id)
+            hit, fileitem = self._get_cached_item(path, drive_id=cache_drive_id)
+            if hit:
+                return fileitem
             resp = self._request_api(
                 "POST",
                 "/adrive/v1.0/openFile/get_by_path",
@@ -794,8 +817,11 @@ class AliPan(StorageBase, metaclass=Singleton):
                 return None
             if resp.get("code"):
                 logger.debug(f"【阿里云盘】获取文件信息失败: {resp.get('message')}")
+                self._set_cached_item(path, None, drive_id=cache_drive_id)
                 return None
-            return self.__get_fileitem(resp, parent=str(path.parent))
+            fileitem = self.__get_fileitem(resp, parent=str(path.parent))
+            self._set_cached_item(path, fileitem, drive_id=cache_drive_id)
+            return fileitem
         except Exception as e:
             logger.debug(f"【阿里云盘】获取文件信息失败: {str(e)}")
             return None
@@ -804,27 +830,15 @@ class AliPan(StorageBase, metaclass=Singleton):
         """
         获取指定路径的文件夹，如不存在则创建
         """
-
-        def __find_dir(_fileitem: schemas.FileItem, _name: str) -> Optional[schemas.FileItem]:
-            """
-            查找下级目录中匹配名称的目录
-            """
-            for sub_folder in self.list(_fileitem):
-                if sub_folder.type != "dir":
-                    continue
-                if sub_folder.name == _name:
-                    return sub_folder
-            return None
-
         # 是否已存在
         folder = self.get_item(path)
         if folder:
             return folder
-        # 逐级查找和创建目录
+        # 逐级查找和创建目录，按路径直接查询（优先命中缓存），不再浏览上级目录
         fileitem = schemas.FileItem(storage=self.schema.value, path="/", drive_id=self._default_drive_id)
         for part in path.parts[1:]:
-            dir_file = __find_dir(fileitem, part)
-            if dir_file:
+            dir_file = self.get_item(Path(fileitem.path) / part)
+            if dir_file and dir_file.type == "dir":
                 fileitem = dir_file
             else:
                 dir_file = self.create_folder(fileitem, part)
@@ -868,6 +882,7 @@ class AliPan(StorageBase, metaclass=Singleton):
             return False
         # 重命名
         new_path = Path(path) / fileitem.name
+        self._invalidate_cached_item(new_path, drive_id=self.__cache_drive_id(fileitem.drive_id))
         new_file = self._delay_get_item(new_path)
         self.rename(new_file, new_name)
         return True
@@ -900,6 +915,8 @@ class AliPan(StorageBase, metaclass=Singleton):
         if resp.get("code"):
             logger.warn(f"【阿里云盘】移动文件失败: {resp.get('message')}")
             return False
+        self._invalidate_cached_item(fileitem.path, Path(path) / new_name,
+                                     drive_id=self.__cache_drive_id(fileitem.drive_id))
         return True
 
     def link(self, fileitem: schemas.FileItem, target_file: Path) -> bool:
@@ -1,7 +1,7 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List
 
 import requests
 from requests import Response
@@ -216,7 +216,7 @@ class Alist(StorageBase, metaclass=Singleton):
             )
             return []
 
-        return [
+        items = [
             schemas.FileItem(
                 storage=self.schema.value,
                 type="dir" if item["is_dir"] else "file",
@@ -230,6 +230,11 @@ class Alist(StorageBase, metaclass=Singleton):
             )
             for item in result["data"]["content"] or []
         ]
+        if not password:
+            # 更新缓存
+            for item in items:
+                self._set_cached_item(item.path, item)
+        return items
 
     def create_folder(
             self, fileitem: schemas.FileItem, name: str
@@ -240,6 +245,7 @@ class Alist(StorageBase, metaclass=Singleton):
         :param name: 目录名
         """
         path = Path(fileitem.path) / name
+        self._invalidate_cached_item(path)
         resp: Response = RequestUtils(
             headers=self.__get_header_with_token()
         ).post_res(
@@ -304,6 +310,12 @@ class Alist(StorageBase, metaclass=Singleton):
         :param per_page: 每页数量
         :param refresh: 是否刷新
         """
+        # 仅缓存默认参数的查询，强制刷新时跳过缓存
+        use_cache = not password and page == 1 and not per_page
+        if use_cache and not refresh:
+            hit, fileitem = self._get_cached_item(path)
+            if hit:
+                return fileitem
         resp: Response = RequestUtils(
             headers=self.__get_header_with_token()
         ).post_res(
@@ -357,9 +369,11 @@ class Alist(StorageBase, metaclass=Singleton):
         result = resp.json()
         if result["code"] != 200:
             logger.debug(f'【alist】获取文件 {path} 失败，错误信息：{result["message"]}')
+            if use_cache:
+                self._set_cached_item(path, None)
             return None
 
-        return schemas.FileItem(
+        fileitem = schemas.FileItem(
             storage=self.schema.value,
             type="dir" if result["data"]["is_dir"] else "file",
             path=path.as_posix() + ("/" if result["data"]["is_dir"] else ""),
@@ -370,6 +384,9 @@ class Alist(StorageBase, metaclass=Singleton):
             modify_time=self.__parse_timestamp(result["data"]["modified"]),
             thumbnail=result["data"]["thumb"],
         )
+        if use_cache:
+            self._set_cached_item(path, fileitem)
+        return fileitem
 
     def get_parent(self, fileitem: schemas.FileItem) -> Optional[schemas.FileItem]:
         """
@@ -419,6 +436,7 @@ class Alist(StorageBase, metaclass=Singleton):
                 f'【alist】删除文件 {fileitem.path} 失败，错误信息：{result["message"]}'
             )
             return False
+        self._invalidate_cached_item(fileitem.path)
         return True
 
     def rename(self, fileitem: schemas.FileItem, name: str) -> bool:
@@ -462,6 +480,7 @@ class Alist(StorageBase, metaclass=Singleton):
             )
             return False
 
+        self._invalidate_cached_item(fileitem.path)
         return True
 
     def download(
@@ -570,6 +589,8 @@ class Alist(StorageBase, metaclass=Singleton):
             logger.warn(f"【alist】请求上传文件 {path} 失败，状态码：{resp.status_code}")
             return None
 
+        self._invalidate_cached_item(Path(fileitem.path) / path.name)
+
         new_item = self.get_item(Path(fileitem.path) / path.name)
         if new_item and new_name and new_name != path.name:
             if self.rename(new_item, new_name):
@@ -632,6 +653,7 @@ class Alist(StorageBase, metaclass=Singleton):
                 f'【alist】复制文件 {fileitem.path} 失败，错误信息：{result["message"]}'
             )
             return False
+        self._invalidate_cached_item(path / fileitem.name)
         # 重命名
         if fileitem.name != new_name:
             self.rename(
@@ -691,6 +713,7 @@ class Alist(StorageBase, metaclass=Singleton):
                 f'【alist】移动文件 {fileitem.path} 失败，错误信息：{result["message"]}'
             )
             return False
+        self._invalidate_cached_item(Path(fileitem.path).with_name(new_name), path / new_name)
         return True
 
     def link(self, fileitem: schemas.FileItem, target_file: Path) -> bool:
@@ -711,30 +734,6 @@ class Alist(StorageBase, metaclass=Singleton):
         """
         pass
 
-    def snapshot(self, path: Path) -> Dict[str, float]:
-        """
-        快照文件系统，输出所有层级文件信息（不含目录）
-        """
-        files_info = {}
-
-        def __snapshot_file(_fileitm: schemas.FileItem):
-            """
-            递归获取文件信息
-            """
-            if _fileitm.type == "dir":
-                for sub_file in self.list(_fileitm):
-                    __snapshot_file(sub_file)
-            else:
-                files_info[_fileitm.path] = _fileitm.size
-
-        fileitem = self.get_item(path)
-        if not fileitem:
-            return {}
-
-        __snapshot_file(fileitem)
-
-        return files_info
-
     @staticmethod
     def __parse_timestamp(time_str: str) -> float:
         """
@@ -1,12 +1,15 @@
 import shutil
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Callable, Dict
 
 from app import schemas
 from app.helper.directory import DirectoryHelper
+from app.helper.progress import ProgressHelper
 from app.log import logger
 from app.modules.filemanager.storages import StorageBase
-from app.schemas.types import StorageSchema
+from app.schemas.types import StorageSchema, ProgressKey
+from app.utils.string import StringUtils
 from app.utils.system import SystemUtils
 
 
@@ -143,6 +146,24 @@ class LocalStorage(StorageBase):
             return self.__get_fileitem(path)
         return self.__get_diritem(path)
 
+    def refresh_snapshot_files(self, files: Dict[str, dict]) -> Dict[str, dict]:
+        """
+        逐个获取文件的大小和修改时间，发现原地覆盖写入的文件
+        """
+        refreshed, changed = {}, False
+        for file_path, info in files.items():
+            try:
+                stat = Path(file_path).stat()
+            except OSError:
+                # 目录修改时间未变化时文件一般不会消失，获取失败时保留原信息
+                refreshed[file_path] = info
+                continue
+            if stat.st_size != info.get("size") or stat.st_mtime != info.get("modify_time"):
+                info = {"size": stat.st_size, "modify_time": stat.st_mtime}
+                changed = True
+            refreshed[file_path] = info
+        return refreshed if changed else files
+
     def detail(self, fileitem: schemas.FileItem) -> Optional[schemas.FileItem]:
         """
         获取文件详情
@@ -228,6 +249,27 @@ class LocalStorage(StorageBase):
             return False
         return True
 
+    @staticmethod
+    def __progress_callback(name: str, action: str) -> Callable[[int, int], None]:
+        """
+        生成文件复制进度回调，将字节进度写入整理进度的描述中，每秒最多更新一次
+        """
+        progress = ProgressHelper()
+        last_update = 0
+
+        def __callback(copied: int, total: int):
+            nonlocal last_update
+            now = time.time()
+            if copied < total and now - last_update < 1:
+                return
+            last_update = now
+            percent = round(copied / total * 100) if total else 100
+            progress.update(key=ProgressKey.FileTransfer,
+                            text=f"正在{action} {name} ：{percent}%"
+                                 f"（{StringUtils.str_filesize(copied)}/{StringUtils.str_filesize(total)}）")
+
+        return __callback
+
     def copy(self, fileitem: schemas.FileItem, path: Path, new_name: str) -> bool:
         """
         复制文件
@@ -236,7 +278,8 @@ class LocalStorage(StorageBase):
         :param new_name: 新文件名
         """
         file_path = Path(fileitem.path)
-        code, message = SystemUtils.copy(file_path, path / new_name)
+        code, message = SystemUtils.copy(file_path, path / new_name,
+                                         progress_callback=self.__progress_callback(fileitem.name, "复制"))
         if code != 0:
             logger.error(f"【local】复制文件失败：{message}")
             return False
@@ -250,7 +293,8 @@ class LocalStorage(StorageBase):
         :param new_name: 新文件名
         """
         file_path = Path(fileitem.path)
-        code, message = SystemUtils.move(file_path, path / new_name)
+        code, message = SystemUtils.move(file_path, path / new_name,
+                                         progress_callback=self.__progress_callback(fileitem.name, "移动"))
         if code != 0:
             logger.error(f"【local】移动文件失败：{message}")
             return False
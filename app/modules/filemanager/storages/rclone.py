@@ -1,8 +1,15 @@
 import json
+import os
+import secrets
+import socket
 import subprocess
+import threading
+import time
 from pathlib import Path
 from typing import Optional, List
 
+import requests
+
 from app import schemas
 from app.core.config import settings
 from app.log import logger
@@ -26,17 +33,42 @@ class Rclone(StorageBase):
         "copy": "复制"
     }
 
+    # 远程控制服务进程，所有实例共用
+    _rcd_process: Optional[subprocess.Popen] = None
+    # 远程控制服务地址
+    _rcd_url: Optional[str] = None
+    # 远程控制服务认证信息
+    _rcd_auth: Optional[tuple] = None
+    # 远程控制服务启动失败时间，失败后一段时间内直接使用命令行
+    _rcd_failed_at: float = 0
+    # 启动失败后重试间隔（秒）
+    _rcd_retry_interval = 300
+    # 异步任务状态轮询间隔（秒）
+    _rcd_poll_interval = 1
+    # 端口被占用时的启动重试次数
+    _rcd_start_retries = 3
+    _rcd_lock = threading.Lock()
+
     def init_storage(self):
         """
         初始化
         """
         pass
 
+    @classmethod
+    def stop(cls):
+        """
+        停止远程控制服务
+        """
+        cls.__stop_rcd()
+
     def set_config(self, conf: dict):
         """
         设置配置
         """
         super().set_config(conf)
+        # 配置变化后重启远程控制服务，避免使用旧的远程存储连接
+        self.__stop_rcd()
         filepath = conf.get("filepath")
         if not filepath:
             logger.warn("【rclone】保存配置失败：未设置配置文件路径")
@@ -56,6 +88,131 @@ class Rclone(StorageBase):
         else:
             return None
 
+    @classmethod
+    def __start_rcd(cls) -> bool:
+        """
+        启动常驻的 rclone 远程控制服务，仅监听本机地址
+        """
+        with cls._rcd_lock:
+            if cls._rcd_process and cls._rcd_process.poll() is None:
+                return True
+            if cls._rcd_failed_at and time.time() - cls._rcd_failed_at < cls._rcd_retry_interval:
+                return False
+            user, password = "moviepilot", secrets.token_urlsafe(16)
+            # 认证信息通过环境变量传递，避免在进程列表中暴露
+            env = {**os.environ, "RCLONE_RC_USER": user, "RCLONE_RC_PASS": password}
+            # 选择空闲端口到 rclone 监听之间端口可能被占用，监听失败时换一个端口重试
+            for _ in range(cls._rcd_start_retries):
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.bind(("127.0.0.1", 0))
+                    port = sock.getsockname()[1]
+                try:
+                    process = subprocess.Popen(
+                        ['rclone', 'rcd', '--rc-addr', f'127.0.0.1:{port}'],
+                        env=env,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        startupinfo=cls.__get_hidden_shell()
+                    )
+                except Exception as err:
+                    logger.warn(f"【rclone】启动远程控制服务失败，将使用命令行：{err}")
+                    cls._rcd_failed_at = time.time()
+                    return False
+                url = f"http://127.0.0.1:{port}"
+                # 等待服务就绪
+                for _ in range(50):
+                    if process.poll() is not None:
+                        break
+                    try:
+                        if requests.post(f"{url}/rc/noop", auth=(user, password), timeout=1).ok:
+                            cls._rcd_process = process
+                            cls._rcd_url = url
+                            cls._rcd_auth = (user, password)
+                            cls._rcd_failed_at = 0
+                            logger.info(f"【rclone】远程控制服务已启动：{url}")
+                            return True
+                    except requests.exceptions.RequestException:
+                        pass
+                    time.sleep(0.1)
+                if process.poll() is None:
+                    # 进程仍在运行但未就绪，不是端口问题，不再重试
+                    process.kill()
+                    break
+                logger.debug(f"【rclone】远程控制服务监听端口 {port} 失败，重试")
+            logger.warn("【rclone】远程控制服务未能就绪，将使用命令行")
+            cls._rcd_failed_at = time.time()
+            return False
+
+    @classmethod
+    def __stop_rcd(cls):
+        """
+        停止远程控制服务
+        """
+        with cls._rcd_lock:
+            process = cls._rcd_process
+            cls._rcd_process = None
+            cls._rcd_url = None
+            cls._rcd_auth = None
+            cls._rcd_failed_at = 0
+            if process and process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    def __rc(self, command: str, **params) -> Optional[dict]:
+        """
+        调用远程控制服务接口
+        :return: 服务不可用时返回None（调用方回退到命令行），执行出错时返回包含 error 的结果
+        """
+        if not self.__start_rcd():
+            return None
+        try:
+            resp = requests.post(f"{self._rcd_url}/{command}", json=params,
+                                 auth=self._rcd_auth, timeout=600)
+        except requests.exceptions.ConnectionError as err:
+            logger.warn(f"【rclone】远程控制服务连接失败，将使用命令行：{err}")
+            self.__stop_rcd()
+            return None
+        except requests.exceptions.RequestException as err:
+            return {"error": str(err)}
+        try:
+            result = resp.json()
+        except ValueError:
+            result = {}
+        if not resp.ok and not result.get("error"):
+            result["error"] = f"HTTP {resp.status_code}"
+        return result
+
+    def __rc_job(self, command: str, **params) -> Optional[dict]:
+        """
+        以异步任务方式调用远程控制服务接口，轮询任务状态直到完成，用于耗时的传输操作
+        :return: 服务不可用时返回None，任务失败时返回包含 error 的结果
+        """
+        result = self.__rc(command, _async=True, **params)
+        if result is None or result.get("error"):
+            return result
+        jobid = result.get("jobid")
+        while True:
+            status = self.__rc("job/status", jobid=jobid)
+            if status is None:
+                return {"error": f"任务 {jobid} 状态未知，远程控制服务已断开"}
+            if status.get("error") and not status.get("finished"):
+                return status
+            if status.get("finished"):
+                if not status.get("success") and not status.get("error"):
+                    status["error"] = f"任务 {jobid} 执行失败"
+                return status
+            time.sleep(self._rcd_poll_interval)
+
+    @staticmethod
+    def __rc_remote(path) -> str:
+        """
+        远程控制接口使用的相对路径
+        """
+        return Path(path).as_posix().lstrip("/")
+
     def __get_rcloneitem(self, item: dict, parent: Optional[str] = "/") -> schemas.FileItem:
         """
         获取rclone文件项
@@ -87,6 +244,12 @@ class Rclone(StorageBase):
         """
         检查存储是否可用
         """
+        result = self.__rc("operations/list", fs="MP:", remote="", opt={"dirsOnly": True})
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】存储检查失败：{result.get('error')}")
+                return False
+            return True
         try:
             retcode = subprocess.run(
                 ['rclone', 'lsf', 'MP:'],
@@ -104,6 +267,12 @@ class Rclone(StorageBase):
         """
         if fileitem.type == "file":
             return [fileitem]
+        result = self.__rc("operations/list", fs="MP:", remote=self.__rc_remote(fileitem.path))
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】浏览文件失败：{result.get('error')}")
+                return []
+            return [self.__get_rcloneitem(item, parent=fileitem.path) for item in result.get("list") or []]
         try:
             ret = subprocess.run(
                 [
@@ -126,6 +295,12 @@ class Rclone(StorageBase):
         :param fileitem: 父目录
         :param name: 目录名
         """
+        result = self.__rc("operations/mkdir", fs="MP:", remote=self.__rc_remote(Path(fileitem.path) / name))
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】创建目录失败：{result.get('error')}")
+                return None
+            return self.get_item(Path(fileitem.path) / name)
         try:
             retcode = subprocess.run(
                 [
@@ -178,6 +353,14 @@ class Rclone(StorageBase):
         """
         获取文件或目录，不存在返回None
         """
+        result = self.__rc("operations/stat", fs="MP:", remote=self.__rc_remote(path))
+        if result is not None:
+            if result.get("error"):
+                logger.debug(f"【rclone】获取文件项失败：{result.get('error')}")
+                return None
+            if not result.get("item"):
+                return None
+            return self.__get_rcloneitem(result.get("item"), parent=str(path.parent).rstrip("/") + "/")
         try:
             ret = subprocess.run(
                 [
@@ -201,6 +384,12 @@ class Rclone(StorageBase):
         """
         删除文件
         """
+        result = self.__rc("operations/deletefile", fs="MP:", remote=self.__rc_remote(fileitem.path))
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】删除文件失败：{result.get('error')}")
+                return False
+            return True
         try:
             retcode = subprocess.run(
                 [
@@ -219,6 +408,14 @@ class Rclone(StorageBase):
         """
         重命名文件
         """
+        result = self.__rc("operations/movefile",
+                           srcFs="MP:", srcRemote=self.__rc_remote(fileitem.path),
+                           dstFs="MP:", dstRemote=self.__rc_remote(Path(fileitem.path).parent / name))
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】重命名文件失败：{result.get('error')}")
+                return False
+            return True
         try:
             retcode = subprocess.run(
                 [
@@ -239,6 +436,14 @@ class Rclone(StorageBase):
         下载文件
         """
         path = (path or settings.TEMP_PATH) / fileitem.name
+        result = self.__rc_job("operations/copyfile",
+                               srcFs="MP:", srcRemote=self.__rc_remote(fileitem.path),
+                               dstFs=str(path.parent), dstRemote=path.name)
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】复制文件失败：{result.get('error')}")
+                return None
+            return path
         try:
             retcode = subprocess.run(
                 [
@@ -262,8 +467,16 @@ class Rclone(StorageBase):
         :param path: 本地文件路径
         :param new_name: 上传后文件名
         """
+        new_path = Path(fileitem.path) / (new_name or path.name)
+        result = self.__rc_job("operations/copyfile",
+                               srcFs=str(path.parent), srcRemote=path.name,
+                               dstFs="MP:", dstRemote=self.__rc_remote(new_path))
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】上传文件失败：{result.get('error')}")
+                return None
+            return self.get_item(new_path)
         try:
-            new_path = Path(fileitem.path) / (new_name or path.name)
             retcode = subprocess.run(
                 [
                     'rclone', 'copyto',
@@ -282,6 +495,12 @@ class Rclone(StorageBase):
         """
         获取文件详情
         """
+        result = self.__rc("operations/stat", fs="MP:", remote=self.__rc_remote(fileitem.path))
+        if result is not None:
+            if result.get("error") or not result.get("item"):
+                logger.error(f"【rclone】获取文件详情失败：{result.get('error') or '文件不存在'}")
+                return None
+            return self.__get_rcloneitem(result.get("item"))
         try:
             ret = subprocess.run(
                 [
@@ -305,6 +524,14 @@ class Rclone(StorageBase):
         :param path: 目标目录
         :param new_name: 新文件名
         """
+        result = self.__rc_job("operations/movefile",
+                               srcFs="MP:", srcRemote=self.__rc_remote(fileitem.path),
+                               dstFs="MP:", dstRemote=self.__rc_remote(path / new_name))
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】移动文件失败：{result.get('error')}")
+                return False
+            return True
         try:
             retcode = subprocess.run(
                 [
@@ -327,6 +554,14 @@ class Rclone(StorageBase):
         :param path: 目标目录
         :param new_name: 新文件名
         """
+        result = self.__rc_job("operations/copyfile",
+                               srcFs="MP:", srcRemote=self.__rc_remote(fileitem.path),
+                               dstFs="MP:", dstRemote=self.__rc_remote(path / new_name))
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】复制文件失败：{result.get('error')}")
+                return False
+            return True
         try:
             retcode = subprocess.run(
                 [
@@ -365,6 +600,15 @@ class Rclone(StorageBase):
                 return None
             if not any("[MP]" in line.strip() for line in lines):
                 return None
+        result = self.__rc("operations/about", fs="MP:")
+        if result is not None:
+            if result.get("error"):
+                logger.error(f"【rclone】获取存储使用情况失败：{result.get('error')}")
+                return None
+            return schemas.StorageUsage(
+                total=result.get("total"),
+                available=result.get("free")
+            )
         try:
             ret = subprocess.run(
                 [
@@ -9,6 +9,7 @@ from typing import List, Optional, Tuple, Union
 
 import oss2
 import requests
+from cachetools import LRUCache
 from oss2 import SizedFileAdapter, determine_part_size
 from oss2.models import PartInfo
 from tqdm import tqdm
@@ -51,6 +52,16 @@ class U115Pan(StorageBase, metaclass=Singleton):
     # 基础url
     base_url = "https://proapi.115.com"
 
+    # 预上传ID计算的前多少字节
+    _preid_size = 128 * 1024 * 1024
+
+    # 计算摘要时的读取块大小
+    _hash_chunk_size = 4 * 1024 * 1024
+
+    # 文件摘要缓存，键为（路径，大小，修改时间）
+    _digest_cache = LRUCache(maxsize=256)
+    _digest_cache_lock = threading.Lock()
+
     def __init__(self):
         super().__init__()
         self.session = requests.Session()
@@ -235,21 +246,35 @@ class U115Pan(StorageBase, metaclass=Singleton):
             return ret_data.get(result_key)
         return ret_data
 
-    @staticmethod
-    def _calc_sha1(filepath: Path, size: Optional[int] = None) -> str:
+    def _calc_digests(self, filepath: Path) -> Tuple[str, str]:
         """
-        计算文件SHA1（符合115规范）
-        size: 前多少字节
+        单次顺序读取同时计算整个文件的SHA1和前128M的SHA1（预上传ID），结果按（路径，大小，修改时间）缓存，
+        上传失败重试或续传时不再重复读取文件
+        :return: (文件SHA1, 预上传ID)
         """
+        stat = filepath.stat()
+        cache_key = (str(filepath), stat.st_size, stat.st_mtime_ns)
+        # LRUCache读取时也会调整顺序，多个整理线程并发访问时需要加锁
+        with self._digest_cache_lock:
+            digests = self._digest_cache.get(cache_key)
+        if digests:
+            return digests
         sha1 = hashlib.sha1()
+        pre_sha1 = hashlib.sha1()
+        pre_remain = self._preid_size
+        buffer = bytearray(self._hash_chunk_size)
+        view = memoryview(buffer)
         with open(filepath, 'rb') as f:
-            if size:
-                chunk = f.read(size)
+            while size := f.readinto(buffer):
+                chunk = view[:size]
                 sha1.update(chunk)
-            else:
-                while chunk := f.read(8192):
-                    sha1.update(chunk)
-        return sha1.hexdigest()
+                if pre_remain > 0:
+                    pre_sha1.update(chunk[:pre_remain])
+                    pre_remain -= size
+        digests = (sha1.hexdigest(), pre_sha1.hexdigest())
+        with self._digest_cache_lock:
+            self._digest_cache[cache_key] = digests
+        return digests
 
     def _delay_get_item(self, path: Path) -> Optional[schemas.FileItem]:
         """
@@ -257,6 +282,8 @@ class U115Pan(StorageBase, metaclass=Singleton):
         """
         for _ in range(2):
             time.sleep(2)
+            # 刚上传或移动的文件，不使用之前的缓存结果
+            self._invalidate_cached_item(path)
             fileitem = self.get_item(path)
             if fileitem:
                 return fileitem
@@ -304,7 +331,7 @@ class U115Pan(StorageBase, metaclass=Singleton):
                 # 更新缓存
                 path = f"{fileitem.path}{item['fn']}"
                 file_path = path + ("/" if item["fc"] == "0" else "")
-                items.append(schemas.FileItem(
+                sub_item = schemas.FileItem(
                     storage=self.schema.value,
                     fileid=str(item["fid"]),
                     parent_fileid=cid,
@@ -316,7 +343,9 @@ class U115Pan(StorageBase, metaclass=Singleton):
                     size=item["fs"] if item["fc"] == "1" else None,
                     modify_time=item["upt"],
                     pickcode=item["pc"]
-                ))
+                )
+                self._set_cached_item(file_path, sub_item)
+                items.append(sub_item)
 
             if len(resp) < 1000:
                 break
@@ -329,6 +358,7 @@ class U115Pan(StorageBase, metaclass=Singleton):
         创建目录
         """
         new_path = Path(parent_item.path) / name
+        self._invalidate_cached_item(new_path)
         resp = self._request_api(
             "POST",
             "/open/folder/add",
@@ -345,7 +375,7 @@ class U115Pan(StorageBase, metaclass=Singleton):
                 return self.get_item(new_path)
             logger.warn(f"【115】创建目录失败: {resp.get('error')}")
             return None
-        return schemas.FileItem(
+        folder = schemas.FileItem(
             storage=self.schema.value,
             fileid=str(resp["data"]["file_id"]),
             path=str(new_path) + "/",
@@ -354,6 +384,8 @@ class U115Pan(StorageBase, metaclass=Singleton):
             type="dir",
             modify_time=int(time.time())
         )
+        self._set_cached_item(new_path, folder)
+        return folder
 
     @staticmethod
     def _log_progress(desc: str, total: int) -> tqdm:
@@ -389,10 +421,10 @@ class U115Pan(StorageBase, metaclass=Singleton):
 
         target_name = new_name or local_path.name
         target_path = Path(target_dir.path) / target_name
+        self._invalidate_cached_item(target_path)
         # 计算文件特征值
         file_size = local_path.stat().st_size
-        file_sha1 = self._calc_sha1(local_path)
-        file_preid = self._calc_sha1(local_path, 128 * 1024 * 1024)
+        file_sha1, file_preid = self._calc_digests(local_path)
 
         # 获取目标目录CID
         target_cid = target_dir.fileid
@@ -642,6 +674,7 @@ class U115Pan(StorageBase, metaclass=Singleton):
                     "file_ids": int(fileitem.fileid)
                 }
             )
+            self._invalidate_cached_item(fileitem.path)
             return True
         except requests.exceptions.HTTPError:
             return False
@@ -661,6 +694,7 @@ class U115Pan(StorageBase, metaclass=Singleton):
         if not resp:
             return False
         if resp["state"]:
+            self._invalidate_cached_item(fileitem.path)
             return True
         return False
 
@@ -668,6 +702,9 @@ class U115Pan(StorageBase, metaclass=Singleton):
         """
         获取指定路径的文件/目录项
         """
+        hit, fileitem = self._get_cached_item(path)
+        if hit:
+            return fileitem
         try:
             resp = self._request_api(
                 "POST",
@@ -678,8 +715,9 @@ class U115Pan(StorageBase, metaclass=Singleton):
                 }
             )
             if not resp:
+                self._set_cached_item(path, None)
                 return None
-            return schemas.FileItem(
+            fileitem = schemas.FileItem(
                 storage=self.schema.value,
                 fileid=str(resp["file_id"]),
                 path=str(path) + ("/" if resp["file_category"] == "0" else ""),
@@ -691,6 +729,8 @@ class U115Pan(StorageBase, metaclass=Singleton):
                 size=resp['size_byte'] if resp["file_category"] == "1" else None,
                 modify_time=resp["utime"]
             )
+            self._set_cached_item(path, fileitem)
+            return fileitem
         except Exception as e:
             logger.debug(f"【115】获取文件信息失败: {str(e)}")
             return None
@@ -699,27 +739,15 @@ class U115Pan(StorageBase, metaclass=Singleton):
         """
         获取指定路径的文件夹，如不存在则创建
         """
-
-        def __find_dir(_fileitem: schemas.FileItem, _name: str) -> Optional[schemas.FileItem]:
-            """
-            查找下级目录中匹配名称的目录
-            """
-            for sub_folder in self.list(_fileitem):
-                if sub_folder.type != "dir":
-                    continue
-                if sub_folder.name == _name:
-                    return sub_folder
-            return None
-
         # 是否已存在
         folder = self.get_item(path)
         if folder:
             return folder
-        # 逐级查找和创建目录
+        # 逐级查找和创建目录，按路径直接查询（优先命中缓存），不再浏览上级目录
         fileitem = schemas.FileItem(storage=self.schema.value, path="/")
         for part in path.parts[1:]:
-            dir_file = __find_dir(fileitem, part)
-            if dir_file:
+            dir_file = self.get_item(Path(fileitem.path) / part)
+            if dir_file and dir_file.type == "dir":
                 fileitem = dir_file
             else:
                 dir_file = self.create_folder(fileitem, part)
@@ -757,6 +785,7 @@ class U115Pan(StorageBase, metaclass=Singleton):
             return False
         if resp["state"]:
             new_path = Path(path) / fileitem.name
+            self._invalidate_cached_item(new_path)
             new_item = self._delay_get_item(new_path)
             self.rename(new_item, new_name)
             return True
@@ -783,6 +812,7 @@ class U115Pan(StorageBase, metaclass=Singleton):
             return False
         if resp["state"]:
             new_path = Path(path) / fileitem.name
+            self._invalidate_cached_item(fileitem.path, new_path)
             new_file = self._delay_get_item(new_path)
             self.rename(new_file, new_name)
             return True
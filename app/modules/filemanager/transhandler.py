@@ -3,7 +3,7 @@ from pathlib import Path
 from threading import Lock
 from typing import Optional, List, Tuple
 
-from jinja2 import Template
+from cachetools import TTLCache
 
 from app.core.config import settings
 from app.core.context import MediaInfo
@@ -29,6 +29,12 @@ class TransHandler:
     result: Optional[TransferInfo] = None
     inner_lock: Lock = Lock()
 
+    # 源目录文件清单缓存，批量整理同一目录（如整季）时查找字幕、音轨等关联文件不再重复浏览目录
+    _listing_cache: TTLCache = TTLCache(maxsize=128, ttl=60)
+    # 字幕文件名识别结果缓存
+    _subtitle_meta_cache: TTLCache = TTLCache(maxsize=8192, ttl=600)
+    _cache_lock: Lock = Lock()
+
     def __init__(self):
         self.__reset_result()
 
@@ -320,9 +326,8 @@ class TransHandler:
         # 加锁
         with lock:
             if fileitem.storage == "local" and target_storage == "local":
-                # 创建目录
-                if not target_file.parent.exists():
-                    target_file.parent.mkdir(parents=True)
+                # 创建目录，已存在时只需一次系统调用
+                target_file.parent.mkdir(parents=True, exist_ok=True)
                 # 本地到本地
                 if transfer_type == "copy":
                     state = source_oper.copy(fileitem, target_file.parent, target_file.name)
@@ -419,6 +424,44 @@ class TransHandler:
 
         return None, "未知错误"
 
+    def __list_sibling_files(self, fileitem: FileItem, source_oper: StorageBase) -> Optional[List[FileItem]]:
+        """
+        获取文件所在目录的文件清单，本地存储以目录修改时间校验缓存，网盘存储短时间缓存
+        :param fileitem: 源文件
+        :param source_oper: 源存储操作对象
+        :return: 文件清单，上级目录获取失败时返回None
+        """
+        parent_path = Path(fileitem.path).parent
+        cache_key = (fileitem.storage, parent_path.as_posix())
+        if fileitem.storage == "local":
+            try:
+                cache_key += (parent_path.stat().st_mtime_ns,)
+            except OSError:
+                return None
+        with self._cache_lock:
+            file_list = self._listing_cache.get(cache_key)
+        if file_list is not None:
+            return file_list
+        parent_item: FileItem = source_oper.get_parent(fileitem)
+        if not parent_item:
+            return None
+        file_list = source_oper.list(parent_item) or []
+        with self._cache_lock:
+            self._listing_cache[cache_key] = file_list
+        return file_list
+
+    def __discard_sibling_file(self, fileitem: FileItem):
+        """
+        文件被移走后从网盘目录清单缓存中移除，本地存储的目录修改时间会变化，无需处理
+        """
+        if fileitem.storage == "local":
+            return
+        cache_key = (fileitem.storage, Path(fileitem.path).parent.as_posix())
+        with self._cache_lock:
+            file_list = self._listing_cache.get(cache_key)
+            if file_list:
+                self._listing_cache[cache_key] = [f for f in file_list if f.path != fileitem.path]
+
     def __transfer_other_files(self, fileitem: FileItem, target_storage: str,
                                source_oper: StorageBase, target_oper: StorageBase,
                                target_file: Path, transfer_type: str) -> Tuple[bool, str]:
@@ -476,33 +519,45 @@ class TransHandler:
                        r"|(?<![a-z0-9])big5(?![a-z0-9])"
         _eng_sub_re = r"[.\[(]eng[.\])]"
 
+        def __get_sub_meta(_sub_item: FileItem) -> Tuple[str, MetaBase]:
+            """
+            识别字幕文件名，同一字幕在整季整理时会与每一集比对，识别结果缓存复用
+            """
+            with self._cache_lock:
+                cached = self._subtitle_meta_cache.get(_sub_item.path)
+            if cached:
+                return cached
+            _sub_file_name = re.sub(_zhtw_sub_re,
+                                    ".",
+                                    re.sub(_zhcn_sub_re,
+                                           ".",
+                                           _sub_item.name,
+                                           flags=re.I),
+                                    flags=re.I)
+            _sub_file_name = re.sub(_eng_sub_re, ".", _sub_file_name, flags=re.I)
+            cached = (_sub_file_name, MetaInfoPath(Path(_sub_item.path)))
+            with self._cache_lock:
+                self._subtitle_meta_cache[_sub_item.path] = cached
+            return cached
+
         # 比对文件名并整理字幕
         org_path = Path(fileitem.path)
-        # 查找上级文件项
-        parent_item: FileItem = source_oper.get_parent(fileitem)
-        if not parent_item:
+        # 同目录文件清单
+        file_list = self.__list_sibling_files(fileitem, source_oper)
+        if file_list is None:
             return False, f"{org_path} 上级目录获取失败"
         # 字幕文件列表
-        file_list: List[FileItem] = source_oper.list(parent_item) or []
         file_list = [f for f in file_list if f.type == "file" and f.extension
                      and f".{f.extension.lower()}" in settings.RMT_SUBEXT]
         if len(file_list) == 0:
-            logger.info(f"{parent_item.path} 目录下没有找到字幕文件...")
+            logger.info(f"{org_path.parent} 目录下没有找到字幕文件...")
         else:
             logger.info(f"字幕文件清单：{[f.name for f in file_list]}")
             # 识别文件名
             metainfo = MetaInfoPath(org_path)
             for sub_item in file_list:
                 # 识别字幕文件名
-                sub_file_name = re.sub(_zhtw_sub_re,
-                                       ".",
-                                       re.sub(_zhcn_sub_re,
-                                              ".",
-                                              sub_item.name,
-                                              flags=re.I),
-                                       flags=re.I)
-                sub_file_name = re.sub(_eng_sub_re, ".", sub_file_name, flags=re.I)
-                sub_metainfo = MetaInfoPath(Path(sub_item.path))
+                sub_file_name, sub_metainfo = __get_sub_meta(sub_item)
                 # 匹配字幕文件名
                 if (org_path.stem == Path(sub_file_name).stem) or \
                         (sub_metainfo.cn_name and sub_metainfo.cn_name == metainfo.cn_name) \
@@ -555,6 +610,8 @@ class TransHandler:
                                                                        transfer_type=transfer_type)
                             if new_item:
                                 logger.info(f"字幕 {sub_item.name} 整理完成")
+                                if transfer_type == "move":
+                                    self.__discard_sibling_file(sub_item)
                                 self.__set_result(
                                     subtitle_list=[sub_item.path],
                                     subtitle_list_new=[new_item.path],
@@ -580,18 +637,17 @@ class TransHandler:
         :param transfer_type: 整理方式
         """
         org_path = Path(fileitem.path)
-        # 查找上级文件项
-        parent_item: FileItem = source_oper.get_parent(fileitem)
-        if not parent_item:
+        # 同目录文件清单
+        file_list = self.__list_sibling_files(fileitem, source_oper)
+        if file_list is None:
             return False, f"{org_path} 上级目录获取失败"
-        file_list: List[FileItem] = source_oper.list(parent_item)
         # 匹配音轨文件
         pending_file_list: List[FileItem] = [file for file in file_list
                                              if Path(file.name).stem == org_path.stem
                                              and file.type == "file" and file.extension
                                              and f".{file.extension.lower()}" in settings.RMT_AUDIOEXT]
         if len(pending_file_list) == 0:
-            return True, f"{parent_item.path} 目录下没有找到匹配的音轨文件"
+            return True, f"{org_path.parent} 目录下没有找到匹配的音轨文件"
         logger.debug("音轨文件清单：" + str(pending_file_list))
         for track_file in pending_file_list:
             track_ext = f".{track_file.extension}"
@@ -606,6 +662,8 @@ class TransHandler:
                                                            transfer_type=transfer_type)
                 if new_item:
                     logger.info(f"音轨文件 {org_path.name} 整理完成")
+                    if transfer_type == "move":
+                        self.__discard_sibling_file(track_file)
                     self.__set_result(
                         audio_list=[track_file.path],
                         audio_list_new=[new_item.path],
@@ -661,11 +719,31 @@ class TransHandler:
         else:
             return None, errmsg
 
+    @staticmethod
+    def __plan_dir_files(fileitem: FileItem, source_oper: StorageBase,
+                         target_path: Path) -> List[Tuple[FileItem, Path]]:
+        """
+        按目录结构生成整理计划，一次遍历得到目录下所有文件及其目标路径
+        :param fileitem: 源目录
+        :param source_oper: 源存储操作对象
+        :param target_path: 目标路径
+        :return: [(源文件, 目标文件路径)]
+        """
+        plan = []
+        for item in source_oper.list(fileitem) or []:
+            if item.type == "dir":
+                plan.extend(TransHandler.__plan_dir_files(fileitem=item,
+                                                          source_oper=source_oper,
+                                                          target_path=target_path / item.name))
+            else:
+                plan.append((item, target_path / item.name))
+        return plan
+
     def __transfer_dir_files(self, fileitem: FileItem, target_storage: str,
                              source_oper: StorageBase, target_oper: StorageBase,
                              transfer_type: str, target_path: Path) -> Tuple[bool, str]:
         """
-        按目录结构整理目录下所有文件
+        按目录结构整理目录下所有文件，本地目标目录一次创建完成，单个文件失败时继续整理其余文件
         :param fileitem: 源文件
         :param target_storage: 目标存储
         :param source_oper: 源存储操作对象
@@ -673,35 +751,32 @@ class TransHandler:
         :param target_path: 目标路径
         :param transfer_type: 整理方式
         """
-        file_list: List[FileItem] = source_oper.list(fileitem)
+        plan = self.__plan_dir_files(fileitem=fileitem, source_oper=source_oper, target_path=target_path)
+        if target_storage == "local":
+            # 只需创建最深层的目录，上级目录随之创建
+            folders = {target_file.parent for _, target_file in plan}
+            for folder in folders - {parent for folder in folders for parent in folder.parents}:
+                folder.mkdir(parents=True, exist_ok=True)
         # 整理文件
-        for item in file_list:
-            if item.type == "dir":
-                # 递归整理目录
-                new_path = target_path / item.name
-                state, errmsg = self.__transfer_dir_files(fileitem=item,
-                                                          target_storage=target_storage,
-                                                          source_oper=source_oper,
-                                                          target_oper=target_oper,
-                                                          transfer_type=transfer_type,
-                                                          target_path=new_path)
-                if not state:
-                    return False, errmsg
-            else:
-                # 整理文件
-                new_file = target_path / item.name
-                new_item, errmsg = self.__transfer_command(fileitem=item,
-                                                           target_storage=target_storage,
-                                                           source_oper=source_oper,
-                                                           target_oper=target_oper,
-                                                           target_file=new_file,
-                                                           transfer_type=transfer_type)
-                if not new_item:
-                    return False, errmsg
-                self.__set_result(
-                    file_list=[item.path],
-                    file_list_new=[new_item.path],
-                )
+        errmsgs = []
+        for item, new_file in plan:
+            new_item, errmsg = self.__transfer_command(fileitem=item,
+                                                       target_storage=target_storage,
+                                                       source_oper=source_oper,
+                                                       target_oper=target_oper,
+                                                       target_file=new_file,
+                                                       transfer_type=transfer_type)
+            if not new_item:
+                logger.warn(f"文件 {item.path} 整理失败：{errmsg}")
+                errmsgs.append(errmsg)
+                self.__set_result(fail_list=[item.path])
+                continue
+            self.__set_result(
+                file_list=[item.path],
+                file_list_new=[new_item.path],
+            )
+        if errmsgs:
+            return False, f"{len(errmsgs)} 个文件整理失败：{errmsgs[0]}"
         # 返回成功
         return True, ""
 
@@ -767,6 +842,8 @@ class TransHandler:
                                                    target_file=target_file,
                                                    transfer_type=transfer_type)
         if new_item:
+            if transfer_type == "move":
+                self.__discard_sibling_file(fileitem)
             self.__set_result(
                 file_list=[fileitem.path],
                 file_list_new=[new_item.path],
@@ -893,7 +970,7 @@ class TransHandler:
         :return: 生成的完整路径
         """
         # 创建jinja2模板对象
-        template = Template(template_string)
+        template = TemplateHelper.compile_template(template_string)
         # 渲染生成的字符串
         render_str = template.render(rename_dict)
 
@@ -256,10 +256,11 @@ class IndexerModule(_ModuleBase):
         """
         return self.search_torrents(site=site, keywords=[keyword], cat=cat, page=page)
 
-    def refresh_userdata(self, site: dict) -> Optional[SiteUserData]:
+    def refresh_userdata(self, site: dict, timeout: Optional[int] = None) -> Optional[SiteUserData]:
         """
         刷新站点的用户数据
         :param site:  站点
+        :param timeout:  整站解析时限（秒），超时后不再请求剩余页面
         :return: 用户数据
         """
 
@@ -276,7 +277,8 @@ class IndexerModule(_ModuleBase):
                         apikey=site.get("apikey"),
                         token=site.get("token"),
                         ua=site.get("ua"),
-                        proxy=site.get("proxy"))
+                        proxy=site.get("proxy"),
+                        timeout=timeout)
             return None
 
         site_obj = __get_site_obj()
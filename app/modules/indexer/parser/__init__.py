@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 import json
 import re
+import time
 from abc import ABCMeta, abstractmethod
 from enum import Enum
 from typing import Optional
 from urllib.parse import urljoin, urlsplit
 
+import requests
 from requests import Session
 
 from app.core.config import settings
@@ -49,7 +51,8 @@ class SiteParserBase(metaclass=ABCMeta):
                  session: Session = None,
                  ua: Optional[str] = None,
                  emulate: bool = False,
-                 proxy: bool = None):
+                 proxy: bool = None,
+                 timeout: Optional[int] = None):
         super().__init__()
 
         # 站点信息
@@ -65,6 +68,9 @@ class SiteParserBase(metaclass=ABCMeta):
         self._ua = ua
         self._emulate = emulate
         self._proxy = proxy
+        # 整站解析的时限（秒），超时后不再请求剩余页面
+        self._timeout = timeout
+        self._deadline: Optional[float] = None
         self._index_html = ""
         # 用户信息
         self.username = None
@@ -153,9 +159,24 @@ class SiteParserBase(metaclass=ABCMeta):
 
     def parse(self):
         """
-        解析站点信息
+        解析站点信息，同一站点的所有页面复用同一连接会话
         :return:
         """
+        self._deadline = time.monotonic() + self._timeout if self._timeout else None
+        if self._session:
+            self._parse()
+            return
+        self._session = requests.Session()
+        try:
+            self._parse()
+        finally:
+            self._session.close()
+            self._session = None
+
+    def _parse(self):
+        """
+        解析站点各页面
+        """
         # Cookie模式时，获取站点首页html
         if self.request_mode == "apikey":
             if not self.apikey and not self.token:
@@ -297,6 +318,14 @@ class SiteParserBase(metaclass=ABCMeta):
         :param headers: 额外的请求头
         :return:
         """
+        # 请求超时不超过剩余时限
+        timeout = 60
+        if self._deadline:
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warn(f"{self._site_name} 数据刷新超时，跳过页面：{url}")
+                return ""
+            timeout = min(timeout, max(int(remaining), 1))
         req_headers = None
         proxies = settings.PROXY if self._proxy else None
         if self._ua or headers or self._addition_headers:
@@ -321,29 +350,28 @@ class SiteParserBase(metaclass=ABCMeta):
         if self.request_mode == "apikey":
             # 使用apikey请求，通过请求头传递
             cookie = None
-            session = None
         else:
             # 使用cookie请求
             cookie = self._site_cookie
-            session = self._session
+        session = self._session
 
         if params:
             if req_headers.get("Content-Type") == "application/json":
                 res = RequestUtils(cookies=cookie,
                                    session=session,
-                                   timeout=60,
+                                   timeout=timeout,
                                    proxies=proxies,
                                    headers=req_headers).post_res(url=url, json=params)
             else:
                 res = RequestUtils(cookies=cookie,
                                    session=session,
-                                   timeout=60,
+                                   timeout=timeout,
                                    proxies=proxies,
                                    headers=req_headers).post_res(url=url, data=params)
         else:
             res = RequestUtils(cookies=cookie,
                                session=session,
-                               timeout=60,
+                               timeout=timeout,
                                proxies=proxies,
                                headers=req_headers).get_res(url=url)
         if res is not None and res.status_code in (200, 500, 403):
@@ -19,7 +19,7 @@ class JellyfinModule(_ModuleBase, _MediaServerBase[Jellyfin]):
         super().init_service(service_name=Jellyfin.__name__.lower(),
                              service_type=lambda conf: Jellyfin(**conf.config, sync_libraries=conf.sync_libraries))
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
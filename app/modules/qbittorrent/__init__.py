@@ -25,7 +25,7 @@ class QbittorrentModule(_ModuleBase, _DownloaderBase[Qbittorrent]):
         super().init_service(service_name=Qbittorrent.__name__.lower(),
                              service_type=Qbittorrent)
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
@@ -286,7 +286,7 @@ class QbittorrentModule(_ModuleBase, _DownloaderBase[Qbittorrent]):
             for name, server in servers.items():
                 torrents = server.get_downloading_torrents(tags=settings.TORRENT_TAG)
                 for torrent in torrents or []:
-                    meta = MetaInfo(torrent.get('name'))
+                    meta = self.get_torrent_meta(torrent.get('hash'), torrent.get('name'))
                     ret_torrents.append(DownloadingTorrent(
                         downloader=name,
                         hash=torrent.get('hash'),
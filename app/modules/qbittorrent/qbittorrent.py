@@ -1,6 +1,7 @@
+import threading
 import time
 import traceback
-from typing import Optional, Union, Tuple, List
+from typing import Optional, Union, Tuple, List, Dict
 
 import qbittorrentapi
 from qbittorrentapi import TorrentDictionary, TorrentFilesList
@@ -22,6 +23,13 @@ class Qbittorrent:
 
     qbc: Client = None
 
+    # 状态过滤对应的种子状态，与qBittorrent的 downloading、seeding 过滤器一致
+    _status_states = {
+        "downloading": {"downloading", "metaDL", "forcedMetaDL", "stalledDL", "checkingDL",
+                        "pausedDL", "stoppedDL", "queuedDL", "forcedDL"},
+        "seeding": {"uploading", "stalledUP", "checkingUP", "queuedUP", "forcedUP"}
+    }
+
     def __init__(self, host: Optional[str] = None, port: int = None,
                  username: Optional[str] = None, password: Optional[str] = None,
                  category: Optional[bool] = False, sequentail: Optional[bool] = False,
@@ -43,6 +51,10 @@ class Qbittorrent:
         self._sequentail = sequentail
         self._force_resume = force_resume
         self._first_last_piece = first_last_piece
+        # 种子状态镜像，通过 sync/maindata 增量更新
+        self._torrents: Dict[str, dict] = {}
+        self._rid = 0
+        self._sync_lock = threading.Lock()
         if self._host and self._port:
             self.qbc = self.__login_qbittorrent()
 
@@ -59,6 +71,9 @@ class Qbittorrent:
         重连
         """
         self.qbc = self.__login_qbittorrent()
+        with self._sync_lock:
+            self._torrents = {}
+            self._rid = 0
 
     def __login_qbittorrent(self) -> Optional[Client]:
         """
@@ -97,6 +112,9 @@ class Qbittorrent:
         """
         if not self.qbc:
             return [], True
+        if not ids and (not status or status in self._status_states):
+            # 不指定种子时从增量同步的状态镜像中过滤
+            return self.sync_torrents(status=status, tags=tags)
         try:
             torrents = self.qbc.torrents_info(torrent_hashes=ids,
                                               status_filter=status)
@@ -114,6 +132,49 @@ class Qbittorrent:
             logger.error(f"获取种子列表出错：{str(err)}")
             return [], True
 
+    def sync_torrents(self, status: Optional[str] = None,
+                      tags: Optional[Union[str, list]] = None) -> Tuple[List[TorrentDictionary], bool]:
+        """
+        通过 sync/maindata 增量同步种子状态镜像，并按状态和标签过滤
+        首次同步为全量数据，之后每次只传输上次同步以来发生变化的字段
+        :param status: 状态过滤，仅支持 downloading、seeding
+        :param tags: 标签过滤
+        return: 种子列表, 是否发生异常
+        """
+        if not self.qbc:
+            return [], True
+        if tags and not isinstance(tags, list):
+            tags = [tags]
+        states = self._status_states.get(status) if status else None
+        with self._sync_lock:
+            try:
+                maindata = self.qbc.sync_maindata(rid=self._rid)
+            except Exception as err:
+                logger.error(f"同步种子列表出错：{str(err)}")
+                self._torrents = {}
+                self._rid = 0
+                return [], True
+            if maindata.get("full_update"):
+                self._torrents = {}
+            for torrent_hash, changes in (maindata.get("torrents") or {}).items():
+                torrent = self._torrents.get(torrent_hash)
+                if torrent is None:
+                    torrent = self._torrents[torrent_hash] = {"hash": torrent_hash}
+                torrent.update(changes)
+            for torrent_hash in maindata.get("torrents_removed") or []:
+                self._torrents.pop(torrent_hash, None)
+            self._rid = maindata.get("rid") or 0
+            results = []
+            for torrent in self._torrents.values():
+                if states and torrent.get("state") not in states:
+                    continue
+                if tags:
+                    torrent_tags = [str(tag).strip() for tag in (torrent.get("tags") or "").split(',')]
+                    if not set(tags).issubset(set(torrent_tags)):
+                        continue
+                results.append(TorrentDictionary(dict(torrent), client=self.qbc))
+        return results, False
+
     def get_completed_torrents(self, ids: Union[str, list] = None,
                                tags: Union[str, list] = None) -> Optional[List[TorrentDictionary]]:
         """
@@ -21,7 +21,7 @@ class SlackModule(_ModuleBase, _MessageBase[Slack]):
                              service_type=Slack)
         self._channel = MessageChannel.Slack
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
@@ -19,7 +19,7 @@ class SynologyChatModule(_ModuleBase, _MessageBase[SynologyChat]):
                              service_type=SynologyChat)
         self._channel = MessageChannel.SynologyChat
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
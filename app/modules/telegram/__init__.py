@@ -25,7 +25,7 @@ class TelegramModule(_ModuleBase, _MessageBase[Telegram]):
                              service_type=Telegram)
         self._channel = MessageChannel.Telegram
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
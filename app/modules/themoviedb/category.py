@@ -1,6 +1,7 @@
 import shutil
+import time
 from pathlib import Path
-from typing import Union
+from typing import Union, List, Tuple, Optional, Any
 
 import ruamel.yaml
 from ruamel.yaml import CommentedMap
@@ -10,6 +11,72 @@ from app.log import logger
 from app.utils.singleton import Singleton
 
 
+class CategoryCondition:
+    """
+    预编译的分类条件
+    """
+    __slots__ = ("attr", "values", "begin", "end")
+
+    def __init__(self, attr: str, value: Any):
+        self.attr = attr
+        # 匹配的值集合
+        self.values: frozenset = frozenset()
+        # 数字范围
+        self.begin: Optional[int] = None
+        self.end: Optional[int] = None
+        value = str(value)
+        if value.find(",") != -1:
+            # , 分隔多个值
+            self.values = frozenset(str(val).upper() for val in value.split(",") if val)
+        elif value.find("-") != -1:
+            # - 表示范围，仅限于数字
+            value_begin = value.split("-")[0]
+            value_end = value.split("-")[1]
+            if value_begin.isdigit() and value_end.isdigit():
+                # 数字范围
+                self.begin, self.end = int(value_begin), int(value_end)
+            else:
+                # 字符串范围
+                self.values = frozenset([str(value_begin), str(value_end)])
+        else:
+            self.values = frozenset([str(value).upper()])
+
+    def __info_values(self, tmdb_info: dict) -> Optional[set]:
+        """
+        获取TMDB信息中对应的值
+        """
+        if self.attr == "release_year":
+            # 发行年份
+            info_value = tmdb_info.get("release_date") or tmdb_info.get("first_air_date")
+            if info_value:
+                info_value = str(info_value)[:4]
+        else:
+            info_value = tmdb_info.get(self.attr)
+        if not info_value:
+            return None
+        if self.attr == "production_countries":
+            # 制片国家
+            return {str(val.get("iso_3166_1")).upper() for val in info_value}
+        if isinstance(info_value, list):
+            return {str(val).upper() for val in info_value}
+        return {str(info_value).upper()}
+
+    def match(self, tmdb_info: dict) -> bool:
+        """
+        判断TMDB信息是否满足条件
+        """
+        info_values = self.__info_values(tmdb_info)
+        if not info_values:
+            return False
+        if self.begin is not None:
+            for info_value in info_values:
+                if info_value.isdigit() and str(int(info_value)) == info_value \
+                        and self.begin <= int(info_value) <= self.end:
+                    return True
+            return False
+        return not self.values.isdisjoint(info_values)
+
+
 class CategoryHelper(metaclass=Singleton):
     """
     二级分类
@@ -17,9 +84,17 @@ class CategoryHelper(metaclass=Singleton):
     _categorys = {}
     _movie_categorys = {}
     _tv_categorys = {}
+    # 检查配置文件变化的间隔（秒）
+    _check_interval = 10
 
     def __init__(self):
         self._category_path: Path = settings.CONFIG_PATH / "category.yaml"
+        # 编译后的分类规则 [(分类名称, [条件])]
+        self._movie_rules: List[Tuple[str, List[CategoryCondition]]] = []
+        self._tv_rules: List[Tuple[str, List[CategoryCondition]]] = []
+        # 已加载配置文件的修改时间
+        self._mtime: Optional[int] = None
+        self._last_check = 0.0
         self.init()
 
     def init(self):
@@ -42,8 +117,48 @@ class CategoryHelper(metaclass=Singleton):
         if self._categorys:
             self._movie_categorys = self._categorys.get('movie')
             self._tv_categorys = self._categorys.get('tv')
+        self._movie_rules = self.compile(self._movie_categorys)
+        self._tv_rules = self.compile(self._tv_categorys)
+        self._mtime = self.__get_mtime()
         logger.info(f"已加载二级分类策略 category.yaml")
 
+    def __get_mtime(self) -> Optional[int]:
+        try:
+            return self._category_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def __check_reload(self):
+        """
+        配置文件变化时重新加载
+        """
+        now = time.time()
+        if now - self._last_check < self._check_interval:
+            return
+        self._last_check = now
+        if self.__get_mtime() != self._mtime:
+            logger.info("二级分类策略 category.yaml 已变化，重新加载")
+            self.init()
+
+    @staticmethod
+    def compile(categorys: Union[dict, CommentedMap]) -> List[Tuple[str, List[CategoryCondition]]]:
+        """
+        将分类配置编译为分类条件
+        :param categorys: 分类配置
+        :return: [(分类名称, [条件])]，条件为空时表示匹配所有媒体
+        """
+        if not categorys:
+            return []
+        rules = []
+        for key, item in categorys.items():
+            conditions = []
+            for attr, value in (item or {}).items():
+                if not value:
+                    continue
+                conditions.append(CategoryCondition(attr, value))
+            rules.append((key, conditions))
+        return rules
+
     @property
     def is_movie_category(self) -> bool:
         """
@@ -86,7 +201,8 @@ class CategoryHelper(metaclass=Singleton):
         :param tmdb_info: 识别的TMDB中的信息
         :return: 二级分类的名称
         """
-        return self.get_category(self._movie_categorys, tmdb_info)
+        self.__check_reload()
+        return self.match_category(self._movie_rules, tmdb_info)
 
     def get_tv_category(self, tmdb_info) -> str:
         """
@@ -94,7 +210,23 @@ class CategoryHelper(metaclass=Singleton):
         :param tmdb_info: 识别的TMDB中的信息
         :return: 二级分类的名称
         """
-        return self.get_category(self._tv_categorys, tmdb_info)
+        self.__check_reload()
+        return self.match_category(self._tv_rules, tmdb_info)
+
+    @staticmethod
+    def match_category(rules: List[Tuple[str, List[CategoryCondition]]], tmdb_info: dict) -> str:
+        """
+        使用编译后的分类条件确定所属分类
+        :param rules: 编译后的分类条件
+        :param tmdb_info: TMDB信息
+        :return: 分类的名称
+        """
+        if not tmdb_info:
+            return ""
+        for key, conditions in rules:
+            if all(condition.match(tmdb_info) for condition in conditions):
+                return key
+        return ""
 
     @staticmethod
     def get_category(categorys: Union[dict, CommentedMap], tmdb_info: dict) -> str:
@@ -106,52 +238,4 @@ class CategoryHelper(metaclass=Singleton):
         """
         if not tmdb_info:
             return ""
-        if not categorys:
-            return ""
-        for key, item in categorys.items():
-            if not item:
-                return key
-            match_flag = True
-            for attr, value in item.items():
-                if not value:
-                    continue
-                if attr == "release_year":
-                    # 发行年份
-                    info_value = tmdb_info.get("release_date") or tmdb_info.get("first_air_date")
-                    if info_value:
-                        info_value = str(info_value)[:4]
-                else:
-                    info_value = tmdb_info.get(attr)
-                if not info_value:
-                    match_flag = False
-                    continue
-                elif attr == "production_countries":
-                    # 制片国家
-                    info_values = [str(val.get("iso_3166_1")).upper() for val in info_value]
-                else:
-                    if isinstance(info_value, list):
-                        info_values = [str(val).upper() for val in info_value]
-                    else:
-                        info_values = [str(info_value).upper()]
-
-                if value.find(",") != -1:
-                    # , 分隔多个值
-                    values = [str(val).upper() for val in value.split(",") if val]
-                elif value.find("-") != -1:
-                    # - 表示范围，仅限于数字
-                    value_begin = value.split("-")[0]
-                    value_end = value.split("-")[1]
-                    if value_begin.isdigit() and value_end.isdigit():
-                        # 数字范围
-                        values = [str(val) for val in range(int(value_begin), int(value_end) + 1)]
-                    else:
-                        # 字符串范围
-                        values = [str(value_begin), str(value_end)]
-                else:
-                    values = [str(value).upper()]
-
-                if not set(values).intersection(set(info_values)):
-                    match_flag = False
-            if match_flag:
-                return key
-        return ""
+        return CategoryHelper.match_category(CategoryHelper.compile(categorys), tmdb_info)
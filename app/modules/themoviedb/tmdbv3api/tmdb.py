@@ -10,6 +10,7 @@ import requests.exceptions
 from app.core.cache import cached
 from app.core.config import settings
 from app.utils.http import RequestUtils
+from app.utils.limit import DomainRateLimitRegistry
 from .exceptions import TMDbException
 
 logger = logging.getLogger(__name__)
@@ -178,9 +179,15 @@ class TMDb(object):
             sleep_time = self._reset - current_time
 
             if self.wait_on_rate_limit:
-                logger.warning("达到请求频率限制，休眠：%d 秒..." % sleep_time)
-                time.sleep(abs(sleep_time))
-                return self._request_obj(action, params, call_cached, method, data, json, key)
+                limiter = DomainRateLimitRegistry().get(self.domain)
+                if limiter:
+                    # 暂停该域名的所有请求，重试时在限流器中等待暂停结束
+                    limiter.penalize(abs(sleep_time))
+                else:
+                    logger.warning("达到请求频率限制，休眠：%d 秒..." % sleep_time)
+                    time.sleep(abs(sleep_time))
+                # 缓存中的仍是被限流的响应，重试时不使用缓存
+                return self._request_obj(action, params, False, method, data, json, key)
             else:
                 raise TMDbException("达到请求频率限制，将在 %d 秒后重试..." % sleep_time)
 
@@ -25,7 +25,7 @@ class TransmissionModule(_ModuleBase, _DownloaderBase[Transmission]):
         super().init_service(service_name=Transmission.__name__.lower(),
                              service_type=Transmission)
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
@@ -273,7 +273,7 @@ class TransmissionModule(_ModuleBase, _DownloaderBase[Transmission]):
             for name, server in servers.items():
                 torrents = server.get_downloading_torrents(tags=settings.TORRENT_TAG)
                 for torrent in torrents or []:
-                    meta = MetaInfo(torrent.name)
+                    meta = self.get_torrent_meta(torrent.hashString, torrent.name)
                     dlspeed = torrent.rate_download if hasattr(torrent, "rate_download") else torrent.rateDownload
                     upspeed = torrent.rate_upload if hasattr(torrent, "rate_upload") else torrent.rateUpload
                     ret_torrents.append(DownloadingTorrent(
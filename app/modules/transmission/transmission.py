@@ -1,4 +1,6 @@
-from typing import Optional, Union, Tuple, List, Literal
+import threading
+import time
+from typing import Optional, Union, Tuple, List, Literal, Dict
 
 import transmission_rpc
 from transmission_rpc import Client, Torrent, File
@@ -24,6 +26,11 @@ class Transmission:
               "peersGettingFromUs", "peersSendingToUs", "uploadRatio", "uploadedEver", "downloadedEver", "downloadDir",
               "error", "errorString", "doneDate", "queuePosition", "activityDate", "trackers"]
 
+    # recently-active 只返回最近60秒内有活动的种子，超过该间隔未同步时需全量刷新
+    _recently_active_seconds = 50
+    # 标签、暂停等变更不一定更新活动时间，定期全量刷新
+    _full_sync_interval = 600
+
     def __init__(self, host: Optional[str] = None, port: Optional[int] = None, 
                  username: Optional[str] = None, password: Optional[str] = None, **kwargs):
         """
@@ -43,6 +50,11 @@ class Transmission:
             return
         self._username = username
         self._password = password
+        # 种子状态镜像，通过 recently-active 增量更新
+        self._torrents: Dict[int, Torrent] = {}
+        self._synced_at = 0
+        self._full_synced_at = 0
+        self._sync_lock = threading.Lock()
         if self._host and self._port:
             self.trc = self.__login_transmission()
 
@@ -78,6 +90,35 @@ class Transmission:
         重连
         """
         self.trc = self.__login_transmission()
+        self.__invalidate_torrents()
+
+    def __invalidate_torrents(self):
+        """
+        主动变更种子后，下次同步时全量刷新状态镜像
+        """
+        self._synced_at = 0
+        self._full_synced_at = 0
+
+    def __sync_torrents(self) -> List[Torrent]:
+        """
+        同步种子状态镜像，距上次同步较近时只获取最近有活动的种子和已删除的种子
+        :return: 全部种子
+        """
+        with self._sync_lock:
+            now = time.time()
+            if now - self._synced_at > self._recently_active_seconds \
+                    or now - self._full_synced_at > self._full_sync_interval:
+                torrents = self.trc.get_torrents(arguments=self._trarg)
+                self._torrents = {torrent.id: torrent for torrent in torrents}
+                self._full_synced_at = now
+            else:
+                active_torrents, removed_ids = self.trc.get_recently_active_torrents(arguments=self._trarg)
+                for torrent in active_torrents:
+                    self._torrents[torrent.id] = torrent
+                for torrent_id in removed_ids or []:
+                    self._torrents.pop(torrent_id, None)
+            self._synced_at = now
+            return list(self._torrents.values())
 
     def get_torrents(self, ids: Union[str, list] = None, status: Union[str, list] = None,
                      tags: Union[str, list] = None) -> Tuple[List[Torrent], bool]:
@@ -88,9 +129,14 @@ class Transmission:
         if not self.trc:
             return [], True
         try:
-            torrents = self.trc.get_torrents(ids=ids, arguments=self._trarg)
+            if ids:
+                torrents = self.trc.get_torrents(ids=ids, arguments=self._trarg)
+            else:
+                # 不指定种子时使用增量同步的状态镜像
+                torrents = self.__sync_torrents()
         except Exception as err:
             logger.error(f"获取种子列表出错：{str(err)}")
+            self.__invalidate_torrents()
             return [], True
         if status and not isinstance(status, list):
             status = [status]
@@ -150,6 +196,7 @@ class Transmission:
         if not ids or not tags:
             return False
         try:
+            self.__invalidate_torrents()
             self.trc.change_torrent(labels=list(set((org_tags or []) + tags)), ids=ids)
             return True
         except Exception as err:
@@ -191,6 +238,7 @@ class Transmission:
         if not self.trc:
             return None
         try:
+            self.__invalidate_torrents()
             return self.trc.add_torrent(torrent=content,
                                         download_dir=download_dir,
                                         paused=is_paused,
@@ -207,6 +255,7 @@ class Transmission:
         if not self.trc:
             return False
         try:
+            self.__invalidate_torrents()
             self.trc.start_torrent(ids=ids)
             return True
         except Exception as err:
@@ -220,6 +269,7 @@ class Transmission:
         if not self.trc:
             return False
         try:
+            self.__invalidate_torrents()
             self.trc.stop_torrent(ids=ids)
             return True
         except Exception as err:
@@ -235,6 +285,7 @@ class Transmission:
         if not ids:
             return False
         try:
+            self.__invalidate_torrents()
             self.trc.remove_torrent(delete_data=delete_file, ids=ids)
             return True
         except Exception as err:
@@ -23,7 +23,7 @@ class TrimeMediaModule(_ModuleBase, _MediaServerBase[TrimeMedia]):
             ),
         )
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
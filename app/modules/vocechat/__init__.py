@@ -20,7 +20,7 @@ class VoceChatModule(_ModuleBase, _MessageBase[VoceChat]):
                              service_type=VoceChat)
         self._channel = MessageChannel.VoceChat
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
@@ -20,7 +20,7 @@ class WebPushModule(_ModuleBase, _MessageBase):
         super().init_service(service_name=self.get_name().lower())
         self._channel = MessageChannel.WebPush
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
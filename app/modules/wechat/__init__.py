@@ -24,7 +24,7 @@ class WechatModule(_ModuleBase, _MessageBase[WeChat]):
                              service_type=WeChat)
         self._channel = MessageChannel.Wechat
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
@@ -1,10 +1,11 @@
+import pickle
 import platform
 import re
 import threading
 import traceback
 from pathlib import Path
 from threading import Lock
-from typing import Any, Optional
+from typing import Any, Optional, Dict, Tuple
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from cachetools import TTLCache
@@ -65,9 +66,12 @@ class Monitor(metaclass=Singleton):
     # 定时服务
     _scheduler = None
 
-    # 存储快照
+    # 存储快照，按 存储:监控目录 区分，持久化到本地
     _storage_snapshot = {}
 
+    # 存储快照缓存文件名，保存在配置目录下，避免被临时文件清理删除
+    _snapshot_cache_file = "__storage_snapshot__"
+
     # 存储过照间隔（分钟）
     _snapshot_interval = 5
 
@@ -77,10 +81,12 @@ class Monitor(metaclass=Singleton):
     def __init__(self):
         super().__init__()
         self.all_exts = settings.RMT_MEDIAEXT
+        # 加载上次保存的存储快照
+        self._storage_snapshot = self.__load_snapshot()
         # 启动目录监控和文件整理
         self.init()
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
@@ -103,6 +109,7 @@ class Monitor(metaclass=Singleton):
         # 读取目录配置
         monitor_dirs = DirectoryHelper().get_download_dirs()
         if not monitor_dirs:
+            self.__prune_snapshot(set())
             return
 
         # 按下载目录去重
@@ -112,6 +119,8 @@ class Monitor(metaclass=Singleton):
         self._scheduler = BackgroundScheduler(timezone=settings.TZ)
 
         messagehelper = MessageHelper()
+        # 远程监控目录的快照键
+        snapshot_keys = set()
         for mon_dir in monitor_dirs:
             if not mon_dir.library_path:
                 continue
@@ -155,11 +164,14 @@ class Monitor(metaclass=Singleton):
                     messagehelper.put(f"{mon_path} 启动目录监控失败：{err_msg}", title="目录监控")
             else:
                 # 远程目录监控
+                snapshot_keys.add(f"{mon_dir.storage}:{mon_path.as_posix()}")
                 self._scheduler.add_job(self.polling_observer, 'interval', minutes=self._snapshot_interval,
                                         kwargs={
                                             'storage': mon_dir.storage,
                                             'mon_path': mon_path
                                         })
+        # 清理已不再监控的目录的快照
+        self.__prune_snapshot(snapshot_keys)
         # 启动定时服务
         if self._scheduler.get_jobs():
             self._scheduler.print_jobs()
@@ -191,20 +203,94 @@ class Monitor(metaclass=Singleton):
         轮询监控
         """
         with snapshot_lock:
-            # 快照存储
-            new_snapshot = StorageChain().snapshot_storage(storage=storage, path=mon_path)
+            snapshot_key = f"{storage}:{mon_path.as_posix()}"
+            old_snapshot = self._storage_snapshot.get(snapshot_key)
+            # 快照存储，未变化的目录复用上次快照
+            new_snapshot = StorageChain().snapshot_storage(storage=storage, path=mon_path,
+                                                           last_snapshot=old_snapshot)
             if new_snapshot:
                 # 比较快照
-                old_snapshot = self._storage_snapshot.get(storage)
                 if old_snapshot:
-                    # 新增的文件
-                    new_files = new_snapshot.keys() - old_snapshot.keys()
-                    for new_file in new_files:
-                        # 添加到待整理队列
-                        self.__handle_file(storage=storage, event_path=Path(new_file),
-                                           file_size=new_snapshot.get(new_file))
-                # 更新快照
-                self._storage_snapshot[storage] = new_snapshot
+                    created, modified, deleted = self.__compare_snapshot(old_snapshot, new_snapshot)
+                    for deleted_file in deleted:
+                        logger.debug(f"文件 {deleted_file} 发生了 删除")
+                    for text, changed_files in (("创建", created), ("修改", modified)):
+                        for changed_file, file_info in changed_files.items():
+                            logger.debug(f"文件 {changed_file} 发生了 {text}")
+                            # 添加到待整理队列
+                            self.__handle_file(storage=storage, event_path=Path(changed_file),
+                                               file_size=file_info.get("size"))
+                # 更新快照，无变化时也保存，保证重启后基准快照可用
+                self._storage_snapshot[snapshot_key] = new_snapshot
+                self.__save_snapshot()
+
+    def __prune_snapshot(self, snapshot_keys: set):
+        """
+        清理已不再监控的目录的快照
+        """
+        with snapshot_lock:
+            removed_keys = [key for key in self._storage_snapshot if key not in snapshot_keys]
+            for key in removed_keys:
+                self._storage_snapshot.pop(key, None)
+            if removed_keys:
+                self.__save_snapshot()
+
+    def __snapshot_path(self) -> Path:
+        return settings.CONFIG_PATH / self._snapshot_cache_file
+
+    def __load_snapshot(self) -> dict:
+        """
+        加载存储快照，兼容保存在临时目录中的旧快照
+        """
+        snapshot_path = self.__snapshot_path()
+        if snapshot_path.exists():
+            try:
+                with open(snapshot_path, 'rb') as f:
+                    return pickle.load(f) or {}
+            except Exception as err:
+                logger.error(f"加载存储快照出错：{str(err)}")
+                return {}
+        return MonitorChain.load_cache(self._snapshot_cache_file) or {}
+
+    def __save_snapshot(self):
+        """
+        保存存储快照，需在 snapshot_lock 内调用
+        """
+        snapshot_path = self.__snapshot_path()
+        tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(self._storage_snapshot, f)  # noqa
+            tmp_path.replace(snapshot_path)
+        except Exception as err:
+            logger.error(f"保存存储快照出错：{str(err)}")
+
+    @staticmethod
+    def __compare_snapshot(old_snapshot: Dict[str, dict],
+                           new_snapshot: Dict[str, dict]) -> Tuple[Dict[str, dict], Dict[str, dict], Dict[str, dict]]:
+        """
+        比较两次快照，返回新增、修改、删除的文件
+        """
+
+        def __flatten(_snapshot: Dict[str, dict]) -> Dict[str, dict]:
+            files = {}
+            for dir_info in _snapshot.values():
+                files.update(dir_info.get("files") or {})
+            return files
+
+        old_files = __flatten(old_snapshot)
+        new_files = __flatten(new_snapshot)
+        created = {path: info for path, info in new_files.items() if path not in old_files}
+        deleted = {path: info for path, info in old_files.items() if path not in new_files}
+        modified = {}
+        for path, info in new_files.items():
+            old_info = old_files.get(path)
+            if not old_info:
+                continue
+            if old_info.get("size") != info.get("size") \
+                    or old_info.get("modify_time") != info.get("modify_time"):
+                modified[path] = info
+        return created, modified, deleted
 
     def event_handler(self, event, text: str, event_path: str, file_size: float = None):
         """
@@ -56,7 +56,7 @@ class Scheduler(metaclass=Singleton):
     def __init__(self):
         self.init()
 
-    @eventmanager.register(EventType.ConfigChanged)
+    @eventmanager.register(EventType.ConfigChanged, readonly=True)
     def handle_config_changed(self, event: Event):
         """
         处理配置变更事件
@@ -8,6 +8,7 @@ from app.startup.command_initializer import init_command, stop_command, restart_
 from app.startup.memory_initializer import init_memory_manager, stop_memory_manager
 from app.startup.modules_initializer import init_modules, stop_modules
 from app.startup.monitor_initializer import stop_monitor, init_monitor
+from app.startup.orchestrator import StartupOrchestrator
 from app.startup.plugins_initializer import init_plugins, stop_plugins, sync_plugins
 from app.startup.routers_initializer import init_routers
 from app.startup.scheduler_initializer import stop_scheduler, init_scheduler, init_plugin_scheduler
@@ -30,30 +31,40 @@ async def init_extra():
     SystemChain().restart_finish()
 
 
+def init_all_plugins():
+    """
+    恢复插件备份并初始化插件
+    """
+    # 恢复插件备份
+    SystemChain().restore_plugins()
+    # 初始化插件
+    init_plugins()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     定义应用的生命周期事件
     """
     print("Starting up...")
+    startup = StartupOrchestrator()
     # 初始化模块
-    init_modules()
+    startup.add("初始化模块", init_modules)
     # 初始化路由
-    init_routers(app)
-    # 恢复插件备份
-    SystemChain().restore_plugins()
-    # 初始化插件
-    init_plugins()
+    startup.add("初始化路由", lambda: init_routers(app), depends=["初始化模块"])
+    # 恢复插件备份并初始化插件，插件代码可能依赖事件循环，在主线程中执行
+    startup.add("初始化插件", init_all_plugins, depends=["初始化路由"], main_thread=True)
     # 初始化定时器
-    init_scheduler()
+    startup.add("初始化定时器", init_scheduler, depends=["初始化插件"])
     # 初始化监控器
-    init_monitor()
+    startup.add("初始化监控器", init_monitor, depends=["初始化模块"])
     # 初始化命令
-    init_command()
+    startup.add("初始化命令", init_command, depends=["初始化定时器"])
     # 初始化工作流
-    init_workflow()
+    startup.add("初始化工作流", init_workflow, depends=["初始化模块"])
     # 初始化内存管理
-    init_memory_manager()
+    startup.add("初始化内存管理", init_memory_manager)
+    startup.run()
     # 插件同步到本地
     sync_plugins_task = asyncio.create_task(init_extra())
     try:
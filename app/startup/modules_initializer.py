@@ -21,10 +21,11 @@ from app.helper.thread import ThreadHelper
 from app.helper.display import DisplayHelper
 from app.helper.doh import DohHelper
 from app.helper.resource import ResourceHelper
-from app.helper.message import MessageHelper
+from app.helper.message import MessageHelper, MessageQueueManager
 from app.schemas import Notification, NotificationType
 from app.schemas.types import SystemConfigKey
 from app.db import close_database
+from app.db.site_oper import SiteOper
 from app.db.systemconfig_oper import SystemConfigOper
 
 
@@ -109,6 +110,8 @@ def stop_modules():
     """
     服务关闭
     """
+    # 发送等待合并的消息，在时限内等待队列中的消息发送完成
+    MessageQueueManager().stop()
     # 停止模块
     ModuleManager().stop()
     # 停止事件消费
@@ -119,6 +122,8 @@ def stop_modules():
     ThreadHelper().shutdown()
     # 停止缓存连接
     close_cache()
+    # 写入站点访问统计
+    SiteOper().flush_statistic()
     # 停止数据库连接
     close_database()
     # 停止前端服务
@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, Future
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.log import logger
+
+
+class StartupStep:
+    """
+    启动步骤
+    """
+
+    def __init__(self, name: str, func: Callable[[], None],
+                 depends: Optional[List[str]] = None, main_thread: bool = False):
+        # 步骤名称
+        self.name = name
+        # 执行方法
+        self.func = func
+        # 依赖的步骤
+        self.depends = depends or []
+        # 是否必须在调用线程中执行
+        self.main_thread = main_thread
+
+
+class StartupOrchestrator:
+    """
+    启动编排，按依赖关系执行各初始化步骤，相互独立的步骤并发执行，并记录各步骤耗时
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, StartupStep] = {}
+        # 各步骤耗时（秒）
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, func: Callable[[], None],
+            depends: Optional[List[str]] = None, main_thread: bool = False):
+        """
+        添加启动步骤
+        :param name: 步骤名称
+        :param func: 执行方法
+        :param depends: 依赖的步骤名称，依赖步骤全部完成后才会执行
+        :param main_thread: 是否必须在调用线程中执行
+        """
+        self._steps[name] = StartupStep(name=name, func=func, depends=depends, main_thread=main_thread)
+
+    def __run_step(self, step: StartupStep):
+        """
+        执行启动步骤并记录耗时
+        """
+        start = time.perf_counter()
+        try:
+            step.func()
+        finally:
+            self.timings[step.name] = time.perf_counter() - start
+            logger.info(f"{step.name}完成，耗时 {self.timings[step.name]:.2f} 秒")
+
+    def run(self):
+        """
+        执行所有启动步骤，任一步骤失败时不再执行新的步骤，等待已开始的步骤结束后抛出异常
+        """
+        start = time.perf_counter()
+        pending = dict(self._steps)
+        done = set()
+        running: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+        workers = max(1, settings.STARTUP_PARALLEL_WORKERS or 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="startup") as executor:
+            while pending or running:
+                ready = [step for step in pending.values() if all(dep in done for dep in step.depends)]
+                for step in ready:
+                    if not step.main_thread:
+                        pending.pop(step.name)
+                        running[executor.submit(self.__run_step, step)] = step.name
+                # 调用线程中每次执行一个步骤，执行后重新检查可并发的步骤
+                main_step = next((step for step in ready if step.main_thread), None)
+                if main_step:
+                    pending.pop(main_step.name)
+                    try:
+                        self.__run_step(main_step)
+                        done.add(main_step.name)
+                    except Exception as err:
+                        error = err
+                        break
+                    continue
+                if not running:
+                    error = RuntimeError(f"启动步骤的依赖无法满足：{', '.join(pending)}")
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception():
+                        error = error or future.exception()
+                    else:
+                        done.add(name)
+                if error:
+                    break
+        if error:
+            raise error
+        logger.info(f"启动完成，总耗时 {time.perf_counter() - start:.2f} 秒")
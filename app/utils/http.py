@@ -1,5 +1,7 @@
 import re
+import time
 from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 from typing import Any, Optional, Union
 
 import chardet
@@ -9,6 +11,7 @@ from requests import Response, Session
 from urllib3.exceptions import InsecureRequestWarning
 
 from app.log import logger
+from app.utils.limit import DomainRateLimitRegistry
 
 urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -73,13 +76,29 @@ class RequestUtils:
         kwargs.setdefault("timeout", self._timeout)
         kwargs.setdefault("verify", False)
         kwargs.setdefault("stream", False)
+        # 按域名限流
+        limiter = DomainRateLimitRegistry().get_by_url(url)
+        if limiter:
+            timeout = kwargs.get("timeout")
+            max_wait = max(timeout) if isinstance(timeout, tuple) else timeout
+            if not limiter.acquire(timeout=max_wait):
+                logger.debug(f"请求失败: {limiter.domain} 请求排队超时")
+                if raise_exception:
+                    raise requests.exceptions.Timeout(f"{limiter.domain} 请求排队超时")
+                return None
         try:
-            return req_method(method, url, **kwargs)
+            response = req_method(method, url, **kwargs)
+            if limiter and response is not None and response.status_code == 429:
+                limiter.penalize(self.parse_retry_after(response.headers.get("Retry-After")))
+            return response
         except requests.exceptions.RequestException as e:
             logger.debug(f"请求失败: {e}")
             if raise_exception:
                 raise
             return None
+        finally:
+            if limiter:
+                limiter.release()
 
     def get(self, url: str, params: dict = None, **kwargs) -> Optional[str]:
         """
@@ -270,6 +289,24 @@ class RequestUtils:
             return [{"name": k, "value": v} for k, v in cookie_dict.items()]
         return cookie_dict
 
+    @staticmethod
+    def parse_retry_after(header: Optional[str], default: float = 5.0) -> float:
+        """
+        解析 Retry-After 响应头
+        :param header: 秒数或HTTP日期
+        :param default: 无法解析时的默认等待时间（秒）
+        :return: 需要等待的秒数
+        """
+        if not header:
+            return default
+        header = header.strip()
+        if header.isdigit():
+            return float(header)
+        try:
+            return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return default
+
     @staticmethod
     def parse_cache_control(header: str) -> (str, int):
         """
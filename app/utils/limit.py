@@ -1,11 +1,15 @@
 import functools
+import ipaddress
 import threading
 import time
 from collections import deque
-from typing import Any, Tuple, List, Callable, Optional
+from typing import Any, Tuple, List, Callable, Optional, Dict
+from urllib.parse import urlsplit
 
+from app.core.config import settings
 from app.log import logger
 from app.schemas import RateLimitExceededException, LimitException
+from app.utils.singleton import Singleton
 
 
 # 抽象基类
@@ -347,3 +351,256 @@ def rate_limit_window(max_calls: int, window_seconds: float,
     limiter = WindowRateLimiter(max_calls, window_seconds, source, enable_logging)
     # 使用通用装饰器逻辑包装该限流器
     return rate_limit_handler(limiter, raise_on_limit)
+
+
+# 域名请求限流器
+class DomainRateLimiter:
+    """
+    单个域名的请求限流，令牌桶控制请求速率，信号量控制并发数
+    请求排队时按令牌顺序依次放行，被站点限流后暂停该域名的所有请求
+    """
+
+    # 单次暂停的最长时间（秒）
+    _max_penalty = 300
+
+    def __init__(self, domain: str, rate: float, burst: int, concurrency: int):
+        """
+        :param domain: 域名
+        :param rate: 每秒请求数，0为不限制
+        :param burst: 允许的突发请求数
+        :param concurrency: 最大并发请求数，0为不限制
+        """
+        self.domain = domain
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.concurrency = concurrency
+        self.lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        # 暂停请求直到该时间
+        self._blocked_until = 0.0
+        self._semaphore = threading.BoundedSemaphore(concurrency) if concurrency > 0 else None
+        # 正在等待的请求数
+        self.waiting = 0
+        # 正在进行的请求数
+        self.active = 0
+        # 请求总数
+        self.total = 0
+        # 需要等待的请求数
+        self.throttled = 0
+        # 等待超时被拒绝的请求数
+        self.rejected = 0
+        # 被站点限流的次数
+        self.limited = 0
+
+    def __reserve(self, max_wait: float) -> Optional[Tuple[float, float]]:
+        """
+        预定一个令牌
+        :param max_wait: 排队的最长等待时间，不包括被站点限流后的暂停时间
+        :return: (需要等待的时间, 其中暂停的时间)，排队超过最长等待时间时返回None
+        """
+        with self.lock:
+            now = time.monotonic()
+            blocked = max(0.0, self._blocked_until - now)
+            wait = 0.0
+            if self.rate > 0:
+                self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                self.rejected += 1
+                return None
+            if self.rate > 0:
+                self._tokens -= 1
+            self.total += 1
+            if wait > 0 or blocked > 0:
+                self.throttled += 1
+            return max(wait, blocked), blocked
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        获取请求许可，需要时阻塞等待
+        被站点限流暂停期间会一直等待暂停结束，不计入等待时间
+        :param timeout: 排队的最长等待时间（秒），为空时一直等待
+        :return: 是否获取成功，成功后必须调用release
+        """
+        start = time.monotonic()
+        reserved = self.__reserve(timeout)
+        if reserved is None:
+            return False
+        wait, blocked = reserved
+        with self.lock:
+            self.waiting += 1
+        try:
+            if wait > 0:
+                time.sleep(wait)
+            if self._semaphore:
+                remaining = None if timeout is None \
+                    else max(0.0, timeout + blocked - (time.monotonic() - start))
+                if not self._semaphore.acquire(timeout=remaining):
+                    with self.lock:
+                        self.rejected += 1
+                    return False
+        finally:
+            with self.lock:
+                self.waiting -= 1
+        with self.lock:
+            self.active += 1
+        return True
+
+    def release(self):
+        """
+        释放请求许可
+        """
+        with self.lock:
+            self.active -= 1
+        if self._semaphore:
+            self._semaphore.release()
+
+    def penalize(self, seconds: float):
+        """
+        被站点限流时暂停该域名的请求
+        :param seconds: 暂停时间（秒）
+        """
+        if not seconds or seconds <= 0:
+            return
+        seconds = min(seconds, self._max_penalty)
+        with self.lock:
+            self.limited += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            # 恢复后从零开始积累令牌，避免恢复瞬间的集中请求
+            self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"[{self.domain}] 触发站点限流，暂停请求 {seconds:.2f} 秒")
+
+    def stats(self) -> dict:
+        """
+        限流状态
+        """
+        with self.lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "concurrency": self.concurrency,
+                "waiting": self.waiting,
+                "active": self.active,
+                "total": self.total,
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "limited": self.limited,
+                "blocked": max(0.0, round(self._blocked_until - time.monotonic(), 2))
+            }
+
+
+# 域名限流注册表
+class DomainRateLimitRegistry(metaclass=Singleton):
+    """
+    进程内按域名共享的请求限流，所有 RequestUtils 请求发出前都会经过对应域名的限流器
+    """
+
+    def __init__(self):
+        self._limiters: Dict[str, DomainRateLimiter] = {}
+        # 单独设置的域名限流参数 {域名: (每秒请求数, 突发请求数, 并发数)}
+        self._configs: Dict[str, Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_domain(url: str) -> Optional[str]:
+        """
+        获取URL中的域名
+        """
+        try:
+            return urlsplit(url).hostname
+        except ValueError:
+            return None
+
+    @staticmethod
+    def is_local(domain: str) -> bool:
+        """
+        是否为本地或内网地址，如局域网中的下载器、媒体服务器
+        """
+        if domain == "localhost" or "." not in domain:
+            return True
+        try:
+            address = ipaddress.ip_address(domain)
+        except ValueError:
+            return False
+        return address.is_private or address.is_loopback or address.is_link_local
+
+    def __service_domains(self) -> set:
+        """
+        已配置的下载器及媒体服务器的域名
+        """
+        # 避免循环导入
+        from app.helper.service import ServiceConfigHelper
+        domains = set()
+        try:
+            configs = ServiceConfigHelper.get_downloader_configs() + ServiceConfigHelper.get_mediaserver_configs()
+        except Exception as err:
+            logger.debug(f"获取下载器及媒体服务器配置失败：{str(err)}")
+            return domains
+        for conf in configs:
+            host = (conf.config or {}).get("host")
+            if not host:
+                continue
+            if "://" not in host:
+                host = f"http://{host}"
+            domain = self.get_domain(host)
+            if domain:
+                domains.add(domain.lower())
+        return domains
+
+    def configure(self, domain: str, rate: float, burst: int, concurrency: int):
+        """
+        单独设置域名的限流参数
+        :param domain: 域名
+        :param rate: 每秒请求数，0为不限制
+        :param burst: 允许的突发请求数
+        :param concurrency: 最大并发请求数，0为不限制
+        """
+        domain = domain.lower()
+        with self._lock:
+            self._configs[domain] = (rate, burst, concurrency)
+            self._limiters.pop(domain, None)
+
+    def get(self, domain: str) -> Optional[DomainRateLimiter]:
+        """
+        获取域名的限流器，未开启限流或本地地址时返回None
+        """
+        if not domain:
+            return None
+        domain = domain.lower()
+        if domain in self._limiters:
+            return self._limiters[domain]
+        with self._lock:
+            if domain in self._limiters:
+                return self._limiters[domain]
+            limiter = None
+            config = self._configs.get(domain)
+            # 本地及内网地址、下载器及媒体服务器默认不限流
+            if not config and not self.is_local(domain) and domain not in self.__service_domains():
+                config = (settings.REQUEST_DOMAIN_RATE,
+                          settings.REQUEST_DOMAIN_BURST,
+                          settings.REQUEST_DOMAIN_CONCURRENCY)
+            if config:
+                rate, burst, concurrency = config
+                if rate or concurrency:
+                    limiter = DomainRateLimiter(domain, rate=rate or 0, burst=burst or 1,
+                                                concurrency=concurrency or 0)
+            # 不限流的域名也记录下来，避免重复判断
+            self._limiters[domain] = limiter
+            return limiter
+
+    def get_by_url(self, url: str) -> Optional[DomainRateLimiter]:
+        """
+        获取URL对应域名的限流器
+        """
+        return self.get(self.get_domain(url))
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        各域名的限流状态
+        """
+        with self._lock:
+            limiters = [limiter for limiter in self._limiters.values() if limiter]
+        return {limiter.domain: limiter.stats() for limiter in limiters}
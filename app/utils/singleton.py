@@ -1,4 +1,5 @@
 import abc
+import threading
 
 
 class Singleton(abc.ABCMeta, type):
@@ -7,11 +8,18 @@ class Singleton(abc.ABCMeta, type):
     """
 
     _instances: dict = {}
+    # 各实例的创建锁，避免多线程同时创建多个实例
+    _creation_locks: dict = {}
+    _creation_lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
         key = (cls, args, frozenset(kwargs.items()))
         if key not in cls._instances:
-            cls._instances[key] = super().__call__(*args, **kwargs)
+            with Singleton._creation_lock:
+                lock = Singleton._creation_locks.setdefault(key, threading.RLock())
+            with lock:
+                if key not in cls._instances:
+                    cls._instances[key] = super().__call__(*args, **kwargs)
         return cls._instances[key]
 
 
@@ -28,15 +36,22 @@ class SingletonClass(abc.ABCMeta, type):
     """
 
     _instances: dict = {}
+    # 各类的创建锁，避免多线程同时创建多个实例
+    _creation_locks: dict = {}
+    _creation_lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            cls._instances[cls] = super(SingletonClass, cls).__call__(*args, **kwargs)
+            with SingletonClass._creation_lock:
+                lock = SingletonClass._creation_locks.setdefault(cls, threading.RLock())
+            with lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super(SingletonClass, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
 
 
 class AbstractSingletonClass(abc.ABC, metaclass=SingletonClass):
     """
-    抽像类单例模式（按类）
+    抽像类单例模式
     """
     pass
@@ -1,15 +1,15 @@
 import datetime
+import errno
 import hashlib
 import os
 import platform
-import re
 import shutil
 import subprocess
 import sys
 import uuid
-from glob import glob
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Callable, Iterator, List, Optional, Tuple, Union
 
 import psutil
 
@@ -112,45 +112,165 @@ class SystemUtils:
         else:
             return "Linux"
 
+    # 文件复制时每次提交给内核的字节数
+    _copy_chunk_size = 64 * 1024 * 1024
+
+    # 续传前逐块校验已复制数据时每次读取的字节数
+    _copy_verify_size = 8 * 1024 * 1024
+
+    # Linux FICLONE ioctl，用于支持写时复制的文件系统（btrfs/xfs等）
+    _FICLONE = 0x40049409
+
     @staticmethod
-    def copy(src: Path, dest: Path) -> Tuple[int, str]:
+    def copy(src: Path, dest: Path,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> Tuple[int, str]:
         """
         复制
+        :param src: 源文件
+        :param dest: 目标文件
+        :param progress_callback: 进度回调，参数为（已复制字节数，总字节数）
         """
         try:
-            shutil.copy2(src, dest)
+            SystemUtils.__copy_file(src, dest, progress_callback)
             return 0, ""
         except Exception as err:
             return -1, str(err)
 
     @staticmethod
-    def move(src: Path, dest: Path) -> Tuple[int, str]:
+    def move(src: Path, dest: Path,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> Tuple[int, str]:
         """
         移动
+        :param src: 源文件
+        :param dest: 目标文件
+        :param progress_callback: 跨磁盘移动时的复制进度回调，参数为（已复制字节数，总字节数）
         """
         try:
             # 当前目录改名
             temp = src.replace(src.parent / dest.name)
-            # 移动到目标目录
-            shutil.move(temp, dest)
+            # 移动到目标目录，同一文件系统直接改名，跨文件系统时复制后删除
+            shutil.move(temp, dest,
+                        copy_function=lambda _src, _dest: SystemUtils.__copy_file(Path(_src), Path(_dest),
+                                                                                  progress_callback))
             return 0, ""
         except Exception as err:
             return -1, str(err)
 
+    @staticmethod
+    def __reflink(src_fd: int, dest_fd: int) -> bool:
+        """
+        尝试使用写时复制克隆文件，文件系统不支持时返回False
+        """
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            import fcntl
+            fcntl.ioctl(dest_fd, SystemUtils._FICLONE, src_fd)
+            return True
+        except (ImportError, OSError):
+            return False
+
+    @staticmethod
+    def __resume_offset(src: Path, part: Path, total: int) -> int:
+        """
+        计算未完成文件可续传的位置，逐块比对已复制数据与源文件，从第一个不一致的数据块开始续传
+        """
+        if not part.exists():
+            return 0
+        offset = part.stat().st_size
+        if offset <= 0 or offset > total:
+            return 0
+        verified = 0
+        with open(src, "rb") as fsrc, open(part, "rb") as fpart:
+            while verified < offset:
+                size = min(SystemUtils._copy_verify_size, offset - verified)
+                if fsrc.read(size) != fpart.read(size):
+                    break
+                verified += size
+        return verified
+
+    @staticmethod
+    def __copy_file(src: Path, dest: Path, progress_callback: Optional[Callable[[int, int], None]] = None):
+        """
+        复制文件，优先使用内核零拷贝（写时复制克隆 > copy_file_range > sendfile），不支持时回退到用户态复制；
+        复制过程写入 .part 临时文件，中断后再次复制同一文件时校验已复制部分并续传，完成后保留源文件元数据并改名；
+        零拷贝在文件末尾前返回0时（如部分网络及虚拟文件系统）依次回退到 sendfile 和用户态复制
+        """
+        total = src.stat().st_size
+        part = dest.with_name(dest.name + ".part")
+        offset = SystemUtils.__resume_offset(src, part, total)
+        with open(src, "rb") as fsrc, open(part, "r+b" if offset else "wb") as fdst:
+            src_fd, dest_fd = fsrc.fileno(), fdst.fileno()
+            fdst.truncate(offset)
+            if not offset and SystemUtils.__reflink(src_fd, dest_fd):
+                offset = total
+            use_copy_file_range = hasattr(os, "copy_file_range")
+            use_sendfile = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+            buffer = None
+            while offset < total:
+                size = min(SystemUtils._copy_chunk_size, total - offset)
+                copied = 0
+                if use_copy_file_range:
+                    try:
+                        copied = os.copy_file_range(src_fd, dest_fd, size, offset, offset)
+                    except OSError as err:
+                        if err.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                                             errno.EOPNOTSUPP, errno.EPERM, errno.EBADF):
+                            raise
+                        use_copy_file_range = False
+                        continue
+                    if not copied:
+                        # 未到文件末尾却没有复制任何数据，该文件系统不支持，回退到其它方式
+                        use_copy_file_range = False
+                        continue
+                elif use_sendfile:
+                    try:
+                        fdst.seek(offset)
+                        copied = os.sendfile(dest_fd, src_fd, offset, size)
+                    except OSError as err:
+                        if err.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                            raise
+                        use_sendfile = False
+                        continue
+                    if not copied:
+                        use_sendfile = False
+                        continue
+                else:
+                    if buffer is None:
+                        buffer = bytearray(min(SystemUtils._copy_chunk_size, 8 * 1024 * 1024))
+                    fsrc.seek(offset)
+                    read = fsrc.readinto(buffer)
+                    if read:
+                        fdst.seek(offset)
+                        copied = fdst.write(memoryview(buffer)[:read])
+                if not copied:
+                    raise IOError(f"复制 {src} 时源文件意外结束：{offset}/{total}")
+                offset += copied
+                if progress_callback:
+                    progress_callback(offset, total)
+        shutil.copystat(src, part)
+        os.replace(part, dest)
+        if progress_callback:
+            progress_callback(total, total)
+
     @staticmethod
     def link(src: Path, dest: Path) -> Tuple[int, str]:
         """
         硬链接
         """
         try:
-            # 准备目标路径，增加后缀 .mp
+            # 目标不存在时直接创建硬链接，只需一次系统调用
+            try:
+                dest.hardlink_to(src)
+                return 0, ""
+            except FileExistsError:
+                pass
+            # 目标已存在，先链接到临时文件（增加后缀 .mp）再原子替换
             tmp_path = dest.with_suffix(dest.suffix + ".mp")
-            # 检查目标路径是否已存在，如果存在则先unlink
-            if tmp_path.exists():
-                tmp_path.unlink()
+            tmp_path.unlink(missing_ok=True)
             tmp_path.hardlink_to(src)
             # 硬链接完成，移除 .mp 后缀
-            shutil.move(tmp_path, dest)
+            os.replace(tmp_path, dest)
             return 0, ""
         except Exception as err:
             return -1, str(err)
@@ -166,50 +286,134 @@ class SystemUtils:
         except Exception as err:
             return -1, str(err)
 
+    @staticmethod
+    def __match_extensions(extensions: Optional[list]) -> Optional[Callable[[str], bool]]:
+        """
+        将扩展名列表编译为文件名匹配函数，单一后缀使用集合查找，复合后缀（如 .tar.gz）使用后缀匹配
+        :param extensions: 扩展名列表，例如 ['.mkv', 'mp4']，不区分大小写
+        :return: 匹配函数，不限制扩展名时返回 None
+        """
+        if not extensions:
+            return None
+        suffixes = {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions if ext}
+        simple = {suffix for suffix in suffixes if suffix.count(".") == 1}
+        compound = tuple(suffixes - simple)
+
+        def match(name: str) -> bool:
+            name = name.lower()
+            pos = name.rfind(".")
+            if pos != -1 and name[pos:] in simple:
+                return True
+            return bool(compound) and name.endswith(compound)
+
+        return match
+
+    @staticmethod
+    def __scandir(directory: Union[Path, str], recursive: bool = True) -> Iterator[os.DirEntry]:
+        """
+        基于 os.scandir 遍历目录下的文件（包括隐藏文件），复用 scandir 已返回的文件类型和 stat 信息
+        :param directory: 目录
+        :param recursive: 是否递归子目录
+        :return: 文件 DirEntry 迭代器，无权限访问的目录会被跳过
+        """
+        stack = [str(directory)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                if recursive:
+                                    subdirs.append(entry.path)
+                            elif entry.is_file():
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            # 保持子目录按目录内顺序遍历
+            stack.extend(reversed(subdirs))
+
+    @staticmethod
+    def walk_files(directory: Path, extensions: list = None, min_filesize: int = 0,
+                   recursive: bool = True) -> Iterator[os.DirEntry]:
+        """
+        遍历目录下所有指定扩展名的文件，按需逐个返回，可随时中止以提前结束遍历
+        :param directory: 指定的父目录
+        :param extensions: 需要包含的扩展名列表，例如 ['.mkv', '.mp4']
+        :param min_filesize: 文件最低大小，单位 MB
+        :param recursive: 是否递归查找，可选参数，默认 True
+        :return: 文件 DirEntry 迭代器，entry.stat() 的结果会被缓存
+        """
+        match = SystemUtils.__match_extensions(extensions)
+        min_size = (min_filesize or 0) * 1024 * 1024
+        for entry in SystemUtils.__scandir(directory, recursive=recursive):
+            if match and not match(entry.name):
+                continue
+            if min_size:
+                try:
+                    if entry.stat().st_size < min_size:
+                        continue
+                except OSError:
+                    continue
+            yield entry
+
     @staticmethod
     def list_files(directory: Path, extensions: list = None,
-                   min_filesize: int = 0, recursive: bool = True) -> List[Path]:
+                   min_filesize: int = 0, recursive: bool = True, max_workers: int = 4) -> List[Path]:
         """
         获取目录下所有指定扩展名的文件（包括子目录）
         :param directory: 指定的父目录
         :param extensions: 需要包含的扩展名列表，例如 ['mkv', 'mp4']
         :param min_filesize: 文件最低大小，单位 MB
         :param recursive: 是否递归查找，可选参数，默认 True
+        :param max_workers: 递归查找时并发遍历一级子目录的线程数，为 1 时不并发
         :return: 文件 Path 列表
         """
-
-        if not min_filesize:
-            min_filesize = 0
-
         if not directory.exists():
             return []
 
         if directory.is_file():
             return [directory]
 
-        if not min_filesize:
-            min_filesize = 0
-
-        files = []
-        if extensions:
-            pattern = r".*(" + "|".join(extensions) + ")$"
-        else:
-            pattern = r".*"
-
-        # 遍历目录及子目录
-        for matched_glob in glob('**', root_dir=directory, recursive=recursive, include_hidden=True):
-            path = directory.joinpath(matched_glob)
-            if path.is_file() \
-                    and re.match(pattern, path.name, re.IGNORECASE) \
-                    and path.stat().st_size >= min_filesize * 1024 * 1024:
-                files.append(path)
+        if not recursive or max_workers <= 1:
+            return [Path(entry.path) for entry in SystemUtils.walk_files(directory, extensions=extensions,
+                                                                         min_filesize=min_filesize,
+                                                                         recursive=recursive)]
 
+        # 先处理当前目录下的文件，一级子目录分发到线程池中并发遍历
+        files = [Path(entry.path) for entry in SystemUtils.walk_files(directory, extensions=extensions,
+                                                                      min_filesize=min_filesize,
+                                                                      recursive=False)]
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            subdirs.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            return files
+        if not subdirs:
+            return files
+
+        def __list_subdir(subdir: str) -> List[Path]:
+            return [Path(entry.path) for entry in SystemUtils.walk_files(Path(subdir), extensions=extensions,
+                                                                         min_filesize=min_filesize)]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(subdirs))) as executor:
+            for sub_files in executor.map(__list_subdir, subdirs):
+                files.extend(sub_files)
         return files
 
     @staticmethod
     def exits_files(directory: Path, extensions: list, min_filesize: int = 0, recursive: bool = True) -> bool:
         """
-        判断目录下是否存在指定扩展名的文件
+        判断目录下是否存在指定扩展名的文件，找到第一个符合条件的文件即返回
 
         :param directory: 指定的父目录
         :param extensions: 需要包含的扩展名列表，例如 ['mkv', 'mp4']
@@ -217,28 +421,15 @@ class SystemUtils:
         :param recursive: 是否递归查找，可选参数，默认 True
         :return: True存在 False不存在
         """
-
-        if not min_filesize:
-            min_filesize = 0
-
         if not directory.exists():
             return False
 
         if directory.is_file():
             return True
 
-        if not min_filesize:
-            min_filesize = 0
-
-        pattern = r".*(" + "|".join(extensions) + ")$"
-
-        # 遍历目录及子目录
-        for matched_glob in glob('**', root_dir=directory, recursive=recursive, include_hidden=True):
-            path = directory.joinpath(matched_glob)
-            if path.is_file() \
-                    and re.match(pattern, path.name, re.IGNORECASE) \
-                    and path.stat().st_size >= min_filesize * 1024 * 1024:
-                return True
+        for _ in SystemUtils.walk_files(directory, extensions=extensions,
+                                        min_filesize=min_filesize, recursive=recursive):
+            return True
 
         return False
 
@@ -253,15 +444,8 @@ class SystemUtils:
         if directory.is_file():
             return [directory]
 
-        files = []
-        pattern = r".*(" + "|".join(extensions) + ")$"
-
-        # 遍历目录
-        for path in directory.iterdir():
-            if path.is_file() and re.match(pattern, path.name, re.IGNORECASE):
-                files.append(path)
-
-        return files
+        return [Path(entry.path) for entry in SystemUtils.walk_files(directory, extensions=extensions,
+                                                                     recursive=False)]
 
     @staticmethod
     def list_sub_directory(directory: Path) -> List[Path]:
@@ -298,14 +482,7 @@ class SystemUtils:
         if directory.is_file():
             return [directory]
 
-        items = []
-
-        # 遍历目录
-        for path in directory.iterdir():
-            if path.is_file():
-                items.append(path)
-
-        return items
+        return [Path(entry.path) for entry in SystemUtils.walk_files(directory, recursive=False)]
 
     @staticmethod
     def get_directory_size(path: Path) -> float:
@@ -323,9 +500,11 @@ class SystemUtils:
         if path.is_file():
             return path.stat().st_size
         total_size = 0
-        for path in path.glob('**/*'):
-            if path.is_file():
-                total_size += path.stat().st_size
+        for entry in SystemUtils.walk_files(path):
+            try:
+                total_size += entry.stat().st_size
+            except OSError:
+                continue
 
         return total_size
 
@@ -457,14 +636,16 @@ class SystemUtils:
                 # 如果是文件，直接比较文件
                 return src.samefile(dest)
             else:
-                for src_file in src.glob("**/*"):
-                    if src_file.is_dir():
-                        continue
+                for src_entry in SystemUtils.walk_files(src):
                     # 计算目标文件路径
-                    relative_path = src_file.relative_to(src)
-                    target_file = dest.joinpath(relative_path)
-                    # 检查是否是硬链接
-                    if not target_file.exists() or not src_file.samefile(target_file):
+                    target_file = dest.joinpath(os.path.relpath(src_entry.path, src))
+                    # 检查是否是硬链接，源文件复用遍历时的 stat 信息（Windows 下 scandir 不返回 inode）
+                    try:
+                        src_stat = os.stat(src_entry.path) if SystemUtils.is_windows() else src_entry.stat()
+                        target_stat = target_file.stat()
+                    except OSError:
+                        return False
+                    if (src_stat.st_ino, src_stat.st_dev) != (target_stat.st_ino, target_stat.st_dev):
                         return False
                 return True
         except Exception as e:
@@ -1,7 +1,10 @@
 import unittest
 
 from tests.test_bluray import BluRayTest
+from tests.test_category import CategoryTest
 from tests.test_metainfo import MetaInfoTest
+from tests.test_ratelimit import RateLimitTest
+from tests.test_torrentinfo import TorrentInfoTest
 
 if __name__ == '__main__':
     suite = unittest.TestSuite()
@@ -13,6 +16,25 @@ if __name__ == '__main__':
     # 测试蓝光目录识别
     suite.addTest(BluRayTest())
 
+    # 测试种子信息序列化
+    suite.addTest(TorrentInfoTest('test_pickle'))
+    suite.addTest(TorrentInfoTest('test_copy'))
+    suite.addTest(TorrentInfoTest('test_dict'))
+    suite.addTest(TorrentInfoTest('test_from_dict_partial'))
+    suite.addTest(TorrentInfoTest('test_old_pickle'))
+
+    # 测试二级分类
+    suite.addTest(CategoryTest('test_get_category'))
+    suite.addTest(CategoryTest('test_compile_match'))
+    suite.addTest(CategoryTest('test_empty'))
+
+    # 测试域名限流
+    suite.addTest(RateLimitTest('test_parse_retry_after'))
+    suite.addTest(RateLimitTest('test_rate'))
+    suite.addTest(RateLimitTest('test_concurrency'))
+    suite.addTest(RateLimitTest('test_penalize'))
+    suite.addTest(RateLimitTest('test_registry'))
+
     # 运行测试
     runner = unittest.TextTestRunner()
     runner.run(suite)
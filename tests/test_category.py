@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from app.modules.themoviedb.category import CategoryHelper
+
+categorys = {
+    "动画电影": {"genre_ids": "16"},
+    "华语电影": {"original_language": "zh,cn,bo,za"},
+    "老电影": {"release_year": "1900-1999"},
+    "美英电影": {"production_countries": "US-GB"},
+    "小写范围": {"original_language": "en-fr"},
+    "日韩合拍": {"production_countries": "JP,KR", "genre_ids": "18,10749"},
+    "外语电影": None,
+}
+
+category_cases = [
+    # 逗号分隔的多个值，列表中任一值命中即可
+    ({"genre_ids": [28, 16]}, "动画电影"),
+    ({"genre_ids": [28], "original_language": "ZH"}, "华语电影"),
+    ({"genre_ids": [28], "original_language": "bo"}, "华语电影"),
+    # 数字范围，包括首尾
+    ({"release_date": "1999-12-31"}, "老电影"),
+    ({"release_date": "1900-01-01"}, "老电影"),
+    ({"first_air_date": "1985-06-01"}, "老电影"),
+    ({"release_date": "2000-01-01"}, "外语电影"),
+    # 非数字范围按两个独立的值匹配
+    ({"production_countries": [{"iso_3166_1": "us"}]}, "美英电影"),
+    ({"production_countries": [{"iso_3166_1": "GB"}]}, "美英电影"),
+    ({"production_countries": [{"iso_3166_1": "CA"}]}, "外语电影"),
+    # 非数字范围的值不转大写，与TMDB中转为大写后的值不匹配
+    ({"original_language": "en"}, "外语电影"),
+    # 多个条件需同时满足
+    ({"production_countries": [{"iso_3166_1": "JP"}], "genre_ids": [10749]}, "日韩合拍"),
+    ({"production_countries": [{"iso_3166_1": "KR"}], "genre_ids": [35]}, "外语电影"),
+    # 缺少分类字段时不匹配
+    ({"genre_ids": []}, "外语电影"),
+]
+
+
+class CategoryTest(TestCase):
+
+    def test_get_category(self):
+        for tmdb_info, category in category_cases:
+            self.assertEqual(category, CategoryHelper.get_category(categorys, tmdb_info), tmdb_info)
+
+    def test_compile_match(self):
+        rules = CategoryHelper.compile(categorys)
+        self.assertEqual(list(categorys.keys()), [key for key, _ in rules])
+        for tmdb_info, category in category_cases:
+            self.assertEqual(category, CategoryHelper.match_category(rules, tmdb_info), tmdb_info)
+
+    def test_empty(self):
+        self.assertEqual("", CategoryHelper.get_category(categorys, {}))
+        self.assertEqual("", CategoryHelper.get_category({}, {"genre_ids": [16]}))
+        self.assertEqual("", CategoryHelper.match_category([], {"genre_ids": [16]}))
+        # 数字范围不匹配带前导零的值
+        self.assertEqual("", CategoryHelper.get_category({"古代": {"release_year": "900-1000"}},
+                                                         {"release_date": "0999-01-01"}))
+        # 条件为空的分类匹配所有媒体
+        self.assertEqual("全部", CategoryHelper.get_category({"全部": {"genre_ids": ""}}, {"genre_ids": [16]}))
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import time
+from email.utils import formatdate
+from unittest import TestCase
+
+from app.utils.http import RequestUtils
+from app.utils.limit import DomainRateLimiter, DomainRateLimitRegistry
+
+
+class RateLimitTest(TestCase):
+
+    def test_parse_retry_after(self):
+        self.assertEqual(5.0, RequestUtils.parse_retry_after(None))
+        self.assertEqual(5.0, RequestUtils.parse_retry_after(""))
+        self.assertEqual(120.0, RequestUtils.parse_retry_after("120"))
+        self.assertEqual(3.0, RequestUtils.parse_retry_after(" 3 "))
+        # 无法解析时使用默认值
+        self.assertEqual(5.0, RequestUtils.parse_retry_after("soon"))
+        self.assertEqual(10.0, RequestUtils.parse_retry_after("-1", default=10.0))
+        # HTTP日期
+        seconds = RequestUtils.parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+        self.assertTrue(28 <= seconds <= 31, seconds)
+        self.assertEqual(0.0, RequestUtils.parse_retry_after(formatdate(time.time() - 30, usegmt=True)))
+
+    def test_rate(self):
+        limiter = DomainRateLimiter("example.com", rate=10, burst=2, concurrency=0)
+        start = time.monotonic()
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertLess(time.monotonic() - start, 0.05)
+        # 突发请求数用完，排队时间超过等待时间时拒绝
+        self.assertFalse(limiter.acquire(timeout=0))
+        self.assertEqual(1, limiter.stats()["rejected"])
+        # 等待时间足够时排队放行
+        start = time.monotonic()
+        self.assertTrue(limiter.acquire(timeout=1))
+        self.assertGreater(time.monotonic() - start, 0.05)
+        for _ in range(3):
+            limiter.release()
+        stats = limiter.stats()
+        self.assertEqual(3, stats["total"])
+        self.assertEqual(0, stats["active"])
+
+    def test_concurrency(self):
+        limiter = DomainRateLimiter("example.com", rate=0, burst=1, concurrency=1)
+        self.assertTrue(limiter.acquire(timeout=0.1))
+        self.assertFalse(limiter.acquire(timeout=0.1))
+        self.assertEqual(1, limiter.stats()["rejected"])
+        limiter.release()
+        self.assertTrue(limiter.acquire(timeout=0.1))
+        limiter.release()
+
+    def test_penalize(self):
+        limiter = DomainRateLimiter("example.com", rate=0, burst=1, concurrency=1)
+        limiter.penalize(0.2)
+        self.assertEqual(1, limiter.stats()["limited"])
+        # 暂停时间不计入等待时间，等待暂停结束后放行
+        start = time.monotonic()
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertGreater(time.monotonic() - start, 0.15)
+        limiter.release()
+        # 单次暂停时间有上限
+        limiter.penalize(10000)
+        self.assertLessEqual(limiter.stats()["blocked"], DomainRateLimiter._max_penalty)
+
+    def test_registry(self):
+        registry = DomainRateLimitRegistry()
+        self.assertTrue(registry.is_local("localhost"))
+        self.assertTrue(registry.is_local("nas"))
+        self.assertTrue(registry.is_local("192.168.1.2"))
+        self.assertTrue(registry.is_local("127.0.0.1"))
+        self.assertFalse(registry.is_local("example.com"))
+        self.assertFalse(registry.is_local("8.8.8.8"))
+        registry.configure("Example.org", rate=5, burst=1, concurrency=0)
+        limiter = registry.get_by_url("https://example.org/api?x=1")
+        self.assertIsNotNone(limiter)
+        self.assertIs(limiter, registry.get("EXAMPLE.ORG"))
+        self.assertEqual(5, limiter.rate)
+        # 设置为不限流的域名返回None
+        registry.configure("example.net", rate=0, burst=1, concurrency=0)
+        self.assertIsNone(registry.get("example.net"))
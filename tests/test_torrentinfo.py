@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import copy
+import pickle
+from unittest import TestCase
+
+from app.core.context import TorrentInfo
+
+
+def _torrent(**kwargs) -> TorrentInfo:
+    values = {
+        "site": 1,
+        "site_name": "测试站点",
+        "site_cookie": "uid=1",
+        "site_ua": "Mozilla/5.0",
+        "site_proxy": True,
+        "site_order": 2,
+        "title": "Test.Movie.2024.1080p.BluRay.x264-GROUP",
+        "enclosure": "https://example.com/download/1",
+        "size": 1024.0,
+        "seeders": 10,
+        "uploadvolumefactor": 1.0,
+        "downloadvolumefactor": 0.0,
+        "labels": ["中字"],
+    }
+    values.update(kwargs)
+    return TorrentInfo(**values)
+
+
+class OldTorrentInfo:
+    """
+    模拟旧版本 dataclass 的 TorrentInfo，以实例 __dict__ 作为序列化状态
+    """
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def dumps(self) -> bytes:
+        """
+        序列化后将类引用替换为 TorrentInfo，得到与旧版本缓存相同格式的数据
+        """
+        data = pickle.dumps(self, protocol=2)
+        return data.replace(f"{self.__module__}\n{self.__class__.__qualname__}\n".encode(),
+                            f"{TorrentInfo.__module__}\n{TorrentInfo.__qualname__}\n".encode())
+
+
+class TorrentInfoTest(TestCase):
+
+    def test_pickle(self):
+        torrent = _torrent()
+        torrent.extra = "自定义字段"
+        restored = pickle.loads(pickle.dumps(torrent))
+        self.assertEqual(torrent, restored)
+        self.assertEqual("自定义字段", restored.extra)
+        # 同一站点的种子共用站点信息
+        self.assertIs(torrent._site, restored._site)
+
+    def test_copy(self):
+        torrent = _torrent()
+        shallow = copy.copy(torrent)
+        deep = copy.deepcopy(torrent)
+        self.assertEqual(torrent, shallow)
+        self.assertEqual(torrent, deep)
+        self.assertIsNot(torrent.labels, deep.labels)
+        # 修改副本的站点字段不影响原对象
+        deep.site_name = "其它站点"
+        self.assertEqual("测试站点", torrent.site_name)
+        self.assertEqual("其它站点", deep.site_name)
+        self.assertEqual(1, deep.site)
+
+    def test_dict(self):
+        torrent = _torrent()
+        data = torrent.to_dict()
+        self.assertEqual("测试站点", data["site_name"])
+        self.assertEqual("免费", data["volume_factor"])
+        self.assertEqual("", data["freedate_diff"])
+        restored = TorrentInfo()
+        restored.from_dict(data)
+        self.assertEqual(torrent, restored)
+        self.assertEqual(data, restored.to_dict())
+
+    def test_from_dict_partial(self):
+        torrent = _torrent()
+        torrent.from_dict({"site_order": 5, "seeders": 20})
+        self.assertEqual(5, torrent.site_order)
+        self.assertEqual(20, torrent.seeders)
+        self.assertEqual("测试站点", torrent.site_name)
+        self.assertEqual(5, _torrent(site_order=5).site_order)
+
+    def test_old_pickle(self):
+        state = _torrent().to_dict()
+        state.pop("volume_factor")
+        state.pop("freedate_diff")
+        # 旧版本缓存中没有后续新增的字段
+        state.pop("category")
+        data = OldTorrentInfo(**state).dumps()
+        restored = pickle.loads(data)
+        self.assertIsInstance(restored, TorrentInfo)
+        self.assertEqual(_torrent(), restored)
+        self.assertIsNone(restored.category)
+        self.assertEqual("免费", restored.volume_factor)